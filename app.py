@@ -1,10 +1,21 @@
+import sys
+from pathlib import Path
+
+import cv2
 import streamlit as st
-import easyocr
 from deep_translator import GoogleTranslator
-from PIL import Image
-import numpy as np
-import cv2
-import re
+
+# Share the CLI helpers that live in src/
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from app_state import extraction_key, get_session_caches, translate_languages
+from corrections import correct_text
+from ocr_cache import get_ocr_cache, image_cache_key
+from pages import count_pages, is_multipage, load_page
+from preprocessing import DEFAULT_SPEC, get_pipeline
+from reader_pool import get_reader
+from script_detection import read_by_script
+from translation_cache import get_translation_cache
 
 # Set Page Config
 st.set_page_config(page_title="Img2TranslatedTxt - M.Tech Project", layout="wide")
@@ -17,25 +28,18 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# 1. OCR Initialization (Cached to prevent re-loading)
-@st.cache_resource
+# 1. OCR Initialization (Process-wide reader registry prevents re-loading)
 def load_reader():
     # Loading English reader by default
-    return easyocr.Reader(['en'])
+    return get_reader(['en'])
 
 # 2. Image Pre-processing (The 'Engineering' Enhancement)
-def preprocess_image(image):
-    # Convert PIL to OpenCv format
-    img_array = np.array(image)
-    gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-    
-    # Apply Adaptive Thresholding to remove noise and make text pop
-    processed_img = cv2.adaptiveThreshold(
-        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
-    )
-    return processed_img
+def preprocess_image(image_bytes, steps=DEFAULT_SPEC):
+    # Decode the upload straight into one grayscale buffer and run the chosen
+    # steps on it in place (default: Adaptive Thresholding to make text pop)
+    return get_pipeline(steps).run(image_bytes)
 
-# 3. Translation Logic
+# 3. Translation Logic (errors are reported per language by translate_languages)
 def translate_text(text, target_lang_code):
     if not text.strip():
         return "No text detected."
@@ -44,35 +48,65 @@ def translate_text(text, target_lang_code):
     if target_lang_code == 'en':
         return text
         
-    try:
-        translated = GoogleTranslator(source='auto', target=target_lang_code).translate(text)
-        return translated
-    except Exception as e:
-        return f"Translation Error: {str(e)}"
+    # Repeated phrases are served from the shared translation cache
+    cache = get_translation_cache()
+    cached = cache.get(text, target_lang_code)
+    if cached is not None:
+        return cached
+
+    translated = GoogleTranslator(source='auto', target=target_lang_code).translate(text)
+    if translated is not None:
+        cache.set(text, target_lang_code, translated)
+    return translated
 
 # 4. Text Cleanup (Handles common OCR noise like GTARTGAMB -> START GAME)
 def clean_ocr_text(text):
-    # Basic cleanup: remove double spaces and strip
-    cleaned = " ".join(text.split())
-    
-    # Specific fix for "START GAME" misreadings
-    # Common OCR errors for "START GAME": GTARTGAMB, STARTG AME, STARTGAMB, etc.
-    replacements = {
-        r"GTARTGAMB": "START GAME",
-        r"STARTG AME": "START GAME",
-        r"STARTGAMB": "START GAME",
-        r"GTART GAME": "START GAME",
-        r"ST ART GAME": "START GAME"
-    }
-    
-    for pattern, replacement in replacements.items():
-        cleaned = re.sub(pattern, replacement, cleaned, flags=re.IGNORECASE)
-        
-    return cleaned
+    # Whitespace cleanup plus a single-pass scan with the correction
+    # dictionaries in src/data/corrections (e.g. the "START GAME" misreadings)
+    return correct_text(text, 'en')
+
+# 5. Extraction, cached per (upload hash, preprocessing settings)
+def extract_text(image_bytes, steps, extractions, auto_script=False):
+    """Return (extracted_text, processed_image) for an upload, reusing earlier runs."""
+    key = extraction_key(image_bytes, steps, auto_script)
+    cached = extractions.get(key)
+    if cached is not None:
+        return cached
+
+    # Step 1: Pre-process if selected
+    processed = preprocess_image(image_bytes, steps) if steps else None
+    # EasyOCR decodes the raw upload bytes itself when not pre-processing
+    ocr_input = processed if steps else image_bytes
+
+    # Step 2: OCR Extraction (uploads seen by any session come from the OCR cache)
+    ocr_cache = get_ocr_cache()
+    params = {"source": "app", "preprocessing": steps or False}
+    if auto_script:
+        params["auto_script"] = True
+    cache_key = image_cache_key(image_bytes, ['en'], 0.0, params)
+    results = ocr_cache.get(cache_key)
+    if results is None:
+        # Auto mode reads each region with the reader for its script
+        # (Devanagari, Arabic, CJK); readers for absent scripts are never loaded
+        if auto_script:
+            results = read_by_script(ocr_input)
+        else:
+            results = load_reader().readtext(ocr_input)
+        ocr_cache.set(cache_key, results)
+    raw_text = " ".join(text for (bbox, text, conf) in results)
+
+    # Step 3: Clean text (Fixes "START GAME" errors)
+    extraction = (clean_ocr_text(raw_text), processed)
+    extractions.set(key, extraction)
+    return extraction
 
 # UI Layout
 st.title("📸 Image Text Translator Pro")
 
+# Session caches survive reruns, so changing the language or toggling
+# pre-processing back does not repeat OCR or translation
+extractions, translations = get_session_caches(st.session_state)
+
 # Language Mapping
 lang_options = {
     "Hindi": "hi",
@@ -95,63 +129,101 @@ with col_lang:
         help="Choose the language you want to translate the image text into."
     )
     target_lang_code = lang_options[selected_lang_name]
+    extra_lang_names = st.multiselect(
+        "Also translate into",
+        options=[name for name in lang_options if name != selected_lang_name],
+        help="Additional languages are translated at the same time.",
+    )
 
 with col_opts:
     use_preprocessing = st.checkbox("Apply OpenCV Pre-processing", value=True)
     st.caption("Improves accuracy on noisy/low-contrast images.")
+    auto_script = st.checkbox(
+        "Auto-detect script",
+        value=False,
+        help="Read Hindi, Arabic or Japanese text by loading only the readers "
+             "for the scripts found in the image.",
+    )
+    preprocess_steps = st.text_input(
+        "Pre-processing steps",
+        value=DEFAULT_SPEC,
+        disabled=not use_preprocessing,
+        help="Comma-separated chain of: resize, denoise, deskew, threshold "
+             "(e.g. resize:max_side=1600,denoise,threshold:block_size=11:c=2)",
+    )
 
 st.write("---")
 
 # File Upload
 st.write("### 2. Upload Image")
-uploaded_file = st.file_uploader("Choose an image (JPG, PNG, JPEG)...", type=["jpg", "png", "jpeg"])
+uploaded_file = st.file_uploader(
+    "Choose an image (JPG, PNG, JPEG) or a document (PDF, TIFF)...",
+    type=["jpg", "png", "jpeg", "pdf", "tif", "tiff"],
+)
 
 if uploaded_file is not None:
     # Display Image side-by-side
     img_col1, img_col2 = st.columns(2)
     
-    image = Image.open(uploaded_file)
-    img_col1.image(image, caption="Original Uploaded Image", use_container_width=True)
+    image_bytes = uploaded_file.getvalue()
+    if is_multipage(image_bytes):
+        # Only the selected page is decoded; it is then handled like an image upload
+        try:
+            page_count = count_pages(image_bytes)
+        except ImportError as e:
+            st.error(str(e))
+            st.stop()
+        page_number = st.number_input("Page", min_value=1, max_value=page_count, value=1)
+        image_bytes = cv2.imencode(".png", load_page(image_bytes, int(page_number)))[1].tobytes()
+    img_col1.image(image_bytes, caption="Original Uploaded Image", use_container_width=True)
+    steps = preprocess_steps if use_preprocessing else None
     
-    if st.button("🚀 Extract and Translate"):
-        reader = load_reader()
-        
-        with st.spinner(f'Processing and translating to {selected_lang_name}...'):
-            # Step 1: Pre-process if selected
-            if use_preprocessing:
-                processed = preprocess_image(image)
-                # Show processed image in col2 for visual proof of work
-                img_col2.image(processed, caption="OpenCV Processed (B&W Threshold)", use_container_width=True)
-                ocr_input = processed
-            else:
-                ocr_input = np.array(image)
-
-            # Step 2: OCR Extraction
-            results = reader.readtext(ocr_input, detail=0)
-            raw_text = " ".join(results)
-            
-            # Step 3: Clean text (Fixes "START GAME" errors)
-            extracted_text = clean_ocr_text(raw_text)
+    try:
+        already_extracted = extraction_key(image_bytes, steps, auto_script) in extractions
+    except ValueError as e:
+        st.error(f"Pre-processing error: {str(e)}")
+        st.stop()
+    
+    # Once an upload was extracted with these settings, later reruns (e.g. a
+    # new target language) show results without another click
+    if st.button("🚀 Extract and Translate") or already_extracted:
+        selected_names = [selected_lang_name] + extra_lang_names
+        with st.spinner(f'Processing and translating to {", ".join(selected_names)}...'):
+            extracted_text, processed = extract_text(image_bytes, steps, extractions,
+                                                     auto_script)
             
-            # Step 4: Translation
-            translation = translate_text(extracted_text, target_lang_code)
+            # Step 4: Translation, fanned out over the selected languages
+            results_by_code = translate_languages(
+                extracted_text, [lang_options[name] for name in selected_names],
+                translate_text, translations,
+            )
             
+        if processed is not None:
+            # Show processed image in col2 for visual proof of work
+            img_col2.image(processed, caption=f"OpenCV Processed ({steps})", use_container_width=True)
+        
         # Display Results
         st.divider()
-        res_col1, res_col2 = st.columns(2)
+        res_cols = st.columns(1 + len(selected_names))
         
-        with res_col1:
+        with res_cols[0]:
             st.success("📝 Extracted Text (Source)")
             st.text_area("OCR Result", value=extracted_text, height=200)
-            
-        with res_col2:
-            st.success(f"🌍 Translated Text ({selected_lang_name})")
-            st.text_area("Translation Result", value=translation, height=200)
+        
+        for res_col, name in zip(res_cols[1:], selected_names):
+            with res_col:
+                st.success(f"🌍 Translated Text ({name})")
+                st.text_area(f"Translation Result ({name})",
+                             value=results_by_code[lang_options[name]], height=200)
 
         # Download button for results
+        translated_sections = "\n\n".join(
+            f"Translation ({name}):\n{results_by_code[lang_options[name]]}"
+            for name in selected_names
+        )
         st.download_button(
             label="💾 Download Result as TXT",
-            data=f"Source:\n{extracted_text}\n\nTranslation ({selected_lang_name}):\n{translation}",
+            data=f"Source:\n{extracted_text}\n\n{translated_sections}",
             file_name=f"translation_{selected_lang_name.lower()}.txt",
             mime="text/plain"
-        )
\ No newline at end of file
+        )
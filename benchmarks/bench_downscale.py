@@ -0,0 +1,94 @@
+"""Latency versus accuracy of adaptive downscaling over the uploads/ corpus.
+
+Every image is recognized once at full resolution (the reference) and then
+through ``read_downscaled`` for several minimum text heights.  Accuracy is the
+similarity of the extracted text to the full-resolution text.
+
+Usage:
+    python benchmarks/bench_downscale.py [--images uploads] [--heights 16 24 32 48]
+"""
+
+import argparse
+import difflib
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from batch import collect_images
+from reader_pool import get_reader
+from resolution import load_image, read_downscaled
+
+
+def text_similarity(reference, candidate):
+    """Similarity in [0, 1] between two extracted texts."""
+    if not reference and not candidate:
+        return 1.0
+    return difflib.SequenceMatcher(None, reference, candidate).ratio()
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def join(results):
+    return " ".join(text for (bbox, text, conf) in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", nargs="+", default=["uploads"])
+    parser.add_argument("--heights", nargs="+", type=int, default=[16, 24, 32, 48])
+    parser.add_argument("--languages", default="en")
+    parser.add_argument("--json", metavar="PATH", help="also write results as JSON")
+    args = parser.parse_args()
+
+    reader = get_reader(args.languages.split(","))
+    rows = []
+    for image_path in collect_images(args.images):
+        image = load_image(image_path)
+        # Warm-up so the first measurement does not include lazy initialization
+        reader.readtext(image)
+        reference, full_time = timed(reader.readtext, image)
+        row = {"image": image_path, "pixels": image.shape[0] * image.shape[1],
+               "full_seconds": full_time, "policies": {}}
+        for height in args.heights:
+            results, seconds = timed(read_downscaled, reader, image, min_text_height=height)
+            row["policies"][height] = {
+                "seconds": seconds,
+                "speedup": full_time / seconds if seconds else None,
+                "similarity": text_similarity(join(reference), join(results)),
+            }
+        rows.append(row)
+
+    header = f"{'image':<28}{'full (s)':>10}" + "".join(
+        f"{f'h={h} s':>10}{'sim':>7}" for h in args.heights
+    )
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        line = f"{Path(row['image']).name:<28}{row['full_seconds']:>10.3f}"
+        for height in args.heights:
+            policy = row["policies"][height]
+            line += f"{policy['seconds']:>10.3f}{policy['similarity']:>7.2f}"
+        print(line)
+    if rows:
+        print("-" * len(header))
+        summary = f"{'median':<28}{statistics.median(r['full_seconds'] for r in rows):>10.3f}"
+        for height in args.heights:
+            summary += f"{statistics.median(r['policies'][height]['seconds'] for r in rows):>10.3f}"
+            summary += f"{statistics.mean(r['policies'][height]['similarity'] for r in rows):>7.2f}"
+        print(summary)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
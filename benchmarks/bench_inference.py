@@ -0,0 +1,103 @@
+"""Speed versus accuracy of CPU inference settings over the uploads/ corpus.
+
+Every image is recognized once with an unquantized fp32 reader (the
+reference) and then with each combination of quantization mode, intra-op
+thread count and inference mode.  Accuracy is the similarity of the extracted
+text to the reference text; throughput is reported per image and per core,
+so configurations that use fewer threads can be compared fairly.
+
+Torch only accepts the inter-op thread count before it starts work, so it is
+fixed for the whole run with ``--interop-threads``.
+
+Usage:
+    python benchmarks/bench_inference.py [--images uploads] [--threads 1 2 4]
+        [--quantize off recognizer all]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bench_downscale import join, text_similarity, timed
+from batch import collect_images
+from inference import QUANTIZE_MODES, InferenceConfig, apply_threads, build_reader
+from resolution import load_image
+
+
+def measure(reader, images):
+    """Return (texts, per-image seconds) after one warm-up pass."""
+    reader.readtext(images[0])
+    texts, seconds = [], []
+    for image in images:
+        results, elapsed = timed(reader.readtext, image)
+        texts.append(join(results))
+        seconds.append(elapsed)
+    return texts, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", nargs="+", default=["uploads"])
+    parser.add_argument("--languages", default="en")
+    parser.add_argument("--quantize", nargs="+", choices=QUANTIZE_MODES,
+                        default=list(QUANTIZE_MODES))
+    parser.add_argument("--threads", nargs="+", type=int,
+                        default=sorted({1, max(1, (os.cpu_count() or 1) // 2), os.cpu_count() or 1}))
+    parser.add_argument("--interop-threads", type=int, default=1)
+    parser.add_argument("--json", metavar="PATH", help="also write results as JSON")
+    args = parser.parse_args()
+
+    languages = args.languages.split(",")
+    image_paths = collect_images(args.images)
+    images = [load_image(image_path) for image_path in image_paths]
+    if not images:
+        print("No images found", file=sys.stderr)
+        sys.exit(1)
+
+    reference_config = InferenceConfig(quantize="off", intra_op_threads=max(args.threads),
+                                       inter_op_threads=args.interop_threads,
+                                       inference_mode=False)
+    apply_threads(reference_config)
+    reference, _ = measure(build_reader(languages, reference_config, gpu=False), images)
+
+    rows = []
+    for quantize in args.quantize:
+        for inference_mode in (False, True):
+            config = InferenceConfig(quantize=quantize, inference_mode=inference_mode)
+            reader = build_reader(languages, config, gpu=False)
+            for threads in args.threads:
+                config.intra_op_threads = threads
+                apply_threads(config)
+                texts, seconds = measure(reader, images)
+                per_image = statistics.median(seconds)
+                rows.append({
+                    **config.describe(),
+                    "inter_op_threads": args.interop_threads,
+                    "seconds_per_image": per_image,
+                    "images_per_second_per_core": 1.0 / (per_image * threads) if per_image else None,
+                    "similarity": statistics.mean(
+                        text_similarity(ref, text) for ref, text in zip(reference, texts)
+                    ),
+                })
+
+    header = (f"{'quantize':<12}{'inference':>10}{'threads':>9}"
+              f"{'s/image':>10}{'img/s/core':>12}{'sim':>7}")
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(f"{row['quantize']:<12}{str(row['inference_mode']):>10}"
+              f"{row['intra_op_threads']:>9}{row['seconds_per_image']:>10.3f}"
+              f"{row['images_per_second_per_core']:>12.3f}{row['similarity']:>7.2f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
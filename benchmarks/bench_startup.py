@@ -0,0 +1,114 @@
+"""Measure cold CLI startup and fail when it exceeds a limit.
+
+Each scenario runs ``src/main.py`` in a fresh interpreter several times and
+reports the best wall-clock time, and checks that none of the heavy
+dependencies (easyocr, torch, cv2, deep_translator) was imported.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --limit 0.5 --repeat 5 --json startup.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# Modules that must never be imported on the fast paths
+HEAVY_MODULES = ["easyocr", "torch", "cv2", "deep_translator"]
+
+# Default limit for the best cold startup time of each scenario, in seconds
+DEFAULT_LIMIT = 1.0
+
+# CLI arguments for each fast path
+SCENARIOS = {
+    "usage": [],
+    "help": ["--help"],
+    "version": ["--version"],
+    "missing_path": ["uploads/does-not-exist.png"],
+    "dry_run": ["--batch", "uploads", "--dry-run", "--translate", "es"],
+}
+
+# Runs main() the way ``python src/main.py`` does, then reports heavy imports
+_RUNNER = """
+import runpy, sys
+sys.argv = ["main.py"] + {args!r}
+sys.path.insert(0, {src!r})
+try:
+    runpy.run_path({main!r}, run_name="__main__")
+except SystemExit:
+    pass
+finally:
+    heavy = [name for name in {heavy!r} if name in sys.modules]
+    sys.stderr.write("HEAVY_IMPORTS=" + ",".join(heavy) + "\\n")
+"""
+
+
+def run_scenario(args, repeat=3):
+    """Run one CLI invocation ``repeat`` times in fresh interpreters.
+
+    Returns:
+        Dict with the best and all wall-clock times and any heavy imports seen
+    """
+    code = _RUNNER.format(args=list(args), src=str(ROOT / "src"),
+                          main=str(ROOT / "src" / "main.py"), heavy=HEAVY_MODULES)
+    times, heavy = [], set()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                                   capture_output=True, text=True)
+        times.append(time.perf_counter() - start)
+        for line in completed.stderr.splitlines():
+            if line.startswith("HEAVY_IMPORTS="):
+                heavy.update(filter(None, line.split("=", 1)[1].split(",")))
+    return {"best": min(times), "times": times, "heavy_imports": sorted(heavy)}
+
+
+def run_benchmark(limit=DEFAULT_LIMIT, repeat=3, scenarios=SCENARIOS):
+    """Run every scenario and collect failures.
+
+    Returns:
+        Tuple of (results by scenario, list of failure messages)
+    """
+    results, failures = {}, []
+    for name, args in scenarios.items():
+        result = results[name] = run_scenario(args, repeat)
+        if result["heavy_imports"]:
+            failures.append(f"{name}: imported {', '.join(result['heavy_imports'])}")
+        if result["best"] > limit:
+            failures.append(f"{name}: {result['best']:.3f}s exceeds the {limit:.3f}s limit")
+    return results, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limit", type=float, default=DEFAULT_LIMIT,
+                        help=f"maximum cold startup in seconds (default: {DEFAULT_LIMIT})")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    results, failures = run_benchmark(args.limit, args.repeat)
+    print(f"{'scenario':<16}{'best (s)':>10}  heavy imports")
+    print("-" * 50)
+    for name, result in results.items():
+        print(f"{name:<16}{result['best']:>10.3f}  {', '.join(result['heavy_imports']) or '-'}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    if failures:
+        print("\nFAILED:")
+        for message in failures:
+            print(f"  {message}")
+        return 1
+    print(f"\nAll scenarios under {args.limit:.3f}s without heavy imports.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Offline stand-in for EasyOCR readers used by the benchmarks and tests.
+
+The stub needs no model download: it simulates recognition cost in
+proportion to the image size and returns one fixed text region per image.
+"""
+
+import time
+
+
+class StubReader:
+    """Offline stand-in for ``easyocr.Reader``.
+
+    Args:
+        languages: Language codes (kept for parity with ``easyocr.Reader``)
+        seconds_per_megapixel: Simulated recognition time per megapixel
+        text: Text returned for every image
+    """
+
+    def __init__(self, languages=("en",), seconds_per_megapixel=0.05, text="SAMPLE TEXT",
+                 **options):
+        self.lang_list = list(languages)
+        self.seconds_per_megapixel = seconds_per_megapixel
+        self.text = text
+        self.calls = 0
+
+    @staticmethod
+    def _size(image):
+        shape = getattr(image, "shape", None)
+        return (shape[1], shape[0]) if shape is not None else (640, 480)
+
+    def detect(self, image, **kwargs):
+        width, height = self._size(image)
+        box = [0, max(1, width // 2), 0, max(1, height // 10)]
+        return [[box]], [[]]
+
+    def readtext(self, image, detail=1, **kwargs):
+        width, height = self._size(image)
+        self.calls += 1
+        time.sleep(width * height / 1e6 * self.seconds_per_megapixel)
+        x_max, y_max = max(1, width // 2), max(1, height // 10)
+        bbox = [[0, 0], [x_max, 0], [x_max, y_max], [0, y_max]]
+        return [(bbox, self.text, 0.9)] if detail else [self.text]
+
+
+def stub_factory(languages, **options):
+    """Reader factory that builds StubReader instances (no model download)."""
+    return StubReader(languages, **options)
@@ -0,0 +1,274 @@
+"""Offline benchmark suite for the OCR -> clean -> translate pipeline.
+
+Runs every image of the ``uploads/`` corpus plus generated synthetic text
+images of controlled sizes through each stage (decode, preprocess, OCR,
+clean, translate) and reports per-stage latency percentiles, images/sec,
+cold versus warm start and peak RSS.  Results are written as JSON and can be
+compared against a stored baseline; the script exits non-zero when a metric
+regresses by more than the tolerance.
+
+Usage:
+    python benchmarks/suite.py                          # stub reader, offline
+    python benchmarks/suite.py --reader real --iterations 5
+    python benchmarks/suite.py --baseline benchmarks/baseline_stub.json
+    python benchmarks/suite.py --save-baseline benchmarks/baseline_stub.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from batch import collect_images
+from corrections import get_correction_engine
+from preprocessing import PreprocessPipeline, decode_grayscale
+from reader_pool import get_registry
+from stub_reader import StubReader
+from translation_cache import TranslationCache
+from translation_engine import LocalBackend, TranslationEngine
+
+ROOT = Path(__file__).parent.parent
+
+# Synthetic image sizes (width, height) and the text height drawn on them
+SYNTHETIC_SIZES = [(320, 240, 16), (640, 480, 24), (1280, 960, 48), (2560, 1920, 96)]
+
+STAGES = ["decode", "preprocess", "ocr", "clean", "translate", "total"]
+
+# Metrics compared against the baseline, and whether higher is better
+COMPARED_METRICS = {"images_per_second": True, "warm_seconds": False}
+
+# Stage latencies below this (seconds) are too noisy to compare
+MIN_COMPARED_SECONDS = 0.001
+
+
+def synthetic_images(sizes=SYNTHETIC_SIZES):
+    """Generate encoded PNG images with text of controlled sizes.
+
+    Yields:
+        Tuples of (name, encoded bytes)
+    """
+    import cv2
+    import numpy as np
+
+    for width, height, text_height in sizes:
+        image = np.full((height, width), 255, dtype=np.uint8)
+        scale = text_height / 22.0
+        for row, line in enumerate(["START GAME", "Size Chart S M L XL", "NIKE Just Do It"]):
+            y = int(text_height * 1.8 * (row + 1))
+            if y < height:
+                cv2.putText(image, line, (text_height, y), cv2.FONT_HERSHEY_SIMPLEX,
+                            scale, 0, max(1, int(scale * 2)))
+        ok, encoded = cv2.imencode(".png", image)
+        yield f"synthetic_{width}x{height}.png", encoded.tobytes()
+
+
+def load_corpus(image_dirs):
+    """Read the benchmark corpus into memory as (name, encoded bytes) pairs."""
+    corpus = [(Path(path).name, Path(path).read_bytes())
+              for path in collect_images(image_dirs)]
+    corpus.extend(synthetic_images())
+    return corpus
+
+
+def percentiles(values):
+    """Return p50/p90/p99/mean of a list of seconds."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pick(fraction):
+        return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+    return {"p50": pick(0.5), "p90": pick(0.9), "p99": pick(0.99),
+            "mean": statistics.fmean(ordered), "count": len(ordered)}
+
+
+def peak_rss_bytes():
+    """Return the peak resident set size of this process, if available."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def make_reader(kind, languages):
+    """Load the reader under test and return (reader, load seconds)."""
+    start = time.perf_counter()
+    if kind == "stub":
+        reader = StubReader(languages)
+    else:
+        registry = get_registry()
+        registry.discard(languages)
+        reader = registry.get(languages)
+    return reader, time.perf_counter() - start
+
+
+def process_image(data, reader, preprocess, corrector, translator, target_language):
+    """Run one encoded image through every stage and return stage timings."""
+    timings = {}
+    start = time.perf_counter()
+    image = decode_grayscale(data)
+    timings["decode"] = time.perf_counter() - start
+
+    mark = time.perf_counter()
+    # The decoded buffer is ours, so the steps may reuse it
+    image = preprocess.run(image, inplace=True)
+    timings["preprocess"] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
+    results = reader.readtext(image)
+    timings["ocr"] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
+    text = corrector.correct(" ".join(text for (bbox, text, conf) in results))
+    timings["clean"] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
+    translator.translate_many([text], target_language)
+    timings["translate"] = time.perf_counter() - mark
+
+    timings["total"] = time.perf_counter() - start
+    return timings
+
+
+def run_suite(reader_kind="stub", iterations=3, image_dirs=("uploads",), languages=("en",),
+              preprocess_spec="threshold", translate_to="es", translation_latency=0.02):
+    """Run the benchmark suite.
+
+    Returns:
+        Dict of machine-readable results
+    """
+    corpus = load_corpus([str(ROOT / path) if not Path(path).is_absolute() else path
+                          for path in image_dirs])
+    preprocess = PreprocessPipeline(preprocess_spec)
+    corrector = get_correction_engine(languages[0])
+    # Fresh memory-only cache so repeated phrases are measured within one run only
+    translator = TranslationEngine(LocalBackend(latency=translation_latency),
+                                   cache=TranslationCache())
+
+    suite_start = time.perf_counter()
+    reader, load_seconds = make_reader(reader_kind, list(languages))
+    stage_times = {stage: [] for stage in STAGES}
+    first_image_seconds = None
+    wall_start = time.perf_counter()
+    processed = 0
+    for _ in range(iterations):
+        for name, data in corpus:
+            timings = process_image(data, reader, preprocess, corrector, translator,
+                                    translate_to)
+            if first_image_seconds is None:
+                first_image_seconds = timings["total"]
+            for stage, seconds in timings.items():
+                stage_times[stage].append(seconds)
+            processed += 1
+    wall_seconds = time.perf_counter() - wall_start
+    translator.close()
+
+    warm = stage_times["total"][1:] or stage_times["total"]
+    return {
+        "reader": reader_kind,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "images": len(corpus),
+        "iterations": iterations,
+        "stages": {stage: percentiles(values) for stage, values in stage_times.items()},
+        "images_per_second": processed / wall_seconds if wall_seconds else None,
+        "model_load_seconds": load_seconds,
+        "cold_seconds": load_seconds + (first_image_seconds or 0.0),
+        "warm_seconds": statistics.median(warm) if warm else None,
+        "suite_seconds": time.perf_counter() - suite_start,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "preprocess_allocations": preprocess.stats(),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Compare results against a baseline.
+
+    Returns:
+        List of human-readable regression messages (empty if none)
+    """
+    regressions = []
+    checks = [(f"stages.{stage}.p50", results["stages"][stage].get("p50"),
+               baseline.get("stages", {}).get(stage, {}).get("p50"), False)
+              for stage in STAGES
+              if baseline.get("stages", {}).get(stage, {}).get("p50", 0) >= MIN_COMPARED_SECONDS]
+    checks += [(metric, results.get(metric), baseline.get(metric), higher_is_better)
+               for metric, higher_is_better in COMPARED_METRICS.items()]
+
+    for name, current, reference, higher_is_better in checks:
+        if current is None or not reference:
+            continue
+        if higher_is_better:
+            regressed = current < reference / (1 + tolerance)
+        else:
+            regressed = current > reference * (1 + tolerance)
+        if regressed:
+            regressions.append(f"{name}: {current:.4f} vs baseline {reference:.4f}")
+    return regressions
+
+
+def print_report(results):
+    print(f"Reader: {results['reader']}  images: {results['images']}  "
+          f"iterations: {results['iterations']}")
+    print("-" * 62)
+    print(f"{'stage':<12}{'p50 (ms)':>12}{'p90 (ms)':>12}{'p99 (ms)':>12}{'mean (ms)':>14}")
+    for stage in STAGES:
+        summary = results["stages"][stage]
+        print(f"{stage:<12}" + "".join(
+            f"{summary[key] * 1000:>12.2f}" for key in ("p50", "p90", "p99")
+        ) + f"{summary['mean'] * 1000:>14.2f}")
+    print("-" * 62)
+    print(f"Images/sec:       {results['images_per_second']:.2f}")
+    print(f"Model load:       {results['model_load_seconds']:.3f} s")
+    print(f"Cold start:       {results['cold_seconds']:.3f} s (load + first image)")
+    print(f"Warm image:       {results['warm_seconds']:.3f} s (median)")
+    if results["peak_rss_bytes"]:
+        print(f"Peak RSS:         {results['peak_rss_bytes'] / 1024 / 1024:.1f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reader", choices=["stub", "real"], default="stub")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--images", nargs="+", default=["uploads"])
+    parser.add_argument("--preprocess", default="threshold")
+    parser.add_argument("--translation-latency", type=float, default=0.02,
+                        help="simulated seconds per translation batch (local backend)")
+    parser.add_argument("--output", "-o", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative regression before failing (default: 0.25)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="store results as the baseline")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.reader, args.iterations, args.images,
+                        preprocess_spec=args.preprocess,
+                        translation_latency=args.translation_latency)
+    print_report(results)
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        Path(path).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
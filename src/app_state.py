@@ -0,0 +1,129 @@
+"""Per-session result caches for the Streamlit app.
+
+Streamlit re-runs the whole script on every widget change.  The helpers in
+this module keep the last extractions (per upload hash and preprocessing
+settings) and translations (per text and language) in small LRU maps stored
+in ``st.session_state``, so switching the target language or toggling
+preprocessing back costs a dictionary lookup.  Misses fall through to the
+process-wide OCR and translation caches, which are shared by all sessions.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from ocr_cache import hash_image
+from preprocessing import get_pipeline
+
+# Extractions (with their preprocessed preview) kept per session
+DEFAULT_MAX_EXTRACTIONS = 16
+
+# Translations kept per session
+DEFAULT_MAX_TRANSLATIONS = 256
+
+# Target languages translated at the same time
+DEFAULT_FANOUT_WORKERS = 6
+
+
+class LruCache:
+    """Small thread-safe mapping that evicts the least recently used entry.
+
+    Args:
+        max_entries: Maximum number of entries kept
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Return the value for key (marking it recently used), or default."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key, value):
+        """Store a value, evicting the oldest entries over the limit."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+def extraction_key(image_bytes, preprocess_steps=None, auto_script=False):
+    """Key an upload by content hash, normalized preprocessing spec and script mode.
+
+    Raises:
+        ValueError: If the preprocessing spec is invalid
+    """
+    spec = None
+    if preprocess_steps:
+        # Spacing and parameter order do not change the preprocessing
+        spec = ",".join(
+            name + "".join(f":{key}={value}" for key, value in sorted(params.items()))
+            for name, params in get_pipeline(preprocess_steps).steps
+        )
+    return hash_image(image_bytes), spec, bool(auto_script)
+
+
+def get_session_caches(state, max_extractions=DEFAULT_MAX_EXTRACTIONS,
+                       max_translations=DEFAULT_MAX_TRANSLATIONS):
+    """Return the (extractions, translations) caches of a session, creating them once.
+
+    Args:
+        state: Mapping that survives reruns (``st.session_state``)
+    """
+    if "extractions" not in state:
+        state["extractions"] = LruCache(max_extractions)
+    if "translations" not in state:
+        state["translations"] = LruCache(max_translations)
+    return state["extractions"], state["translations"]
+
+
+def translate_languages(text, languages, translate, cache, max_workers=DEFAULT_FANOUT_WORKERS):
+    """Translate one text into several languages, fanning misses out concurrently.
+
+    Args:
+        text: Source text
+        languages: Target language codes, in display order
+        translate: Function (text, language) -> translation; exceptions it
+            raises are reported per language and not cached
+        cache: LruCache keyed by (text, language)
+        max_workers: Languages translated at the same time
+
+    Returns:
+        Dict of language code to translation, in the order of ``languages``
+    """
+    languages = list(dict.fromkeys(languages))
+    translations = {language: cache.get((text, language)) for language in languages}
+    missing = [language for language, value in translations.items() if value is None]
+    if not missing:
+        return translations
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+        futures = {language: executor.submit(translate, text, language) for language in missing}
+    for language, future in futures.items():
+        try:
+            translations[language] = future.result()
+        except Exception as e:
+            # Failures are shown but not cached, so the next rerun retries them
+            translations[language] = f"Translation Error: {str(e)}"
+            continue
+        cache.set((text, language), translations[language])
+    return translations
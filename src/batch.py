@@ -0,0 +1,160 @@
+"""Parallel batch OCR over directories, globs and file lists."""
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# File extensions picked up when a directory is given as input
+IMAGE_EXTENSIONS = {
+    ".bmp", ".gif", ".jfif", ".jpeg", ".jpg", ".png", ".tif", ".tiff", ".webp",
+}
+
+# Options for the OCR worker, set once per process by _init_worker
+_worker_options = {}
+
+
+def _is_glob(pattern):
+    return any(char in pattern for char in "*?[")
+
+
+def collect_images(inputs, file_list=None):
+    """Expand directories, glob patterns and file lists into image paths.
+
+    Args:
+        inputs: Iterable of file paths, directories or glob patterns
+        file_list: Optional path to a text file with one image path per line
+
+    Returns:
+        List of image paths in input order, without duplicates
+    """
+    paths = []
+    for item in inputs:
+        if _is_glob(item):
+            paths.extend(sorted(glob.glob(item, recursive=True)))
+        elif Path(item).is_dir():
+            paths.extend(
+                str(path) for path in sorted(Path(item).rglob("*"))
+                if path.is_file() and path.suffix.lower() in IMAGE_EXTENSIONS
+            )
+        else:
+            paths.append(item)
+
+    if file_list:
+        with open(file_list, encoding="utf-8") as handle:
+            paths.extend(
+                line.strip() for line in handle
+                if line.strip() and not line.lstrip().startswith("#")
+            )
+
+    seen = set()
+    return [path for path in paths if not (path in seen or seen.add(path))]
+
+
+def default_torch_threads(workers):
+    """Split the available cores evenly between worker processes."""
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def _init_worker(languages, confidence_threshold, torch_threads, extract_options=None,
+                 inference=None):
+    """Configure torch threading and load the reader once per worker."""
+    _worker_options.update(
+        languages=list(languages), confidence_threshold=confidence_threshold,
+        **(extract_options or {})
+    )
+    if torch_threads:
+        try:
+            import torch
+
+            torch.set_num_threads(torch_threads)
+        except ImportError:
+            pass
+    if inference is not None:
+        from inference import configure_inference
+
+        configure_inference(inference)
+
+    from reader_pool import get_reader
+
+    try:
+        get_reader(languages)
+    except Exception as e:
+        print(f"Error loading OCR model: {str(e)}")
+
+
+def _init_pool_worker(*init_args):
+    """Start a pool worker with empty metrics, then configure it like _init_worker."""
+    from metrics import set_metrics
+
+    # A forked worker inherits the parent's metrics, which must not be sent back
+    set_metrics(None)
+    _init_worker(*init_args)
+
+
+def _ocr_worker(image_path):
+    """Run OCR on one image inside a worker process."""
+    from main import extract_text_from_image
+
+    start = time.perf_counter()
+    results = extract_text_from_image(image_path, **_worker_options)
+    return image_path, results, {"ocr": time.perf_counter() - start}
+
+
+def _pool_ocr_worker(image_path):
+    """Run OCR in a pool worker and return the metrics it recorded with the result."""
+    from metrics import get_metrics
+
+    return _ocr_worker(image_path), get_metrics().drain()
+
+
+def run_batch(image_paths, languages=('en',), confidence_threshold=0.5,
+              workers=None, torch_threads=None, with_timings=False, inference=None,
+              **extract_options):
+    """Run OCR over many images using a process pool.
+
+    Each worker loads its EasyOCR reader once and keeps it for every image it
+    handles.  Results are yielded in input order as soon as they are ready,
+    and the metrics each worker records are merged into this process's
+    registry.
+
+    Args:
+        image_paths: List of image paths
+        languages: List of language codes to recognize (default: ['en'])
+        confidence_threshold: Minimum confidence score to include text
+        workers: Number of worker processes (default: number of CPUs)
+        torch_threads: Torch threads per worker (default: CPUs / workers)
+        with_timings: Also yield a dict of per-stage timings for each image
+        inference: ``InferenceConfig`` installed in every worker (quantization,
+            inter-op threads, inference mode); None keeps EasyOCR's defaults
+        **extract_options: Extra keyword arguments for ``extract_text_from_image``
+
+    Yields:
+        Tuples of (image_path, results) where results are (bbox, text, confidence),
+        or (image_path, results, timings) when ``with_timings`` is set
+    """
+    image_paths = list(image_paths)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(image_paths) or 1))
+    if torch_threads is None:
+        torch_threads = default_torch_threads(workers)
+    init_args = (tuple(languages), confidence_threshold, torch_threads, extract_options,
+                 inference)
+
+    if workers == 1:
+        _init_worker(*init_args)
+        for image_path in image_paths:
+            output = _ocr_worker(image_path)
+            yield output if with_timings else output[:2]
+        return
+
+    from metrics import get_metrics
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_pool_worker,
+                             initargs=init_args) as executor:
+        chunksize = max(1, len(image_paths) // (workers * 4))
+        for output, metrics in executor.map(_pool_ocr_worker, image_paths,
+                                            chunksize=chunksize):
+            # Stage timings and counters were recorded in the worker process
+            get_metrics().merge(metrics)
+            yield output if with_timings else output[:2]
@@ -0,0 +1,173 @@
+"""Multi-image recognition on EasyOCR's batched entry points.
+
+``readtext`` runs the detection network on one image at a time.  The helpers
+in this module decode several images the same way ``readtext`` does, group
+them into buckets of similar size, pad each bucket to one shape (bottom/right
+only, so coordinates are unchanged) and run detection once per bucket batch.
+Recognition then runs on each original grayscale image with a batched
+recognizer, so every image gets exactly the (bbox, text, confidence) list
+``readtext`` would have returned.
+"""
+
+import os
+
+# Images are padded up to a multiple of this many pixels when bucketed
+DEFAULT_BUCKET_STEP = 64
+
+# Upper bound on images per detection batch
+DEFAULT_MAX_BATCH_SIZE = 8
+
+# Text crops per recognition batch (EasyOCR's ``batch_size``)
+DEFAULT_RECOGNITION_BATCH_SIZE = 16
+
+# Rough peak memory of the detection network per input pixel, in bytes
+DETECTION_BYTES_PER_PIXEL = 64
+
+# Share of the available memory a detection batch may use
+MEMORY_FRACTION = 0.25
+
+# Detection canvas size used by ``readtext`` (images are never upscaled past it)
+CANVAS_SIZE = 2560
+
+
+def available_memory():
+    """Return the available system memory in bytes, or None if unknown."""
+    try:
+        with open("/proc/meminfo", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def choose_batch_size(shape, max_batch_size=DEFAULT_MAX_BATCH_SIZE, available=None,
+                      memory_fraction=MEMORY_FRACTION):
+    """Pick how many images of ``shape`` to detect at once.
+
+    Args:
+        shape: (height, width) of the padded bucket
+        max_batch_size: Upper bound on the batch size
+        available: Available memory in bytes (default: measured)
+        memory_fraction: Share of the available memory a batch may use
+
+    Returns:
+        Batch size between 1 and ``max_batch_size``
+    """
+    available = available_memory() if available is None else available
+    if not available:
+        return max_batch_size
+    per_image = shape[0] * shape[1] * DETECTION_BYTES_PER_PIXEL
+    return max(1, min(max_batch_size, int(available * memory_fraction // per_image)))
+
+
+def bucket_shape(shape, step=DEFAULT_BUCKET_STEP):
+    """Round an image shape up to the bucket it belongs to.
+
+    Images whose longest side exceeds the detection canvas keep their exact
+    shape, because padding them would change the detector's resize ratio.
+    """
+    height, width = shape[:2]
+    padded = (-(-height // step) * step, -(-width // step) * step)
+    if max(padded) > CANVAS_SIZE:
+        return (height, width)
+    return padded
+
+
+def pad_to(image, shape):
+    """Pad an image with black on the bottom and right up to ``shape``."""
+    import cv2
+
+    height, width = image.shape[:2]
+    if (height, width) == tuple(shape):
+        return image
+    return cv2.copyMakeBorder(image, 0, shape[0] - height, 0, shape[1] - width,
+                              cv2.BORDER_CONSTANT, value=0)
+
+
+def decode(image):
+    """Decode an image exactly as ``readtext`` does.
+
+    Returns:
+        Tuple of (color image, grayscale image)
+    """
+    from easyocr.utils import reformat_input
+
+    if isinstance(image, (bytearray, memoryview)):
+        image = bytes(image)
+    color, grey = reformat_input(image)
+    if color is None or grey is None:
+        raise ValueError(f"Cannot decode image: {image if isinstance(image, str) else '<bytes>'}")
+    return color, grey
+
+
+def readtext_many(reader, images, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                  recognition_batch_size=DEFAULT_RECOGNITION_BATCH_SIZE,
+                  bucket_step=DEFAULT_BUCKET_STEP, available=None, **options):
+    """Run ``readtext`` semantics over many images with batched detection.
+
+    Readers without EasyOCR's ``recognize`` entry point (e.g. test stubs)
+    fall back to one ``readtext`` call per image.
+
+    Args:
+        reader: EasyOCR reader
+        images: List of image paths, encoded bytes or decoded arrays
+        max_batch_size: Upper bound on images per detection batch
+        recognition_batch_size: Text crops per recognition batch
+        bucket_step: Padding granularity used to bucket image sizes
+        available: Available memory in bytes used to size batches (default: measured)
+        **options: Extra keyword arguments for ``detect``
+
+    Returns:
+        List with one entry per image: a list of (bbox, text, confidence)
+        tuples, or the exception raised while decoding or reading that image
+    """
+    images = list(images)
+    outputs = [None] * len(images)
+    if not hasattr(reader, "recognize"):
+        for index, image in enumerate(images):
+            try:
+                outputs[index] = reader.readtext(image, batch_size=recognition_batch_size)
+            except Exception as e:
+                outputs[index] = e
+        return outputs
+
+    buckets = {}
+    for index, image in enumerate(images):
+        try:
+            color, grey = decode(image)
+        except Exception as e:
+            outputs[index] = e
+            continue
+        buckets.setdefault(bucket_shape(color.shape, bucket_step), []).append(
+            (index, color, grey)
+        )
+
+    import numpy as np
+
+    for shape, members in buckets.items():
+        batch_size = choose_batch_size(shape, max_batch_size, available)
+        for start in range(0, len(members), batch_size):
+            chunk = members[start:start + batch_size]
+            batch = np.stack([pad_to(color, shape) for _, color, _ in chunk])
+            try:
+                horizontal_lists, free_lists = reader.detect(batch, reformat=False, **options)
+            except Exception as e:
+                for index, _, _ in chunk:
+                    outputs[index] = e
+                continue
+            for (index, _, grey), horizontal_list, free_list in zip(
+                chunk, horizontal_lists, free_lists
+            ):
+                try:
+                    outputs[index] = reader.recognize(
+                        grey, horizontal_list, free_list,
+                        batch_size=recognition_batch_size, reformat=False,
+                    )
+                except Exception as e:
+                    outputs[index] = e
+    return outputs
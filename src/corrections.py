@@ -0,0 +1,241 @@
+"""Data-driven, single-pass OCR text correction.
+
+Correction rules live in per-language dictionary files under
+``data/corrections/`` (``common.tsv`` plus ``<lang>.tsv``), one
+``misread<TAB>replacement`` pair per line.  All literal rules are compiled
+into one trie-shaped regular expression, so the text is scanned once no
+matter how many rules there are.  An optional vocabulary index
+(``<lang>.vocab``) fixes unseen misreads within a small edit distance.
+"""
+
+import re
+import threading
+from pathlib import Path
+
+# Directory holding the bundled correction dictionaries
+DATA_DIR = Path(__file__).parent / "data" / "corrections"
+
+# Words shorter than this are never corrected against the vocabulary
+MIN_VOCABULARY_WORD = 4
+
+_TOKEN = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+
+def load_rules(path):
+    """Load ``misread<TAB>replacement`` rules from a dictionary file.
+
+    Blank lines and lines starting with '#' are ignored.
+
+    Returns:
+        List of (misread, replacement) tuples in file order
+    """
+    rules = []
+    with open(path, encoding="utf-8") as handle:
+        for number, line in enumerate(handle, 1):
+            line = line.rstrip("\n")
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            misread, sep, replacement = line.partition("\t")
+            if not sep or not misread:
+                raise ValueError(f"{path}:{number}: expected '<misread><TAB><replacement>'")
+            rules.append((misread, replacement))
+    return rules
+
+
+def _trie_pattern(words):
+    """Build a regex matching any of ``words``, longest alternative first."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        terminal = "" in node
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class VocabularyIndex:
+    """Symmetric-delete index for fast edit-distance lookups.
+
+    Args:
+        words: Iterable of vocabulary words
+        max_distance: Maximum edit distance for a suggestion (1 or 2)
+    """
+
+    def __init__(self, words, max_distance=1):
+        self.max_distance = max_distance
+        self.words = {word.lower() for word in words if word}
+        self._deletes = {}
+        for word in self.words:
+            for variant in self._variants(word):
+                self._deletes.setdefault(variant, set()).add(word)
+
+    def _variants(self, word):
+        variants = {word}
+        frontier = {word}
+        for _ in range(self.max_distance):
+            frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+            variants |= frontier
+        return variants
+
+    @staticmethod
+    def distance(a, b):
+        """Damerau-Levenshtein (optimal string alignment) distance."""
+        previous2, previous = None, list(range(len(b) + 1))
+        for i, char_a in enumerate(a, 1):
+            current = [i] + [0] * len(b)
+            for j, char_b in enumerate(b, 1):
+                cost = char_a != char_b
+                current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+                if (previous2 is not None and i > 1 and j > 1
+                        and char_a == b[j - 2] and a[i - 2] == char_b):
+                    current[j] = min(current[j], previous2[j - 2] + 1)
+            previous2, previous = previous, current
+        return previous[-1]
+
+    def lookup(self, word):
+        """Return the closest vocabulary word, or None if none is close enough."""
+        word = word.lower()
+        if word in self.words:
+            return word
+        candidates = set()
+        for variant in self._variants(word):
+            candidates |= self._deletes.get(variant, set())
+        best = None
+        for candidate in sorted(candidates):
+            distance = self.distance(word, candidate)
+            if distance <= self.max_distance and (best is None or distance < best[0]):
+                best = (distance, candidate)
+        return best[1] if best else None
+
+
+def _match_case(template, word):
+    if template.isupper():
+        return word.upper()
+    if template[:1].isupper():
+        return word.capitalize()
+    return word
+
+
+class CorrectionEngine:
+    """Apply many correction rules to text in a single scan.
+
+    Args:
+        rules: List of (misread, replacement) tuples; misreads prefixed with
+            're:' are regular expressions, the rest are literal strings
+        vocabulary: Optional VocabularyIndex for unseen misreads
+    """
+
+    def __init__(self, rules=(), vocabulary=None):
+        self.vocabulary = vocabulary
+        self._literals = {}
+        regexes = []
+        for misread, replacement in rules:
+            if misread.startswith("re:"):
+                regexes.append((misread[3:], replacement))
+            else:
+                self._literals.setdefault(misread.lower(), replacement)
+
+        alternatives = []
+        if self._literals:
+            alternatives.append("(?P<literal>" + _trie_pattern(self._literals) + ")")
+        self._regex_replacements = {}
+        for index, (pattern, replacement) in enumerate(regexes):
+            alternatives.append(f"(?P<r{index}>{pattern})")
+            # Group references in the replacement are resolved against the
+            # rule's own pattern, not the combined one
+            self._regex_replacements[f"r{index}"] = (
+                re.compile(pattern, re.IGNORECASE), replacement
+            )
+        self._pattern = (
+            re.compile("|".join(alternatives), re.IGNORECASE) if alternatives else None
+        )
+
+    def __len__(self):
+        return len(self._literals) + len(self._regex_replacements)
+
+    def _replace(self, match):
+        if match.lastgroup == "literal":
+            return self._literals[match.group(0).lower()]
+        pattern, replacement = self._regex_replacements[match.lastgroup]
+        return pattern.sub(replacement, match.group(0), count=1)
+
+    def _correct_word(self, match):
+        word = match.group(0)
+        if len(word) < MIN_VOCABULARY_WORD:
+            return word
+        suggestion = self.vocabulary.lookup(word)
+        return _match_case(word, suggestion) if suggestion else word
+
+    def correct(self, text):
+        """Normalize whitespace and apply every correction rule.
+
+        Args:
+            text: Raw OCR text
+
+        Returns:
+            Corrected text
+        """
+        cleaned = " ".join(text.split())
+        if self._pattern is not None:
+            cleaned = self._pattern.sub(self._replace, cleaned)
+        if self.vocabulary is not None:
+            cleaned = _TOKEN.sub(self._correct_word, cleaned)
+        return cleaned
+
+    @classmethod
+    def from_files(cls, paths, vocabulary_paths=(), max_distance=1):
+        """Build an engine from dictionary and vocabulary files."""
+        rules = []
+        for path in paths:
+            rules.extend(load_rules(path))
+        vocabulary = None
+        if vocabulary_paths:
+            words = []
+            for path in vocabulary_paths:
+                with open(path, encoding="utf-8") as handle:
+                    words.extend(line.strip() for line in handle
+                                 if line.strip() and not line.startswith("#"))
+            vocabulary = VocabularyIndex(words, max_distance)
+        return cls(rules, vocabulary)
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_correction_engine(language="en", use_vocabulary=False, data_dir=DATA_DIR):
+    """Return the shared engine for a language's bundled dictionaries.
+
+    Loads ``common.tsv`` and ``<language>.tsv`` (and ``<language>.vocab`` when
+    ``use_vocabulary`` is set) from ``data_dir``; missing files are skipped.
+    """
+    key = (language, use_vocabulary, str(data_dir))
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            data_dir = Path(data_dir)
+            paths = [path for path in (data_dir / "common.tsv", data_dir / f"{language}.tsv")
+                     if path.exists()]
+            vocabulary_paths = []
+            vocabulary_path = data_dir / f"{language}.vocab"
+            if use_vocabulary and vocabulary_path.exists():
+                vocabulary_paths.append(vocabulary_path)
+            engine = _engines[key] = CorrectionEngine.from_files(paths, vocabulary_paths)
+        return engine
+
+
+def correct_text(text, language="en", use_vocabulary=False):
+    """Correct OCR text with the bundled dictionaries for ``language``."""
+    return get_correction_engine(language, use_vocabulary).correct(text)
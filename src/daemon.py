@@ -0,0 +1,329 @@
+"""Resident warm-model daemon on a Unix socket, and its thin client.
+
+Every ``python src/main.py image.png`` pays interpreter, torch and model load
+startup.  The daemon keeps readers, caches and translation clients warm in one
+long-lived process; ``main`` forwards single-image requests to it when it is
+running and falls back to in-process execution when it is not.  The daemon
+exits after an idle timeout, and drops its readers (or exits) when its
+resident memory grows past a cap.
+
+Protocol: one JSON request line per connection, answered by one JSON line.
+
+Usage:
+    python src/daemon.py start --idle-timeout 600 --memory-cap-mb 4096
+    python src/daemon.py status
+    python src/daemon.py stop
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+
+from translation_cache import default_cache_dir
+
+# Seconds without a request before the daemon exits
+DEFAULT_IDLE_TIMEOUT = 600
+
+# Resident memory (MB) above which the daemon drops its readers
+DEFAULT_MEMORY_CAP_MB = 4096
+
+# Seconds the client waits to connect before falling back to in-process
+CONNECT_TIMEOUT = 0.2
+
+# Seconds the client waits for the daemon to answer one request
+REQUEST_TIMEOUT = 600
+
+# Largest request or response line, in bytes
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+
+def default_socket_path():
+    """Return the daemon socket path (``IMG2TXT_DAEMON_SOCKET`` or the cache dir)."""
+    return Path(os.environ.get("IMG2TXT_DAEMON_SOCKET")
+                or default_cache_dir() / "daemon.sock")
+
+
+def current_rss_bytes():
+    """Return the resident set size of this process in bytes, or None if unknown."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _read_message(stream):
+    line = stream.readline(MAX_MESSAGE_BYTES)
+    if not line:
+        raise ConnectionError("Connection closed before a message was received")
+    return json.loads(line)
+
+
+def _results_to_json(results):
+    return [[[[float(x), float(y)] for x, y in bbox], text, float(conf)]
+            for (bbox, text, conf) in results]
+
+
+def _results_from_json(results):
+    return [(bbox, text, conf) for bbox, text, conf in results]
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        daemon = self.server.ocr_daemon
+        try:
+            request = _read_message(self.rfile)
+            response = daemon.handle_request(request)
+        except Exception as e:
+            response = {"ok": False, "error": str(e)}
+        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class OcrDaemon:
+    """Unix-socket server answering extraction requests with warm readers.
+
+    Args:
+        socket_path: Path of the Unix socket (default: ``default_socket_path()``)
+        idle_timeout: Seconds without requests before shutting down (None = never)
+        memory_cap_mb: Resident memory cap in MB (None = unlimited)
+    """
+
+    def __init__(self, socket_path=None, idle_timeout=DEFAULT_IDLE_TIMEOUT,
+                 memory_cap_mb=DEFAULT_MEMORY_CAP_MB):
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.idle_timeout = idle_timeout
+        self.memory_cap = memory_cap_mb * 1024 * 1024 if memory_cap_mb else None
+        self.started_at = time.time()
+        self.last_activity = time.monotonic()
+        self.requests = 0
+        self.reader_drops = 0
+        self.stop_reason = None
+        self._ocr_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._server = None
+
+    def handle_request(self, request):
+        """Answer one decoded request dict."""
+        self.last_activity = time.monotonic()
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid()}
+        if op == "stats":
+            return {"ok": True, "stats": self.stats()}
+        if op == "shutdown":
+            self.stop("shutdown requested")
+            return {"ok": True}
+        if op != "extract":
+            return {"ok": False, "error": f"Unknown op: {op}"}
+
+        from main import extract_text_from_image, join_text, translate_text
+
+        with self._ocr_lock:
+            results = extract_text_from_image(
+                request["image_path"],
+                languages=request.get("languages") or ["en"],
+                confidence_threshold=request.get("confidence_threshold", 0.5),
+                **request.get("options", {}),
+            )
+        translation = None
+        if request.get("translate") and results:
+            translation = translate_text(join_text(results), request["translate"])
+        self.requests += 1
+        self.last_activity = time.monotonic()
+        self.enforce_memory_cap()
+        return {"ok": True, "results": _results_to_json(results), "translation": translation}
+
+    def enforce_memory_cap(self):
+        """Drop the readers when over the memory cap; stop if that is not enough."""
+        if self.memory_cap is None:
+            return
+        rss = current_rss_bytes()
+        if rss is None or rss <= self.memory_cap:
+            return
+        import gc
+
+        from reader_pool import clear_readers
+
+        with self._ocr_lock:
+            clear_readers()
+            gc.collect()
+            self.reader_drops += 1
+        rss = current_rss_bytes()
+        if rss is not None and rss > self.memory_cap:
+            self.stop(f"memory cap exceeded ({rss // (1024 * 1024)} MB)")
+
+    def stats(self):
+        return {
+            "pid": os.getpid(),
+            "uptime": time.time() - self.started_at,
+            "requests": self.requests,
+            "rss_bytes": current_rss_bytes(),
+            "reader_drops": self.reader_drops,
+            "idle_timeout": self.idle_timeout,
+            "memory_cap": self.memory_cap,
+        }
+
+    def _watch_idle(self):
+        while not self._stopped.wait(min(1.0, self.idle_timeout / 4)):
+            if time.monotonic() - self.last_activity > self.idle_timeout:
+                self.stop("idle timeout")
+
+    def bind(self):
+        """Create the listening socket, replacing a stale socket file."""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if DaemonClient(self.socket_path).ping():
+                raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+            self.socket_path.unlink()
+        self._server = _UnixServer(str(self.socket_path), _Handler)
+        self._server.ocr_daemon = self
+        os.chmod(self.socket_path, 0o600)
+
+    def serve_forever(self):
+        """Serve requests until stopped, idle for too long, or over the memory cap."""
+        if self._server is None:
+            self.bind()
+        if self.idle_timeout:
+            threading.Thread(target=self._watch_idle, name="daemon-idle", daemon=True).start()
+        try:
+            self._server.serve_forever(poll_interval=0.1)
+        finally:
+            self._server.server_close()
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+            self._stopped.set()
+
+    def stop(self, reason="stopped"):
+        """Ask the server loop to exit (safe to call from handler threads)."""
+        if self.stop_reason is None:
+            self.stop_reason = reason
+            self._stopped.set()
+            if self._server is not None:
+                threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+
+class DaemonClient:
+    """Client for a running OcrDaemon.
+
+    Args:
+        socket_path: Path of the daemon's Unix socket (default: ``default_socket_path()``)
+    """
+
+    def __init__(self, socket_path=None):
+        self.socket_path = Path(socket_path or default_socket_path())
+
+    def request(self, payload, timeout=REQUEST_TIMEOUT):
+        """Send one request and return the decoded response.
+
+        Raises:
+            OSError: If the daemon is not reachable
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix sockets are not supported on this platform")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(self.socket_path))
+            sock.settimeout(timeout)
+            with sock.makefile("rwb") as stream:
+                stream.write((json.dumps(payload) + "\n").encode("utf-8"))
+                stream.flush()
+                return _read_message(stream)
+
+    def ping(self):
+        """Return True if a daemon answers on the socket."""
+        try:
+            return bool(self.request({"op": "ping"}, timeout=CONNECT_TIMEOUT).get("ok"))
+        except (OSError, ValueError, ConnectionError):
+            return False
+
+    def extract(self, image_path, translate_to=None, languages=None,
+                confidence_threshold=0.5, **options):
+        """Extract (and optionally translate) one image in the daemon.
+
+        Returns:
+            Tuple of (results, translation), or None when no daemon is running
+            or it could not answer
+        """
+        if not self.socket_path.exists():
+            return None
+        try:
+            response = self.request({
+                "op": "extract",
+                "image_path": str(Path(image_path).resolve()),
+                "languages": languages,
+                "confidence_threshold": confidence_threshold,
+                "options": options,
+                "translate": translate_to,
+            })
+        except (OSError, ValueError, ConnectionError):
+            return None
+        if not response.get("ok"):
+            return None
+        return _results_from_json(response["results"]), response.get("translation")
+
+
+def build_parser():
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(prog="daemon.py",
+                                     description="Keep OCR models warm for the CLI.")
+    parser.add_argument("command", choices=["start", "stop", "status"])
+    parser.add_argument("--socket", metavar="PATH", help="Unix socket path")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help="seconds without requests before exiting (0 = never)")
+    parser.add_argument("--memory-cap-mb", type=int, default=DEFAULT_MEMORY_CAP_MB,
+                        help="resident memory cap in MB (0 = unlimited)")
+    parser.add_argument("--languages", default="en",
+                        help="comma-separated OCR languages to load at startup")
+    return parser
+
+
+def main(argv=None):
+    """Start, stop or query the daemon."""
+    args = build_parser().parse_args(argv)
+    client = DaemonClient(args.socket)
+
+    if args.command == "status":
+        if not client.ping():
+            print("Daemon is not running")
+            return 1
+        print(json.dumps(client.request({"op": "stats"})["stats"], indent=2))
+        return 0
+    if args.command == "stop":
+        if not client.ping():
+            print("Daemon is not running")
+            return 1
+        client.request({"op": "shutdown"})
+        print("Daemon stopped")
+        return 0
+
+    daemon = OcrDaemon(args.socket, args.idle_timeout or None, args.memory_cap_mb or None)
+    daemon.bind()
+    from reader_pool import get_reader
+
+    get_reader(args.languages.split(","))
+    print(f"Daemon listening on {daemon.socket_path} (pid {os.getpid()})")
+    daemon.serve_forever()
+    print(f"Daemon exited: {daemon.stop_reason}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""CPU inference settings for EasyOCR readers.
+
+By default ``easyocr.Reader`` lets torch use every core for intra-op work,
+which fights with the process pool in batch mode, and runs under
+``torch.no_grad`` only.  The configuration in this module controls dynamic
+int8 quantization of the recognition and detection networks, the intra-op
+and inter-op thread counts, and whether inference runs under
+``torch.inference_mode``.  ``configure_inference`` installs it as the reader
+factory of the shared pool, so every reader loaded afterwards uses it.
+
+Dynamic quantization converts ``Linear`` and ``LSTM`` layers: the recognizer's
+sequence model shrinks and speeds up, while the convolutional CRAFT detector
+is left essentially unchanged.
+"""
+
+import threading
+
+# Which networks get dynamic int8 quantization
+QUANTIZE_MODES = ("off", "recognizer", "all")
+
+# EasyOCR quantizes both networks on CPU unless told otherwise
+DEFAULT_QUANTIZE = "all"
+
+# Reader methods run under torch.inference_mode
+INFERENCE_METHODS = ("readtext", "readtext_batched", "detect", "recognize")
+
+
+class InferenceConfig:
+    """CPU inference settings applied to every reader the pool loads.
+
+    Args:
+        quantize: "off", "recognizer" or "all" (recognizer and detector)
+        intra_op_threads: Torch threads per operator (None = torch default)
+        inter_op_threads: Torch threads running independent operators
+            (None = torch default; can only be set before torch starts work)
+        inference_mode: Run reader calls under ``torch.inference_mode``
+    """
+
+    def __init__(self, quantize=DEFAULT_QUANTIZE, intra_op_threads=None,
+                 inter_op_threads=None, inference_mode=True):
+        if quantize not in QUANTIZE_MODES:
+            raise ValueError(
+                f"Unknown quantization mode '{quantize}' "
+                f"(choose from: {', '.join(QUANTIZE_MODES)})"
+            )
+        self.quantize = quantize
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+        self.inference_mode = inference_mode
+
+    def describe(self):
+        """Return the settings as a dict (for reports and logs)."""
+        return {
+            "quantize": self.quantize,
+            "intra_op_threads": self.intra_op_threads,
+            "inter_op_threads": self.inter_op_threads,
+            "inference_mode": self.inference_mode,
+        }
+
+    def __eq__(self, other):
+        return isinstance(other, InferenceConfig) and self.describe() == other.describe()
+
+    def __repr__(self):
+        settings = ", ".join(f"{key}={value!r}" for key, value in self.describe().items())
+        return f"InferenceConfig({settings})"
+
+
+def apply_threads(config):
+    """Set torch's intra-op and inter-op thread counts from a config.
+
+    Returns:
+        Dict of the thread counts actually in effect
+    """
+    import torch
+
+    if config.intra_op_threads:
+        torch.set_num_threads(config.intra_op_threads)
+    if config.inter_op_threads:
+        try:
+            torch.set_num_interop_threads(config.inter_op_threads)
+        except RuntimeError as e:
+            # Torch refuses once its inter-op pool has started
+            print(f"Warning: inter-op threads left at "
+                  f"{torch.get_num_interop_threads()}: {str(e)}")
+    return {"intra_op_threads": torch.get_num_threads(),
+            "inter_op_threads": torch.get_num_interop_threads()}
+
+
+def quantize_module(module):
+    """Apply dynamic int8 quantization to a network's Linear and LSTM layers."""
+    import torch
+
+    quantize_dynamic = getattr(torch, "ao", torch).quantization.quantize_dynamic
+    return quantize_dynamic(module, {torch.nn.Linear, torch.nn.LSTM}, dtype=torch.qint8)
+
+
+class InferenceReader:
+    """Reader proxy that runs inference calls under ``torch.inference_mode``.
+
+    Every other attribute is forwarded to the wrapped reader unchanged.
+    """
+
+    def __init__(self, reader):
+        self._reader = reader
+
+    def __getattr__(self, name):
+        attribute = getattr(self._reader, name)
+        if name not in INFERENCE_METHODS or not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            import torch
+
+            with torch.inference_mode():
+                return attribute(*args, **kwargs)
+
+        return call
+
+
+def build_reader(languages, config, **options):
+    """Load an EasyOCR reader with the quantization and inference settings of a config."""
+    import easyocr
+
+    # EasyOCR can only quantize both networks together, so load unquantized
+    # and quantize the selected networks here (dynamic quantization is CPU-only)
+    reader = easyocr.Reader(list(languages), quantize=False, **options)
+    if config.quantize != "off" and getattr(reader, "device", "cpu") == "cpu":
+        if getattr(reader, "recognizer", None) is not None:
+            reader.recognizer = quantize_module(reader.recognizer)
+        if config.quantize == "all" and getattr(reader, "detector", None) is not None:
+            reader.detector = quantize_module(reader.detector)
+    return InferenceReader(reader) if config.inference_mode else reader
+
+
+_config = None
+_config_lock = threading.Lock()
+
+
+def get_inference_config():
+    """Return the installed inference config, or None when EasyOCR defaults apply."""
+    return _config
+
+
+def configure_inference(config):
+    """Install a config process-wide: set threads and reload readers with it.
+
+    Passing None restores EasyOCR's default reader factory.
+    """
+    global _config
+    from reader_pool import _easyocr_factory, get_registry
+
+    with _config_lock:
+        registry = get_registry()
+        if config is None:
+            registry.factory = _easyocr_factory
+        else:
+            apply_threads(config)
+            registry.factory = lambda languages, **options: build_reader(
+                languages, config, **options)
+        if config != _config:
+            # Readers loaded under the previous settings must not be reused
+            registry.clear()
+        _config = config
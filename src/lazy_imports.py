@@ -0,0 +1,93 @@
+"""Deferred imports for heavy dependencies.
+
+Importing ``easyocr`` pulls in torch and costs seconds, which the CLI paid
+even for ``--help`` or a missing image path.  The proxies in this module stand
+in for a module or one of its attributes and import it on first real use, so
+``main`` can keep module-level names such as ``easyocr`` and
+``GoogleTranslator`` (and tests can keep patching them) without paying for the
+import up front.
+"""
+
+import importlib
+import sys
+import threading
+
+_lock = threading.Lock()
+
+
+def is_loaded(module_name):
+    """Return True if ``module_name`` has already been imported in this process."""
+    return module_name in sys.modules
+
+
+class LazyModule:
+    """Module proxy that imports the real module on first attribute access.
+
+    Attribute reads, writes and deletes (including ``__dict__``, which
+    ``unittest.mock.patch`` inspects) are forwarded to the real module.
+
+    Args:
+        name: Importable module name, e.g. "easyocr"
+    """
+
+    def __init__(self, name):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+
+    def _load(self):
+        module = object.__getattribute__(self, "_module")
+        if module is None:
+            with _lock:
+                module = object.__getattribute__(self, "_module")
+                if module is None:
+                    module = importlib.import_module(object.__getattribute__(self, "_name"))
+                    object.__setattr__(self, "_module", module)
+        return module
+
+    def __getattribute__(self, attr):
+        if attr in ("_load", "__class__", "__repr__"):
+            return object.__getattribute__(self, attr)
+        return getattr(object.__getattribute__(self, "_load")(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr):
+        delattr(self._load(), attr)
+
+    def __repr__(self):
+        name = object.__getattribute__(self, "_name")
+        state = "loaded" if object.__getattribute__(self, "_module") else "not loaded"
+        return f"<lazy module '{name}' ({state})>"
+
+
+class LazyAttribute:
+    """Callable proxy for a class or function imported on first call.
+
+    Args:
+        module_name: Module that defines the attribute
+        attr: Attribute name, e.g. "GoogleTranslator"
+    """
+
+    def __init__(self, module_name, attr):
+        self._module_name = module_name
+        self._attr = attr
+        self._target = None
+
+    def resolve(self):
+        """Import the module and return the real attribute."""
+        if self._target is None:
+            module = importlib.import_module(self._module_name)
+            self._target = getattr(module, self._attr)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self):
+        return f"<lazy attribute '{self._module_name}.{self._attr}'>"
@@ -1,48 +1,290 @@
 """Main entry point for the application."""
 
+import argparse
 import sys
+import time
 from pathlib import Path
-import easyocr
-from deep_translator import GoogleTranslator
 
+from batch import collect_images, run_batch
+from batched_recognition import DEFAULT_MAX_BATCH_SIZE, readtext_many
+from corrections import get_correction_engine
+from daemon import DaemonClient
+from inference import (
+    DEFAULT_QUANTIZE, QUANTIZE_MODES, InferenceConfig, configure_inference, get_inference_config,
+)
+from lazy_imports import LazyAttribute, LazyModule
+from metrics import SnapshotWriter, get_metrics, increment, record_failure, timer
+from ocr_cache import get_ocr_cache, image_cache_key
+from output import JsonlWriter, ParquetWriter
+from pages import DEFAULT_PAGE_WORKERS, DEFAULT_PDF_DPI, is_multipage, read_pages
+from pipeline import run_pipeline
+from prefilter import DEFAULT_SENSITIVITY, MODES as PREFILTER_MODES, get_prefilter
+from preprocessing import get_pipeline
+from reader_pool import get_reader, normalize_languages
+from results import OcrResults
+from resolution import DEFAULT_MIN_TEXT_HEIGHT, read_downscaled
+from script_detection import SCRIPT_LANGUAGES, ScriptReader, parse_scripts, read_by_script
+from tiling import DEFAULT_TILE_SIZE, read_tiled
+from translation_cache import get_translation_cache
+from video import (
+    DEFAULT_DIFF_THRESHOLD, DEFAULT_SAMPLE_FPS, SUBTITLE_FORMATS, iter_frames, subtitle_stream,
+    write_subtitles,
+)
+from translation_engine import (
+    BACKENDS, DEFAULT_CHUNK_CHARS, TranslationEngine, create_backend, get_translation_engine,
+    set_translation_engine,
+)
 
-def extract_text_from_image(image_path, languages=['en'], confidence_threshold=0.5):
+__version__ = "0.1.0"
+
+# Heavy dependencies are imported on first use so --help, --version and
+# --dry-run start instantly
+easyocr = LazyModule("easyocr")
+GoogleTranslator = LazyAttribute("deep_translator", "GoogleTranslator")
+
+
+def cache_params(downscale=False, preprocess=None, correct=False, tile=None, prefilter=None,
+                 prefilter_sensitivity=DEFAULT_SENSITIVITY, scripts=None):
+    """Return the OCR cache key parameters for a set of extraction options.
+    
+    Every extraction path builds its key here, so options that change the
+    results (including the installed inference config) always change the key.
+    """
+    params = {}
+    if downscale:
+        params["downscale"] = DEFAULT_MIN_TEXT_HEIGHT
+    if preprocess:
+        params["preprocess"] = get_pipeline(preprocess).spec
+    if correct:
+        params["correct"] = True
+    if tile:
+        params["tile"] = tile
+    if prefilter:
+        params["prefilter"] = f"{prefilter}:{prefilter_sensitivity}"
+    if scripts:
+        params["scripts"] = ",".join(parse_scripts(scripts))
+    # int8 and fp32 networks read slightly differently
+    inference = get_inference_config()
+    if inference is not None:
+        params["quantize"] = inference.quantize
+    return params
+
+
+def finish_results(results, confidence_threshold, languages, correct=False, to_source=None):
+    """Turn raw recognizer output into the OcrResults every extraction path returns.
+    
+    Args:
+        results: (bbox, text, confidence) tuples from the recognizer
+        confidence_threshold: Minimum confidence score to include text
+        languages: Language codes; the first picks the correction dictionaries
+        correct: Fix known OCR misreads (default: False)
+        to_source: 2x3 matrix mapping bboxes back to the source image (optional)
+    
+    Returns:
+        OcrResults filtered by confidence and in reading order
+    """
+    columns = OcrResults.from_results(results)
+    if to_source is not None:
+        # Map bboxes from the resized or deskewed image back to the source
+        columns = columns.map_boxes(to_source)
+    
+    # Filter results by confidence threshold to exclude ambiguous recognition
+    columns = columns.filter(confidence_threshold).reading_order()
+    
+    if correct:
+        engine = get_correction_engine(normalize_languages(languages)[0])
+        with timer("correction"):
+            columns = columns.with_texts([engine.correct(text) for text in columns.texts])
+    return columns
+
+
+def extract_text_from_image(image_path, languages=['en'], confidence_threshold=0.5,
+                            use_cache=True, downscale=False, preprocess=None,
+                            correct=False, tile=None, prefilter=None,
+                            prefilter_sensitivity=DEFAULT_SENSITIVITY, scripts=None):
     """Extract text from an image using EasyOCR.
     
+    Results are cached under a hash of the image content and the OCR settings,
+    so a repeated image skips recognition entirely.
+    
     Args:
-        image_path: Path to the image file
+        image_path: Path to the image file (or a decoded image array)
         languages: List of language codes to recognize (default: ['en'])
         confidence_threshold: Minimum confidence score to include text (default: 0.5)
+        use_cache: Consult and update the OCR result cache (default: True)
+        downscale: Shrink large images to the smallest size that keeps the
+            text legible before recognition (default: False)
+        preprocess: Preprocessing spec such as "denoise,threshold" applied to
+            a grayscale decode of the image before recognition (optional)
+        correct: Fix known OCR misreads with the correction dictionaries of
+            the first language (default: False)
+        tile: Tile size in pixels; large images are recognized as overlapping
+            tiles in parallel instead of whole (optional, overrides downscale)
+        prefilter: Text-presence prefilter mode ("detect" or "edges"); images
+            without text regions skip recognition, and in "detect" mode only
+            the detected regions are recognized (optional)
+        prefilter_sensitivity: Prefilter sensitivity in [0, 1]; higher finds
+            fainter text but skips fewer images (default: 0.5)
+        scripts: "auto" or comma-separated scripts ("latin,devanagari"); each
+            detected region is recognized by the reader for its script instead
+            of one reader for ``languages``, whose reader only detects the
+            regions (optional, cannot be combined with tile or downscale)
         
     Returns:
-        List of tuples containing (bbox, text, confidence)
+        OcrResults in reading order; iterating yields (bbox, text, confidence)
+        tuples like the plain result lists
+    
+    Raises:
+        ValueError: If scripts is combined with tile or downscale
     """
+    if scripts and (tile or downscale):
+        raise ValueError("scripts cannot be combined with tile or downscale")
     try:
-        # Initialize the EasyOCR reader
-        reader = easyocr.Reader(languages)
+        cache_key = None
+        if use_cache:
+            params = cache_params(downscale=downscale, preprocess=preprocess, correct=correct,
+                                  tile=tile, prefilter=prefilter,
+                                  prefilter_sensitivity=prefilter_sensitivity, scripts=scripts)
+            cache_key = image_cache_key(image_path, languages, confidence_threshold, params)
+        if cache_key is not None:
+            cached = get_ocr_cache().get(cache_key)
+            if cached is not None:
+                return OcrResults.from_results(cached)
+        
+        # Reuse the process-wide EasyOCR reader for this language set; script
+        # routing loads its own readers and needs this one only to detect
+        reader = None
+        if not scripts or prefilter == "detect":
+            reader = get_reader(languages)
+        
+        # Optionally decode to grayscale and run the preprocessing steps
+        image, to_source = image_path, None
+        if preprocess:
+            image, to_source = get_pipeline(preprocess).process(image_path)
+        
+        # Skip images without text; in detect mode recognize only the regions found
+        results = None
+        if prefilter:
+            results = get_prefilter(prefilter, prefilter_sensitivity).read(
+                reader, image, recognize_regions=not (tile or downscale or scripts))
         
         # Read text from the image
-        results = reader.readtext(image_path)
+        if results is None:
+            if scripts:
+                results = read_by_script(image, parse_scripts(scripts),
+                                         detector_languages=languages)
+            elif tile:
+                results = read_tiled(reader, image, tile_size=tile)
+            elif downscale:
+                results = read_downscaled(reader, image)
+            else:
+                # readtext runs detection and recognition in one call
+                with timer("recognition"):
+                    results = reader.readtext(image)
+        columns = finish_results(results, confidence_threshold, languages, correct=correct,
+                                 to_source=to_source)
         
-        # Filter results by confidence threshold to exclude ambiguous recognition
-        # Each result is a tuple: (bbox, text, confidence)
-        filtered_results = [
-            (bbox, text, conf) for (bbox, text, conf) in results 
-            if conf >= confidence_threshold
-        ]
+        if cache_key is not None:
+            get_ocr_cache().set(cache_key, columns)
         
-        return filtered_results
-    except FileNotFoundError:
+        increment("images_total")
+        return columns
+    except FileNotFoundError as e:
+        record_failure("ocr", e)
         print(f"Error: Image file not found: {image_path}")
-        return []
+        return OcrResults.from_results([])
     except Exception as e:
+        record_failure("ocr", e)
         print(f"Error processing image: {str(e)}")
-        return []
+        return OcrResults.from_results([])
+
+
+def extract_text_from_images(image_paths, languages=['en'], confidence_threshold=0.5,
+                             use_cache=True, correct=False, max_batch_size=None):
+    """Extract text from many images with batched detection and recognition.
+    
+    Images are bucketed by size and detected in memory-sized batches; each
+    image gets the same results ``extract_text_from_image`` returns for it.
+    
+    Args:
+        image_paths: List of image paths (or encoded bytes / decoded arrays)
+        languages: List of language codes to recognize (default: ['en'])
+        confidence_threshold: Minimum confidence score to include text (default: 0.5)
+        use_cache: Consult and update the OCR result cache (default: True)
+        correct: Fix known OCR misreads with the correction dictionaries of
+            the first language (default: False)
+        max_batch_size: Upper bound on images per detection batch (optional)
+    
+    Returns:
+        List with one OcrResults per image (empty for images that failed)
+    """
+    outputs = [OcrResults.from_results([]) for _ in image_paths]
+    params = cache_params(correct=correct)
+    cache_keys = [
+        image_cache_key(image, languages, confidence_threshold, params) if use_cache else None
+        for image in image_paths
+    ]
+    pending = []
+    for index, key in enumerate(cache_keys):
+        cached = get_ocr_cache().get(key) if key is not None else None
+        if cached is not None:
+            outputs[index] = OcrResults.from_results(cached)
+        else:
+            pending.append(index)
+    if not pending:
+        return outputs
+
+    try:
+        reader = get_reader(languages)
+        with timer("recognition", batched="true"):
+            batch_results = readtext_many(
+                reader, [image_paths[index] for index in pending],
+                max_batch_size=max_batch_size or DEFAULT_MAX_BATCH_SIZE,
+            )
+    except Exception as e:
+        record_failure("ocr", e)
+        print(f"Error processing images: {str(e)}")
+        return outputs
+
+    for index, results in zip(pending, batch_results):
+        if isinstance(results, Exception):
+            record_failure("ocr", results)
+            print(f"Error processing image: {str(results)}")
+            continue
+        columns = finish_results(results, confidence_threshold, languages, correct=correct)
+        if cache_keys[index] is not None:
+            get_ocr_cache().set(cache_keys[index], columns)
+        increment("images_total")
+        outputs[index] = columns
+    return outputs
+
+
+def extract_with_daemon(image_path, translate_to=None, **extract_options):
+    """Extract text through the warm-model daemon, or in-process if it is not running.
+    
+    Args:
+        image_path: Path to the image file
+        translate_to: Target language code the daemon should translate to (optional)
+        **extract_options: Extra keyword arguments for ``extract_text_from_image``
+        
+    Returns:
+        Tuple of (results, translated) where ``translated`` is None unless the
+        daemon already translated the text
+    """
+    forwarded = DaemonClient().extract(image_path, translate_to, **extract_options)
+    if forwarded is not None:
+        return forwarded
+    return extract_text_from_image(image_path, **extract_options), None
 
 
 def translate_text(text, target_language='es'):
     """Translate text to target language using Google Translate.
     
+    Translations are looked up in the persistent translation cache first.
+    Texts longer than one chunk are split into sentence chunks that are
+    translated concurrently and reassembled in order; a failed chunk stays
+    untranslated without discarding the others.
+    
     Args:
         text: Text to translate
         target_language: Target language code (default: 'es' for Spanish)
@@ -53,33 +295,96 @@ def translate_text(text, target_language='es'):
     try:
         if not text.strip():
             return text
-        translator = GoogleTranslator(source='auto', target=target_language)
-        translated = translator.translate(text)
-        return translated
+        
+        # Long documents would exceed provider limits in a single request
+        if len(text) > DEFAULT_CHUNK_CHARS:
+            return get_translation_engine().translate_long(text, target_language)
+        
+        # Repeated phrases are served from the translation cache
+        cache = get_translation_cache()
+        cached = cache.get(text, target_language)
+        if cached is not None:
+            return cached
+        
+        with timer("translation", backend="google"):
+            translator = GoogleTranslator(source='auto', target=target_language)
+            translated = translator.translate(text)
     except Exception as e:
+        record_failure("translation", e)
         print(f"Translation error: {str(e)}")
         return text
+    
+    # Caching is best-effort: workers sharing one SQLite file can find it
+    # locked, and that must not discard a translation that succeeded
+    if translated is not None:
+        try:
+            cache.set(text, target_language, translated)
+        except Exception as e:
+            record_failure("translation_cache", e)
+    return translated
+
+
+def join_text(results):
+    """Join the text of every (bbox, text, confidence) result with spaces."""
+    if isinstance(results, OcrResults):
+        return results.join()
+    return ' '.join(text for (bbox, text, conf) in results)
+
+
+def translate_texts(texts, target_language='es'):
+    """Translate many texts at once with the batched translation engine.
+    
+    Duplicate and cached texts are translated once; the rest are sent in
+    concurrent, provider-sized batches.
+    
+    Args:
+        texts: List of texts to translate
+        target_language: Target language code (default: 'es' for Spanish)
+        
+    Returns:
+        List of translated texts in input order (untranslated on failure)
+    """
+    return get_translation_engine().translate_many(texts, target_language)
 
 
-def format_results(results, translate_to=None):
+def format_results(results, translate_to=None, translated=None):
     """Format extraction results with optional translation.
     
     Args:
         results: List of (bbox, text, confidence) tuples
         translate_to: Target language code for translation (optional)
+        translated: Already translated text to use instead of translating (optional)
         
     Returns:
         Formatted string with results
     """
     if not results:
         return "No text detected with sufficient confidence in the image."
+    results = OcrResults.from_results(results)
     
+    # Translation is timed separately, so only the formatting itself is counted here
+    with timer("format"):
+        output_lines = format_extractions(results)
+    
+    # Add translation if requested
+    if translate_to:
+        if translated is None:
+            translated = translate_text(results.join(), translate_to)
+        output_lines.append(f"Translated ({translate_to}): {translated}")
+    
+    return '\n'.join(output_lines)
+
+
+def format_extractions(results):
+    """Return the output lines listing each extraction and the joined text."""
+    results = OcrResults.from_results(results)
     output_lines = []
     
     # Print individual extracted texts with confidence
     output_lines.append("Individual Extractions:")
     output_lines.append("-" * 50)
-    for i, (bbox, text, conf) in enumerate(results, 1):
+    # Read the text and confidence columns without building the bbox lists
+    for i, (text, conf) in enumerate(zip(results.texts, results.confidences.tolist()), 1):
         output_lines.append(f"{i}. Text: '{text}' - Confidence: {conf:.2%}")
     
     output_lines.append("")
@@ -87,47 +392,411 @@ def format_results(results, translate_to=None):
     output_lines.append("")
     
     # Extract all text and append together
-    extracted_texts = [text for (bbox, text, conf) in results]
-    appended_text = ' '.join(extracted_texts)
+    appended_text = results.join()
     
     output_lines.append(f"Extracted Text: {appended_text}")
+    return output_lines
+
+
+def print_usage():
+    """Print the command-line usage message."""
+    print("Usage: python main.py <image_path> [target_language]")
+    print("       python main.py --batch <dir|glob|image>... [--translate LANG] [--workers N]")
+    print("\nExamples:")
+    print("  python main.py image.png           # Extract text only")
+    print("  python main.py image.png es        # Extract and translate to Spanish")
+    print("  python main.py image.png fr        # Extract and translate to French")
+    print("  python main.py image.png hi        # Extract and translate to Hindi")
+    print("  python main.py --batch uploads/ --translate es --workers 4")
+    print("  python main.py --batch 'scans/*.jpg' --file-list more.txt")
+    print("  python main.py --batch uploads/ --format jsonl -o results.jsonl")
+    print("  python main.py --batch uploads/ --dry-run   # list images, load no models")
+    print("\nCommon language codes: es (Spanish), fr (French), de (German),")
+    print("  hi (Hindi), zh-CN (Chinese), ja (Japanese), ar (Arabic)")
+
+
+def script_spec(value):
+    """Validate a --scripts value for argparse."""
+    try:
+        parse_scripts(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+    return value
+
+
+def build_parser():
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Extract text from images and optionally translate it.",
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument("inputs", nargs="*",
+                        help="image path and optional target language, or batch inputs")
+    parser.add_argument("--batch", action="store_true",
+                        help="treat every input as an image, directory or glob")
+    parser.add_argument("--file-list", metavar="FILE",
+                        help="text file with one image path per line (implies --batch)")
+    parser.add_argument("-t", "--translate", metavar="LANG",
+                        help="target language code for translation")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for batch mode (default: CPU count)")
+    parser.add_argument("--torch-threads", type=int, default=None,
+                        help="torch threads per worker (default: CPUs / workers)")
+    parser.add_argument("--quantize", choices=QUANTIZE_MODES, default=None,
+                        help="dynamic int8 quantization of the recognizer, or of the "
+                             f"recognizer and detector (EasyOCR default: {DEFAULT_QUANTIZE})")
+    parser.add_argument("--interop-threads", type=int, default=None, metavar="N",
+                        help="torch threads running independent operators in parallel")
+    parser.add_argument("--no-inference-mode", action="store_true",
+                        help="run the models under torch.no_grad only, not inference_mode")
+    parser.add_argument("--translator", choices=sorted(BACKENDS), default="google",
+                        help="translation backend for batch mode ('local' works offline)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="overlap decoding, OCR and translation in one process")
+    parser.add_argument("--translate-window", type=int, default=32,
+                        help="images whose texts are translated together in batch mode")
+    parser.add_argument("--video", action="store_true",
+                        help="treat the input as a video, image directory or glob and "
+                             "emit timestamped subtitles, re-reading only changed regions")
+    parser.add_argument("--sample-fps", type=float, default=DEFAULT_SAMPLE_FPS,
+                        help=f"video frames analysed per second (default: {DEFAULT_SAMPLE_FPS})")
+    parser.add_argument("--subtitle-format", choices=SUBTITLE_FORMATS, default="srt",
+                        help="subtitle output format for --video (default: srt)")
+    parser.add_argument("--change-threshold", type=int, default=DEFAULT_DIFF_THRESHOLD,
+                        metavar="LEVELS",
+                        help="gray levels a frame area must change by to be re-read in "
+                             f"--video mode (default: {DEFAULT_DIFF_THRESHOLD})")
+    parser.add_argument("--min-confidence", type=float, default=0.5, metavar="C",
+                        help="minimum confidence of subtitle regions in --video mode "
+                             "(default: 0.5)")
+    parser.add_argument("--page-workers", type=int, default=DEFAULT_PAGE_WORKERS, metavar="N",
+                        help="pages of a PDF, multi-page TIFF or animated image recognized "
+                             f"in parallel (default: {DEFAULT_PAGE_WORKERS})")
+    parser.add_argument("--pdf-dpi", type=int, default=DEFAULT_PDF_DPI,
+                        help=f"resolution PDF pages are rendered at (default: {DEFAULT_PDF_DPI})")
+    parser.add_argument("--downscale", action="store_true",
+                        help="shrink large images to the smallest legible size before OCR")
+    parser.add_argument("--tile", type=int, nargs="?", const=DEFAULT_TILE_SIZE,
+                        metavar="SIZE",
+                        help="recognize large images as overlapping tiles of SIZE pixels "
+                             f"in parallel (default size: {DEFAULT_TILE_SIZE})")
+    parser.add_argument("--prefilter", nargs="?", const="detect", choices=PREFILTER_MODES,
+                        help="skip images without text using a cheap detection pass "
+                             "('detect', the default, or the model-free 'edges')")
+    parser.add_argument("--prefilter-sensitivity", type=float, default=DEFAULT_SENSITIVITY,
+                        metavar="S",
+                        help="prefilter sensitivity in [0, 1]; higher skips fewer images "
+                             f"(default: {DEFAULT_SENSITIVITY})")
+    parser.add_argument("--scripts", nargs="?", const="auto", type=script_spec, metavar="LIST",
+                        help="detect each region's script and recognize it with that "
+                             "script's reader: 'auto' (default) or a comma-separated "
+                             f"subset of {', '.join(SCRIPT_LANGUAGES)} "
+                             "(not with --tile or --downscale)")
+    parser.add_argument("--preprocess", metavar="STEPS",
+                        help="preprocessing chain, e.g. 'denoise,threshold:block_size=11'")
+    parser.add_argument("--correct", action="store_true",
+                        help="fix known OCR misreads using the correction dictionaries")
+    parser.add_argument("--format", choices=["text", "jsonl", "parquet"], default="text",
+                        help="output format; jsonl streams one JSON object per image, "
+                             "parquet writes one row per region to --output")
+    parser.add_argument("--output", "-o", default="-", metavar="PATH",
+                        help="destination for jsonl output (default: stdout)")
+    parser.add_argument("--per-region", action="store_true",
+                        help="emit one jsonl line per text region instead of per image")
+    parser.add_argument("--no-daemon", action="store_true",
+                        help="run in-process even if the warm-model daemon is running")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="list the images that would be processed without loading models")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="write stage timings and counters on exit "
+                             "(JSON for *.json, Prometheus text otherwise)")
+    parser.add_argument("--metrics-snapshots", metavar="PATH",
+                        help="append a JSON metrics snapshot to PATH periodically")
+    parser.add_argument("--metrics-interval", type=float, default=60.0,
+                        help="seconds between metrics snapshots (default: 60)")
+    return parser
+
+
+def extract_options(args):
+    """Collect the extract_text_from_image options selected on the command line."""
+    return {
+        "downscale": args.downscale,
+        "preprocess": args.preprocess,
+        "correct": args.correct,
+        "tile": args.tile,
+        "prefilter": args.prefilter,
+        "prefilter_sensitivity": args.prefilter_sensitivity,
+        "scripts": args.scripts,
+    }
+
+
+def inference_config(args):
+    """Build the InferenceConfig selected on the command line, or None for EasyOCR defaults."""
+    if args.quantize is None and args.interop_threads is None and not args.no_inference_mode:
+        return None
+    return InferenceConfig(quantize=args.quantize or DEFAULT_QUANTIZE,
+                           intra_op_threads=args.torch_threads,
+                           inter_op_threads=args.interop_threads,
+                           inference_mode=not args.no_inference_mode)
+
+
+def run_batch_mode(args, writer=None):
+    """Process many images in parallel and emit results in input order."""
+    image_paths = collect_images(args.inputs, file_list=args.file_list)
+    if not image_paths:
+        print("Error: No images found for the given inputs", file=sys.stderr)
+        sys.exit(1)
     
-    # Add translation if requested
-    if translate_to:
-        translated = translate_text(appended_text, translate_to)
-        output_lines.append(f"Translated ({translate_to}): {translated}")
+    if args.dry_run:
+        print_dry_run(image_paths, args.translate)
+        return
     
-    return '\n'.join(output_lines)
+    if writer is None:
+        print(f"Processing {len(image_paths)} images")
+        print("Extracting text with confidence >= 50%")
+        if args.translate:
+            print(f"Translating to: {args.translate}")
+        print("=" * 50)
+    
+    if args.translator != "google":
+        set_translation_engine(TranslationEngine(create_backend(args.translator)))
+    
+    inference = inference_config(args)
+    if args.pipeline:
+        if inference is not None:
+            configure_inference(inference)
+        run_pipeline_mode(image_paths, args, writer)
+        return
+    
+    batch = run_batch(image_paths, workers=args.workers,
+                      torch_threads=args.torch_threads, with_timings=True,
+                      inference=inference, **extract_options(args))
+    # Without translation there is nothing to batch, so each image is emitted as it finishes
+    window_size = args.translate_window if args.translate else 1
+    window = []
+    for item in batch:
+        window.append(item)
+        if len(window) >= window_size:
+            emit_batch_window(window, args.translate, writer)
+            window = []
+    emit_batch_window(window, args.translate, writer)
+
 
+def run_pipeline_mode(image_paths, args, writer=None):
+    """Run images through the staged pipeline, emitting each as it completes."""
+    pipeline = run_pipeline(image_paths, translate_to=args.translate,
+                            ocr_workers=args.workers or 2,
+                            extract_options=extract_options(args))
+    for item in pipeline:
+        emit_result(writer, item.image_path, item.results, args.translate,
+                    item.translation, item.timings, item.error)
 
-def main():
+
+def run_video_mode(source, translate_to, args):
+    """Stream subtitles for a video or image sequence to --output."""
+    if args.translator != "google":
+        set_translation_engine(TranslationEngine(create_backend(args.translator)))
+    # The same readers (and inference settings) single images would use
+    if args.scripts:
+        reader = ScriptReader(parse_scripts(args.scripts))
+    else:
+        reader = get_reader(['en'])
+    frames = iter_frames(source, sample_fps=args.sample_fps)
+    cues = subtitle_stream(frames, reader, translate_to,
+                           confidence_threshold=args.min_confidence,
+                           threshold=args.change_threshold)
+    try:
+        if args.output == "-":
+            count = write_subtitles(cues, sys.stdout, args.subtitle_format)
+        else:
+            with open(args.output, "w", encoding="utf-8") as stream:
+                count = write_subtitles(cues, stream, args.subtitle_format)
+    except ValueError as e:
+        # iter_frames raises when the video cannot be opened or decoded
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+    print(f"Wrote {count} subtitle cue(s)", file=sys.stderr)
+
+
+def run_pages_mode(source, translate_to, args, writer=None):
+    """Recognize a multi-page document lazily, emitting each page as it completes."""
+    pages = read_pages(source, workers=args.page_workers, dpi=args.pdf_dpi,
+                       **extract_options(args))
+    start = time.perf_counter()
+    try:
+        for number, results in pages:
+            timings = {"ocr": time.perf_counter() - start}
+            translated = None
+            if writer is not None and translate_to and results:
+                start = time.perf_counter()
+                translated = translate_text(join_text(results), translate_to)
+                timings["translate"] = time.perf_counter() - start
+            emit_result(writer, f"{source}#page={number}", results, translate_to,
+                        translated, timings)
+            start = time.perf_counter()
+    except ImportError as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+
+def print_dry_run(image_paths, translate_to=None):
+    """List the images a run would process, without loading any model."""
+    for image_path in image_paths:
+        print(image_path)
+    target = f", translating to {translate_to}" if translate_to else ""
+    print(f"Dry run: {len(image_paths)} image(s) would be processed{target}")
+
+
+def emit_batch_window(window, translate_to, writer=None):
+    """Emit a window of batch results, translating their texts together."""
+    translations = [None] * len(window)
+    if translate_to and window:
+        start = time.perf_counter()
+        translations = translate_texts(
+            [join_text(results) for _, results, _ in window], translate_to
+        )
+        # The window is translated at once; each image gets its share of the time
+        share = (time.perf_counter() - start) / len(window)
+        for _, _, timings in window:
+            timings["translate"] = share
+    for (image_path, results, timings), translated in zip(window, translations):
+        emit_result(writer, image_path, results, translate_to, translated, timings)
+
+
+def emit_result(writer, image_path, results, translate_to=None, translated=None,
+                timings=None, error=None):
+    """Print one image's results, or stream them as JSONL when a writer is given."""
+    if writer is not None:
+        writer.write(image_path, results, translate_to, translated, timings, error)
+        return
+    print(f"Image: {image_path}")
+    print("-" * 50)
+    if error:
+        print(f"Error processing image: {error}")
+    print(format_results(results, translate_to, translated))
+    print("=" * 50)
+
+
+def run_single_jsonl(image_path, translate_to, writer, use_daemon=False, **extract_options):
+    """Process one image and write it as a JSONL record."""
+    start = time.perf_counter()
+    translated = None
+    if use_daemon:
+        results, translated = extract_with_daemon(image_path, translate_to, **extract_options)
+    else:
+        results = extract_text_from_image(image_path, **extract_options)
+    timings = {"ocr": time.perf_counter() - start}
+    if translate_to and results and translated is None:
+        start = time.perf_counter()
+        translated = translate_text(join_text(results), translate_to)
+        timings["translate"] = time.perf_counter() - start
+    writer.write(image_path, results, translate_to, translated, timings)
+
+
+def main(argv=None):
     """Run the main application."""
-    if len(sys.argv) < 2:
-        print("Usage: python main.py <image_path> [target_language]")
-        print("\nExamples:")
-        print("  python main.py image.png           # Extract text only")
-        print("  python main.py image.png es        # Extract and translate to Spanish")
-        print("  python main.py image.png fr        # Extract and translate to French")
-        print("  python main.py image.png hi        # Extract and translate to Hindi")
-        print("\nCommon language codes: es (Spanish), fr (French), de (German),")
-        print("  hi (Hindi), zh-CN (Chinese), ja (Japanese), ar (Arabic)")
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print_usage()
         sys.exit(1)
     
-    image_path = sys.argv[1]
-    translate_to = sys.argv[2] if len(sys.argv) > 2 else None
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.scripts and (args.tile or args.downscale):
+        parser.error("--scripts cannot be combined with --tile or --downscale")
+    if args.video:
+        # Video frames are re-read region by region with the plain (or
+        # script-routing) reader
+        unsupported = [flag for flag, value in (
+            ("--preprocess", args.preprocess), ("--correct", args.correct),
+            ("--tile", args.tile),
+            ("--downscale", args.downscale), ("--prefilter", args.prefilter),
+        ) if value]
+        if unsupported:
+            parser.error(f"{', '.join(unsupported)} cannot be used with --video")
+    writer = None
+    if args.format == "jsonl":
+        writer = JsonlWriter(args.output, per_region=args.per_region)
+    elif args.format == "parquet":
+        if args.output == "-":
+            print("Error: --format parquet needs --output PATH", file=sys.stderr)
+            sys.exit(1)
+        try:
+            writer = ParquetWriter(args.output)
+        except ImportError as e:
+            print(f"Error: {str(e)}", file=sys.stderr)
+            sys.exit(1)
+    snapshots = None
+    if args.metrics_snapshots:
+        snapshots = SnapshotWriter(args.metrics_snapshots, args.metrics_interval).start()
+    try:
+        run_cli(args, writer)
+    finally:
+        if writer is not None:
+            writer.close()
+        if snapshots is not None:
+            snapshots.stop()
+        if args.metrics:
+            get_metrics().write(args.metrics)
+
+
+def run_cli(args, writer=None):
+    """Dispatch parsed arguments to single-image or batch processing."""
+    if args.batch or args.file_list:
+        run_batch_mode(args, writer)
+        return
     
-    if not Path(image_path).exists():
-        print(f"Error: Image file not found: {image_path}")
+    if not 1 <= len(args.inputs) <= 2:
+        print_usage()
         sys.exit(1)
     
+    image_path = args.inputs[0]
+    translate_to = args.inputs[1] if len(args.inputs) > 1 else args.translate
+    
+    # --video expands frame globs itself
+    is_pattern = args.video and any(char in image_path for char in "*?[")
+    if not is_pattern and not Path(image_path).exists():
+        print(f"Error: {'Video' if args.video else 'Image'} file not found: {image_path}")
+        sys.exit(1)
+    
+    if args.dry_run and not args.video:
+        print_dry_run([image_path], translate_to)
+        return
+    
+    # The daemon's readers were loaded with its own inference settings
+    use_daemon = not args.no_daemon
+    inference = inference_config(args)
+    if inference is not None:
+        configure_inference(inference)
+        use_daemon = False
+    
+    if args.video:
+        run_video_mode(image_path, translate_to, args)
+        return
+    
+    if is_multipage(image_path):
+        run_pages_mode(image_path, translate_to, args, writer)
+        return
+    
+    if writer is not None:
+        run_single_jsonl(image_path, translate_to, writer, use_daemon=use_daemon,
+                         **extract_options(args))
+        return
+    
     print(f"Processing image: {image_path}")
     print("Extracting text with confidence >= 50%")
     if translate_to:
         print(f"Translating to: {translate_to}")
     print("-" * 50)
     
-    results = extract_text_from_image(image_path)
-    formatted_output = format_results(results, translate_to)
+    # Forward to the warm-model daemon when one is running
+    if not use_daemon:
+        results, translated = extract_text_from_image(image_path, **extract_options(args)), None
+    else:
+        results, translated = extract_with_daemon(image_path, translate_to,
+                                                  **extract_options(args))
+    formatted_output = format_results(results, translate_to, translated)
     
     print("Extracted Text:")
     print("-" * 50)
@@ -0,0 +1,379 @@
+"""Per-stage timers and counters with Prometheus and JSON export.
+
+Every stage of the OCR/translation flow (model load, decode, preprocess,
+detection, recognition, correction, translation, formatting) records its
+duration in a latency histogram, and cache lookups and failures are counted.
+The process-wide registry can be rendered in the Prometheus text exposition
+format or written as periodic JSON snapshots, and profiler hooks (for example
+``torch.profiler.record_function``) can wrap every timed stage.
+
+Usage::
+
+    from metrics import timer, increment
+
+    with timer("recognition"):
+        results = reader.readtext(image)
+    increment("cache_requests_total", cache="ocr", result="hit")
+"""
+
+import json
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0, 30.0, 60.0)
+
+# Prefix applied to every exported metric name
+METRIC_PREFIX = "img2txt_"
+
+# Histogram holding every stage timing, labelled by stage
+STAGE_METRIC = "stage_seconds"
+
+# Help strings shown in the Prometheus export
+HELP = {
+    STAGE_METRIC: "Time spent in each processing stage",
+    "cache_requests_total": "Cache lookups by cache and result",
+    "failures_total": "Errors caught and recovered from, by stage",
+    "images_total": "Images processed",
+    "queue_depth": "Requests waiting for a micro-batch",
+    "batch_size": "Images per recognition micro-batch",
+    "queue_wait_seconds": "Time requests wait before their micro-batch starts",
+    "request_seconds": "End-to-end service request latency",
+}
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(label_key, extra=()):
+    pairs = list(label_key) + list(extra)
+    if not pairs:
+        return ""
+    body = ",".join(f'{key}="{_escape(value)}"' for key, value in pairs)
+    return "{" + body + "}"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """Cumulative latency histogram (count, sum, max and bucket counts)."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def cumulative(self):
+        """Return (upper bound, cumulative count) pairs, ending with +Inf."""
+        total, pairs = 0, []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            pairs.append((bound, total))
+        pairs.append((float("inf"), self.count))
+        return pairs
+
+    def merge(self, counts, count, total, maximum):
+        """Add the bucket counts, count, sum and max of another histogram."""
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, counts)]
+        self.count += count
+        self.sum += total
+        self.max = max(self.max, maximum)
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "max": self.max,
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters and latency histograms.
+
+    Args:
+        buckets: Histogram bucket upper bounds in seconds
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._hooks = []
+        self._lock = threading.Lock()
+        self.created_at = time.time()
+
+    def increment(self, name, amount=1, **labels):
+        """Add ``amount`` to a counter."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set_gauge(self, name, value, **labels):
+        """Set a gauge to its current value (e.g. a queue depth)."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name, value, **labels):
+        """Record one value in a histogram."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def add_hook(self, hook):
+        """Register a profiler hook.
+
+        Args:
+            hook: Callable ``hook(stage)`` returning a context manager that is
+                entered around every timed stage
+        """
+        with self._lock:
+            self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        with self._lock:
+            if hook in self._hooks:
+                self._hooks.remove(hook)
+
+    @contextmanager
+    def timer(self, stage, **labels):
+        """Time a block and record it under ``stage_seconds{stage=...}``.
+
+        The duration is recorded even if the block raises.
+        """
+        with self._lock:
+            hooks = list(self._hooks)
+        with ExitStack() as stack:
+            for hook in hooks:
+                stack.enter_context(hook(stage))
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.observe(STAGE_METRIC, time.perf_counter() - start,
+                             stage=stage, **labels)
+
+    def record_failure(self, stage, error=None):
+        """Count a caught error for a stage, labelled with its exception type."""
+        kind = type(error).__name__ if error is not None else "unknown"
+        self.increment("failures_total", stage=stage, error=kind)
+
+    def counter_value(self, name, **labels):
+        """Return the current value of a counter (0 if never incremented)."""
+        with self._lock:
+            return self._counters.get((name, _label_key(labels)), 0)
+
+    def gauge_value(self, name, **labels):
+        """Return the current value of a gauge (None if never set)."""
+        with self._lock:
+            return self._gauges.get((name, _label_key(labels)))
+
+    def histogram(self, name, **labels):
+        """Return a copy of a histogram's summary, or None if nothing was recorded."""
+        with self._lock:
+            histogram = self._histograms.get((name, _label_key(labels)))
+            return histogram.to_dict() if histogram else None
+
+    def snapshot(self):
+        """Return every metric as a JSON-serializable dict."""
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            gauges = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._gauges.items())
+            ]
+            histograms = [
+                dict({"name": name, "labels": dict(labels)}, **histogram.to_dict())
+                for (name, labels), histogram in sorted(self._histograms.items())
+            ]
+        return {
+            "timestamp": time.time(),
+            "uptime_seconds": time.time() - self.created_at,
+            "counters": counters,
+            "gauges": gauges,
+            "histograms": histograms,
+        }
+
+    def to_prometheus(self):
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            histograms = sorted(
+                (key, histogram.cumulative(), histogram.sum, histogram.count)
+                for key, histogram in self._histograms.items()
+            )
+
+        declared = set()
+        for kind, values in (("counter", counters), ("gauge", gauges)):
+            for (name, labels), value in values:
+                full_name = METRIC_PREFIX + name
+                if name not in declared:
+                    declared.add(name)
+                    lines.append(f"# HELP {full_name} {HELP.get(name, name)}")
+                    lines.append(f"# TYPE {full_name} {kind}")
+                lines.append(f"{full_name}{_format_labels(labels)} {value}")
+
+        for (name, labels), buckets, total, count in histograms:
+            full_name = METRIC_PREFIX + name
+            if name not in declared:
+                declared.add(name)
+                lines.append(f"# HELP {full_name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {full_name} histogram")
+            for bound, cumulative in buckets:
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f"{full_name}_bucket{_format_labels(labels, [('le', le)])} {cumulative}"
+                )
+            lines.append(f"{full_name}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{full_name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write the metrics to ``path``: JSON for ``.json`` files, else Prometheus."""
+        path = Path(path)
+        if path.suffix == ".json":
+            content = json.dumps(self.snapshot(), indent=2) + "\n"
+        else:
+            content = self.to_prometheus()
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(content, encoding="utf-8")
+        tmp_path.replace(path)
+
+    def drain(self):
+        """Return the counters and histograms recorded so far and clear them.
+
+        The result is picklable, so worker processes can send what they
+        recorded since the last call to the parent, which adds it with
+        ``merge``.  Gauges describe the current process and are not included.
+        """
+        with self._lock:
+            delta = {
+                "counters": dict(self._counters),
+                "histograms": {
+                    key: (list(histogram.counts), histogram.count, histogram.sum, histogram.max)
+                    for key, histogram in self._histograms.items()
+                },
+            }
+            self._counters.clear()
+            self._histograms.clear()
+        return delta
+
+    def merge(self, delta):
+        """Add counters and histograms drained from another registry."""
+        with self._lock:
+            for key, value in delta["counters"].items():
+                self._counters[key] = self._counters.get(key, 0) + value
+            for key, values in delta["histograms"].items():
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(self.buckets)
+                histogram.merge(*values)
+
+    def reset(self):
+        """Drop every recorded metric (hooks are kept)."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+            self.created_at = time.time()
+
+
+class SnapshotWriter:
+    """Background thread appending a JSON snapshot line every ``interval`` seconds.
+
+    Args:
+        path: JSON Lines file to append snapshots to
+        interval: Seconds between snapshots
+        registry: MetricsRegistry to snapshot (default: process-wide registry)
+    """
+
+    def __init__(self, path, interval=60.0, registry=None):
+        self.path = Path(path)
+        self.interval = interval
+        self.registry = registry or get_metrics()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-snapshots",
+                                        daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write_snapshot()
+
+    def write_snapshot(self):
+        """Append one snapshot line now."""
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(self.registry.snapshot()) + "\n")
+
+    def stop(self):
+        """Stop the thread and write a final snapshot."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.write_snapshot()
+
+
+def torch_profiler_hook(stage):
+    """Profiler hook labelling each stage as a ``torch.profiler`` range."""
+    from torch.profiler import record_function
+
+    return record_function(f"img2txt.{stage}")
+
+
+_metrics = MetricsRegistry()
+
+
+def get_metrics():
+    """Return the process-wide metrics registry."""
+    return _metrics
+
+
+def set_metrics(registry):
+    """Replace the process-wide metrics registry (None installs an empty one)."""
+    global _metrics
+    _metrics = registry if registry is not None else MetricsRegistry()
+
+
+def timer(stage, **labels):
+    """Time a block in the process-wide registry."""
+    return _metrics.timer(stage, **labels)
+
+
+def increment(name, amount=1, **labels):
+    """Increment a counter in the process-wide registry."""
+    _metrics.increment(name, amount, **labels)
+
+
+def record_failure(stage, error=None):
+    """Count a caught error in the process-wide registry."""
+    _metrics.record_failure(stage, error)
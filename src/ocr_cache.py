@@ -0,0 +1,220 @@
+"""Content-addressed cache of OCR results.
+
+Identical images are submitted again and again, through both the Streamlit
+upload and the CLI.  Results are cached under a hash of the image bytes plus
+the languages, confidence threshold and preprocessing settings, so a repeated
+image costs one hash and one lookup instead of a neural network pass.  Entries
+are stored zlib-compressed in SQLite and evicted least recently used first
+once the store exceeds its size limit.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from metrics import increment
+from reader_pool import normalize_languages
+from translation_cache import default_cache_dir
+
+# Default size limit for the on-disk store, in bytes (256 MB)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def hash_image(image):
+    """Hash raw image content.
+
+    Args:
+        image: Encoded image bytes, a path to an image file, or a numpy array
+
+    Returns:
+        Hex digest of the image content
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        digest.update(image)
+    elif hasattr(image, "shape") and hasattr(image, "dtype"):
+        digest.update(f"{image.shape}{image.dtype}".encode("ascii"))
+        digest.update(memoryview(image if image.flags.c_contiguous else image.copy()))
+    else:
+        with open(image, "rb") as handle:
+            for block in iter(lambda: handle.read(1024 * 1024), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def make_key(image_hash, languages, confidence_threshold, params=None):
+    """Combine an image hash with the settings that affect OCR output."""
+    settings = json.dumps(
+        [list(normalize_languages(languages)), confidence_threshold, params or {}],
+        sort_keys=True, default=str,
+    )
+    return f"{image_hash}:{hashlib.blake2b(settings.encode('utf-8'), digest_size=8).hexdigest()}"
+
+
+def image_cache_key(image, languages, confidence_threshold, params=None):
+    """Build the cache key for an image, or None if it cannot be read."""
+    try:
+        return make_key(hash_image(image), languages, confidence_threshold, params)
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+def encode_results(results):
+    """Serialize (bbox, text, confidence) tuples into a compact blob."""
+    rows = [
+        [[[float(x), float(y)] for x, y in bbox], text, float(conf)]
+        for (bbox, text, conf) in results
+    ]
+    return zlib.compress(json.dumps(rows, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_results(blob):
+    """Deserialize a blob produced by ``encode_results``."""
+    rows = json.loads(zlib.decompress(blob).decode("utf-8"))
+    return [
+        ([[int(x) if x.is_integer() else x, int(y) if y.is_integer() else y]
+          for x, y in bbox], text, conf)
+        for bbox, text, conf in rows
+    ]
+
+
+class OcrCache:
+    """SQLite-backed OCR result store with size-based LRU eviction.
+
+    Args:
+        db_path: Path of the SQLite database, or None for an in-memory store
+        max_bytes: Maximum total size of stored results
+    """
+
+    def __init__(self, db_path=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if db_path is not None:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            ":memory:" if db_path is None else str(db_path),
+            timeout=30, check_same_thread=False,
+        )
+        if db_path is not None:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_results ("
+            " key TEXT PRIMARY KEY,"
+            " data BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ocr_results_accessed ON ocr_results (accessed_at)"
+        )
+        self._conn.commit()
+        self._total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM ocr_results"
+        ).fetchone()[0]
+
+    def get(self, key):
+        """Look up cached results.
+
+        Returns:
+            List of (bbox, text, confidence) tuples, or None on a miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM ocr_results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                increment("cache_requests_total", cache="ocr", result="miss")
+                return None
+            self._conn.execute(
+                "UPDATE ocr_results SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            self.hits += 1
+        increment("cache_requests_total", cache="ocr", result="hit")
+        return decode_results(row[0])
+
+    def set(self, key, results):
+        """Store results, evicting the least recently used entries if needed."""
+        blob = encode_results(results)
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT size FROM ocr_results WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ocr_results VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time()),
+            )
+            self._total += len(blob) - (previous[0] if previous else 0)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        while self._total > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM ocr_results ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self._total = 0
+                return
+            for key, size in rows:
+                self._conn.execute("DELETE FROM ocr_results WHERE key = ?", (key,))
+                self._total -= size
+                self.evictions += 1
+                if self._total <= self.max_bytes:
+                    return
+
+    def stats(self):
+        """Return hit/miss counters and store size."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM ocr_results").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": entries,
+                "bytes": self._total,
+            }
+
+    def clear(self):
+        """Remove every cached result and reset counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM ocr_results")
+            self._conn.commit()
+            self._total = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def close(self):
+        """Close the underlying database."""
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+
+
+def get_ocr_cache():
+    """Return the process-wide OCR cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        try:
+            _cache = OcrCache(default_cache_dir() / "ocr_results.sqlite3")
+        except (OSError, sqlite3.Error) as e:
+            print(f"OCR cache unavailable on disk, using memory only: {str(e)}")
+            _cache = OcrCache()
+    return _cache
+
+
+def set_ocr_cache(cache):
+    """Replace the process-wide OCR cache (e.g. in-memory in tests)."""
+    global _cache
+    _cache = cache
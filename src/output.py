@@ -0,0 +1,208 @@
+"""Streaming JSON Lines output for OCR results.
+
+``format_results`` builds one human-readable string per image and drops the
+bounding boxes.  For batch jobs the writer in this module emits one JSON
+object per image (or per region) as soon as it is done, including bboxes,
+confidences, text, translation and per-stage timings, through a buffered
+stream so results never pile up in memory.  ``ParquetWriter`` writes the
+same regions as columnar Parquet row groups for jobs too large for JSON.
+"""
+
+import json
+import sys
+import time
+
+# Write buffer size for JSONL output files
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+# Maximum seconds a finished record may sit in the buffer before a flush
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# Regions buffered before a Parquet row group is written
+DEFAULT_ROW_GROUP_SIZE = 64 * 1024
+
+
+def _bbox_to_list(bbox):
+    """Convert a bbox of numpy or Python numbers into a list of [x, y] points."""
+    return [[float(x), float(y)] for x, y in bbox]
+
+
+def region_to_record(bbox, text, conf):
+    """Convert a (bbox, text, confidence) tuple into a JSON-ready dict."""
+    return {"bbox": _bbox_to_list(bbox), "text": text, "confidence": float(conf)}
+
+
+def image_to_record(image_path, results, translate_to=None, translation=None,
+                    timings=None, error=None):
+    """Build the JSONL record for one image.
+
+    Args:
+        image_path: Path of the processed image
+        results: List of (bbox, text, confidence) tuples
+        translate_to: Target language code (optional)
+        translation: Translated text (optional)
+        timings: Dict of stage name to seconds (optional)
+        error: Error message if processing failed (optional)
+
+    Returns:
+        Dict ready for ``json.dumps``
+    """
+    record = {
+        "image": str(image_path),
+        "regions": [region_to_record(*result) for result in results],
+        "text": " ".join(text for (bbox, text, conf) in results),
+    }
+    if translate_to:
+        record["target_language"] = translate_to
+        record["translation"] = translation
+    record["timings"] = {stage: round(seconds, 6) for stage, seconds in (timings or {}).items()}
+    if error:
+        record["error"] = error
+    return record
+
+
+class JsonlWriter:
+    """Buffered JSON Lines writer for image or region records.
+
+    Args:
+        destination: File path, '-' for stdout, or a writable text stream
+        per_region: Emit one line per region instead of one per image
+        buffer_size: Size of the write buffer in bytes
+        flush_interval: Flush at least this often (seconds) while writing
+    """
+
+    def __init__(self, destination="-", per_region=False, buffer_size=DEFAULT_BUFFER_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL):
+        self.per_region = per_region
+        self.flush_interval = flush_interval
+        self._owns_stream = False
+        if destination == "-":
+            self._stream = sys.stdout
+        elif isinstance(destination, str) or hasattr(destination, "__fspath__"):
+            self._stream = open(destination, "w", encoding="utf-8", buffering=buffer_size)
+            self._owns_stream = True
+        else:
+            self._stream = destination
+        self._last_flush = time.monotonic()
+        self.records = 0
+
+    def _write_line(self, record):
+        self._stream.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        self._stream.write("\n")
+        self.records += 1
+
+    def write(self, image_path, results, translate_to=None, translation=None,
+              timings=None, error=None):
+        """Write the record(s) for one finished image."""
+        record = image_to_record(image_path, results, translate_to, translation,
+                                 timings, error)
+        regions = record.pop("regions")
+        if self.per_region and regions:
+            del record["text"]
+            image = record.pop("image")
+            for index, region in enumerate(regions):
+                self._write_line({"image": image, "region": index, **region, **record})
+        else:
+            self._write_line({"image": record.pop("image"), "regions": regions, **record})
+
+        now = time.monotonic()
+        if now - self._last_flush >= self.flush_interval:
+            self.flush()
+            self._last_flush = now
+
+    def flush(self):
+        """Flush buffered records to the destination."""
+        self._stream.flush()
+
+    def close(self):
+        """Flush and close the destination if this writer opened it."""
+        self.flush()
+        if self._owns_stream:
+            self._stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ParquetWriter:
+    """Columnar Parquet writer with one row per region.
+
+    Regions are collected as ``OcrResults`` and written as a row group once
+    ``row_group_size`` of them are buffered.  Columns: ``image``, ``region``,
+    ``bbox``, ``text``, ``confidence`` and ``translation`` (the image's
+    translated text, dictionary-encoded).  Images without regions add no rows.
+
+    Args:
+        destination: File path of the Parquet file
+        row_group_size: Regions per row group
+    """
+
+    def __init__(self, destination, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+        if destination == "-":
+            raise ValueError("Parquet output needs a file path (--output)")
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)") from None
+        self.destination = destination
+        self.row_group_size = row_group_size
+        self._pending = []
+        self._pending_rows = 0
+        self._writer = None
+        self.records = 0
+
+    def write(self, image_path, results, translate_to=None, translation=None,
+              timings=None, error=None):
+        """Buffer the regions of one finished image."""
+        from results import OcrResults
+
+        columns = OcrResults.from_results(results)
+        if not len(columns):
+            return
+        self._pending.append((str(image_path), columns, translation))
+        self._pending_rows += len(columns)
+        if self._pending_rows >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered regions as one row group."""
+        if not self._pending:
+            return
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        from results import OcrResults
+
+        counts = [len(columns) for _, columns, _ in self._pending]
+        images = np.repeat(np.arange(len(counts), dtype=np.int32), counts)
+        table = OcrResults.concatenate(columns for _, columns, _ in self._pending).to_arrow()
+        table = table.add_column(0, "image", pa.DictionaryArray.from_arrays(
+            images, pa.array([image for image, _, _ in self._pending])))
+        table = table.add_column(1, "region", pa.array(
+            np.concatenate([np.arange(count, dtype=np.int32) for count in counts])))
+        table = table.append_column("translation", pa.DictionaryArray.from_arrays(
+            images, pa.array([translation for _, _, translation in self._pending],
+                             type=pa.string())))
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.destination, table.schema)
+        self._writer.write_table(table)
+        self.records += len(table)
+        self._pending = []
+        self._pending_rows = 0
+
+    def close(self):
+        """Write the remaining regions and finish the file."""
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,212 @@
+"""Lazy multi-page input: PDFs, multi-page TIFFs and animated images.
+
+Scanned documents used to be split into single images before OCR.  The
+helpers in this module open a document once and decode its pages one at a
+time through a generator, so only the pages being recognized are held in
+memory no matter how long the document is.  Large files are memory-mapped
+instead of read whole, and ``read_pages`` can recognize a few pages in
+parallel while still yielding their results in page order as they finish.
+
+PDF pages are rendered with ``pypdfium2`` (``pip install pypdfium2``), which
+is only imported when a PDF is opened.
+"""
+
+import io
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from metrics import increment, timer
+
+# File extensions that may hold more than one page
+PAGED_EXTENSIONS = {".gif", ".pdf", ".tif", ".tiff", ".webp"}
+
+# Resolution PDF pages are rendered at (PDF user space is 72 dpi)
+DEFAULT_PDF_DPI = 200
+
+# Files at least this large are memory-mapped instead of opened for reading
+MMAP_MIN_BYTES = 8 * 1024 * 1024
+
+# Pages recognized at the same time by read_pages
+DEFAULT_PAGE_WORKERS = 1
+
+# Signature at the start of every PDF file
+PDF_MAGIC = b"%PDF-"
+
+
+@contextmanager
+def open_source(source):
+    """Open a path or encoded bytes as a seekable binary file.
+
+    Files of ``MMAP_MIN_BYTES`` or more are memory-mapped, so pages are
+    paged in by the OS as the decoder touches them.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(source)
+        return
+    with open(source, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size < MMAP_MIN_BYTES:
+            yield handle
+            return
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+def _is_pdf(stream):
+    stream.seek(0)
+    is_pdf = stream.read(len(PDF_MAGIC)) == PDF_MAGIC
+    stream.seek(0)
+    return is_pdf
+
+
+def _open_pdf(stream):
+    try:
+        import pypdfium2
+    except ImportError:
+        raise ImportError("Reading PDFs requires pypdfium2 (pip install pypdfium2)") from None
+    return pypdfium2.PdfDocument(stream)
+
+
+def is_multipage(source):
+    """Return True if a path or encoded upload should be read page by page.
+
+    PDFs always are (OpenCV cannot decode them); images are when they hold
+    more than one frame.  Unreadable sources return False.
+    """
+    if not isinstance(source, (bytes, bytearray, memoryview)) and \
+            Path(source).suffix.lower() not in PAGED_EXTENSIONS:
+        return False
+    try:
+        with open_source(source) as stream:
+            if _is_pdf(stream):
+                return True
+        return count_pages(source) > 1
+    except Exception:
+        return False
+
+
+def count_pages(source):
+    """Return the number of pages (or frames) in a document without decoding them."""
+    with open_source(source) as stream:
+        if _is_pdf(stream):
+            document = _open_pdf(stream)
+            try:
+                return len(document)
+            finally:
+                document.close()
+        from PIL import Image
+
+        with Image.open(stream) as image:
+            return getattr(image, "n_frames", 1)
+
+
+def _render_pdf_page(document, index, dpi):
+    import numpy as np
+
+    page = document[index]
+    try:
+        bitmap = page.render(scale=dpi / 72.0)
+        # pdfium renders BGR(A), the channel order OpenCV uses; copy out of
+        # its buffer before the bitmap is released
+        array = np.array(bitmap.to_numpy()[..., :3])
+        bitmap.close()
+        return array
+    finally:
+        page.close()
+
+
+def _frame_to_array(image):
+    import cv2
+    import numpy as np
+
+    return cv2.cvtColor(np.asarray(image.convert("RGB")), cv2.COLOR_RGB2BGR)
+
+
+def iter_pages(source, pages=None, dpi=DEFAULT_PDF_DPI):
+    """Decode the pages of a document lazily, one at a time.
+
+    Args:
+        source: Path or encoded bytes of a PDF, TIFF, GIF, WebP or single image
+        pages: Iterable of 1-based page numbers to decode (default: all)
+        dpi: Rendering resolution for PDF pages
+
+    Yields:
+        Tuples of (page_number, BGR image array); each page is decoded only
+        when the consumer asks for it
+    """
+    with open_source(source) as stream:
+        if _is_pdf(stream):
+            document = _open_pdf(stream)
+            try:
+                numbers = range(1, len(document) + 1) if pages is None else pages
+                for number in numbers:
+                    with timer("decode"):
+                        page = _render_pdf_page(document, number - 1, dpi)
+                    increment("pages_total")
+                    yield number, page
+            finally:
+                document.close()
+            return
+
+        from PIL import Image
+
+        with Image.open(stream) as image:
+            count = getattr(image, "n_frames", 1)
+            numbers = range(1, count + 1) if pages is None else pages
+            for number in numbers:
+                with timer("decode"):
+                    image.seek(number - 1)
+                    page = _frame_to_array(image)
+                increment("pages_total")
+                yield number, page
+
+
+def load_page(source, number, dpi=DEFAULT_PDF_DPI):
+    """Decode a single 1-based page of a document."""
+    for _, page in iter_pages(source, pages=[number], dpi=dpi):
+        return page
+    raise IndexError(f"Page {number} not found")
+
+
+def read_pages(source, workers=DEFAULT_PAGE_WORKERS, pages=None, dpi=DEFAULT_PDF_DPI,
+               **extract_options):
+    """Recognize the pages of a document, streaming results in page order.
+
+    Pages are decoded on the calling thread only when a worker is free, so at
+    most ``workers + 1`` decoded pages are alive at any time.
+
+    Args:
+        source: Path or encoded bytes of the document
+        workers: Pages recognized at the same time (default: 1, sequential)
+        pages: Iterable of 1-based page numbers to read (default: all)
+        dpi: Rendering resolution for PDF pages
+        **extract_options: Extra keyword arguments for ``extract_text_from_image``
+
+    Yields:
+        Tuples of (page_number, results) where results are (bbox, text, confidence)
+    """
+    from main import extract_text_from_image
+
+    page_iter = iter_pages(source, pages=pages, dpi=dpi)
+    if workers <= 1:
+        for number, page in page_iter:
+            yield number, extract_text_from_image(page, **extract_options)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for number, page in page_iter:
+            pending.append((number, executor.submit(extract_text_from_image, page,
+                                                    **extract_options)))
+            if len(pending) >= workers:
+                number, future = pending.popleft()
+                yield number, future.result()
+        while pending:
+            number, future = pending.popleft()
+            yield number, future.result()
@@ -0,0 +1,226 @@
+"""Pipelined OCR and translation over many images.
+
+The plain flow (extract -> format -> translate) leaves the CPU idle while a
+translation is in flight and the network idle during OCR.  The runner in this
+module splits the work into stages connected by bounded queues:
+
+    decode/preprocess (thread) -> OCR (worker pool) -> translation (asyncio)
+
+so image N+1 is being recognized while image N is being translated.  The
+queue sizes provide backpressure, keeping at most a handful of decoded images
+in memory at any time.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from metrics import record_failure, timer
+
+# Marker passed down the queues when a stage has no more work
+_DONE = object()
+
+
+@dataclass
+class ImageResult:
+    """Outcome of running one image through the pipeline."""
+
+    index: int
+    image_path: str
+    results: list = field(default_factory=list)
+    text: str = ""
+    translation: str = None
+    timings: dict = field(default_factory=dict)
+    error: str = None
+
+
+def decode_image(image_path):
+    """Decode an image file into a BGR array.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file cannot be decoded as an image
+    """
+    import cv2
+    import numpy as np
+
+    with open(image_path, "rb") as handle:
+        data = np.frombuffer(handle.read(), dtype=np.uint8)
+    image = cv2.imdecode(data, cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError(f"Cannot decode image: {image_path}")
+    return image
+
+
+class Pipeline:
+    """Staged OCR -> translation runner with bounded queues.
+
+    Args:
+        languages: List of language codes to recognize (default: ['en'])
+        confidence_threshold: Minimum confidence score to include text
+        translate_to: Target language code for translation (optional)
+        ocr_workers: Number of OCR worker threads
+        max_translations: Maximum translations in flight at the same time
+        queue_size: Capacity of each inter-stage queue
+        decode: Callable ``decode(image_path)`` returning the OCR input
+        preprocess: Optional callable applied to the decoded image
+        extract_options: Extra keyword arguments for ``extract_text_from_image``
+    """
+
+    def __init__(self, languages=('en',), confidence_threshold=0.5, translate_to=None,
+                 ocr_workers=2, max_translations=8, queue_size=4, decode=decode_image,
+                 preprocess=None, extract_options=None):
+        self.languages = list(languages)
+        self.confidence_threshold = confidence_threshold
+        self.translate_to = translate_to
+        self.ocr_workers = max(1, ocr_workers)
+        self.max_translations = max(1, max_translations)
+        self.queue_size = max(1, queue_size)
+        self.decode = decode
+        self.preprocess = preprocess
+        self.extract_options = dict(extract_options or {})
+
+    def _decode_stage(self, image_paths, decoded):
+        for index, image_path in enumerate(image_paths):
+            item = ImageResult(index, str(image_path))
+            start = time.perf_counter()
+            try:
+                with timer("decode"):
+                    image = self.decode(image_path)
+                if self.preprocess is not None:
+                    with timer("preprocess"):
+                        image = self.preprocess(image)
+            except Exception as e:
+                record_failure("decode", e)
+                image = None
+                item.error = str(e)
+            item.timings["decode"] = time.perf_counter() - start
+            decoded.put((item, image))
+        for _ in range(self.ocr_workers):
+            decoded.put(_DONE)
+
+    def _ocr_stage(self, decoded, recognized):
+        from main import extract_text_from_image, join_text
+
+        while True:
+            entry = decoded.get()
+            if entry is _DONE:
+                recognized.put(_DONE)
+                return
+            item, image = entry
+            if item.error is None:
+                start = time.perf_counter()
+                item.results = extract_text_from_image(
+                    image, self.languages, self.confidence_threshold,
+                    **self.extract_options
+                )
+                item.text = join_text(item.results)
+                item.timings["ocr"] = time.perf_counter() - start
+            del image
+            recognized.put(item)
+
+    async def _translate_one(self, loop, executor, semaphore, engine, item, finished):
+        # The caller acquired the slot before taking the item off the queue
+        try:
+            if self.translate_to and item.text.strip():
+                start = time.perf_counter()
+                try:
+                    translations = await loop.run_in_executor(
+                        executor, engine.translate_many, [item.text], self.translate_to
+                    )
+                    item.translation = translations[0]
+                except Exception as e:
+                    item.translation = item.text
+                    item.error = str(e)
+                item.timings["translate"] = time.perf_counter() - start
+            await loop.run_in_executor(executor, finished.put, item)
+        finally:
+            semaphore.release()
+
+    async def _translate_stage(self, recognized, finished):
+        from translation_engine import get_translation_engine
+
+        loop = asyncio.get_running_loop()
+        engine = get_translation_engine() if self.translate_to else None
+        semaphore = asyncio.Semaphore(self.max_translations)
+        # Blocking queue operations run here so the event loop stays responsive
+        executor = ThreadPoolExecutor(max_workers=self.max_translations + 1)
+        tasks = set()
+        remaining = self.ocr_workers
+        try:
+            while remaining:
+                # Take an item only when a translation slot is free, so a slow
+                # translator fills the recognized queue and blocks OCR
+                await semaphore.acquire()
+                item = await loop.run_in_executor(executor, recognized.get)
+                if item is _DONE:
+                    semaphore.release()
+                    remaining -= 1
+                    continue
+                task = loop.create_task(
+                    self._translate_one(loop, executor, semaphore, engine, item, finished)
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            executor.shutdown(wait=True)
+        finished.put(_DONE)
+
+    def run(self, image_paths, ordered=True):
+        """Run every image through the pipeline.
+
+        Args:
+            image_paths: Iterable of image paths
+            ordered: Yield results in input order (otherwise as they finish)
+
+        Yields:
+            ImageResult for each image
+        """
+        decoded = queue.Queue(self.queue_size)
+        recognized = queue.Queue(self.queue_size)
+        finished = queue.Queue(self.queue_size)
+
+        threads = [threading.Thread(target=self._decode_stage,
+                                    args=(list(image_paths), decoded), daemon=True)]
+        threads += [
+            threading.Thread(target=self._ocr_stage, args=(decoded, recognized), daemon=True)
+            for _ in range(self.ocr_workers)
+        ]
+        threads.append(threading.Thread(
+            target=lambda: asyncio.run(self._translate_stage(recognized, finished)),
+            daemon=True,
+        ))
+        for thread in threads:
+            thread.start()
+
+        pending = {}
+        next_index = 0
+        while True:
+            item = finished.get()
+            if item is _DONE:
+                break
+            if not ordered:
+                yield item
+                continue
+            pending[item.index] = item
+            while next_index in pending:
+                yield pending.pop(next_index)
+                next_index += 1
+
+        for thread in threads:
+            thread.join()
+
+
+def run_pipeline(image_paths, **options):
+    """Run images through a Pipeline built from keyword options.
+
+    Yields:
+        ImageResult for each image, in input order
+    """
+    ordered = options.pop("ordered", True)
+    yield from Pipeline(**options).run(image_paths, ordered=ordered)
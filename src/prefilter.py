@@ -0,0 +1,201 @@
+"""Cheap text-presence prefilter run before full recognition.
+
+Many images carry no text at all, yet ``readtext`` runs full-resolution
+detection and recognition on every one.  The prefilter looks at a downscaled
+copy first, either with EasyOCR's detection network (``detect`` mode) or with
+a classical morphological edge heuristic (``edges`` mode).  Images without text regions
+are skipped outright; in ``detect`` mode the regions found on the thumbnail
+are scaled back up and only those are passed to the recognizer.
+"""
+
+import os
+import threading
+
+from metrics import increment, timer
+from resolution import resize
+
+# Available prefilter modes
+MODES = ("detect", "edges")
+
+# Default sensitivity in [0, 1]; higher finds fainter text but skips less
+DEFAULT_SENSITIVITY = 0.5
+
+# Longest side of the thumbnail the prefilter looks at
+DEFAULT_THUMBNAIL_SIDE = 960
+
+# Smallest morphological gradient treated as a text edge at full sensitivity
+EDGE_MIN_CONTRAST = 40
+
+# Extra gradient required as the sensitivity drops to zero
+EDGE_CONTRAST_RANGE = 60
+
+# Margin (share of the box height) added around regions found on the thumbnail
+REGION_MARGIN = 0.15
+
+
+def _detection_thresholds(sensitivity):
+    """Map sensitivity to EasyOCR's (text_threshold, low_text) detection thresholds."""
+    sensitivity = min(1.0, max(0.0, float(sensitivity)))
+    return 0.9 - 0.4 * sensitivity, 0.5 - 0.2 * sensitivity
+
+
+def _thumbnail(image, side):
+    scale = min(1.0, side / max(image.shape[:2]))
+    return (resize(image, scale) if scale < 1.0 else image), scale
+
+
+def count_text_candidates(image, sensitivity=DEFAULT_SENSITIVITY,
+                          thumbnail_side=DEFAULT_THUMBNAIL_SIDE):
+    """Count text-like regions on a thumbnail with a morphological edge heuristic.
+
+    Strong local contrast is found with a morphological gradient; characters on
+    a line are joined with a horizontal closing, and the resulting blobs are
+    kept when their size, aspect ratio and fill look like a word.
+
+    Args:
+        image: Decoded image array (color or grayscale)
+        sensitivity: Value in [0, 1]; higher accepts fainter, smaller text
+        thumbnail_side: Longest side of the analysed thumbnail
+
+    Returns:
+        Number of candidate text regions (0 means no text)
+    """
+    import cv2
+
+    sensitivity = min(1.0, max(0.0, float(sensitivity)))
+    grey = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    grey, _ = _thumbnail(grey, thumbnail_side)
+    gradient = cv2.morphologyEx(grey, cv2.MORPH_GRADIENT,
+                                cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+    min_contrast = EDGE_MIN_CONTRAST + EDGE_CONTRAST_RANGE * (1.0 - sensitivity)
+    _, mask = cv2.threshold(gradient, min_contrast, 255, cv2.THRESH_BINARY)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE,
+                            cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1)))
+    count, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    min_height = max(4, int(round(12 * (1.0 - sensitivity))))
+    found = 0
+    for x, y, w, h, area in stats[1:]:
+        # Words are wider than tall, not taller than half the image, and
+        # partly (not fully) covered by edges
+        if (min_height <= h <= grey.shape[0] * 0.5 and w >= h * 0.5
+                and 0.2 <= area / float(w * h) <= 0.95):
+            found += 1
+    return found
+
+
+def detect_regions(reader, image, sensitivity=DEFAULT_SENSITIVITY,
+                   thumbnail_side=DEFAULT_THUMBNAIL_SIDE):
+    """Find text regions with a detection-only pass on a thumbnail.
+
+    Returns:
+        Tuple of (horizontal_list, free_list) in full-resolution coordinates,
+        in the formats ``reader.recognize`` expects
+    """
+    text_threshold, low_text = _detection_thresholds(sensitivity)
+    thumbnail, scale = _thumbnail(image, thumbnail_side)
+    horizontal_list, free_list = reader.detect(
+        thumbnail, canvas_size=thumbnail_side, text_threshold=text_threshold,
+        low_text=low_text, min_size=4,
+    )
+    horizontal = []
+    height, width = image.shape[:2]
+    for x_min, x_max, y_min, y_max in horizontal_list[0]:
+        margin = (y_max - y_min) * REGION_MARGIN
+        horizontal.append([
+            max(0, int((x_min - margin) / scale)), min(width, int((x_max + margin) / scale)),
+            max(0, int((y_min - margin) / scale)), min(height, int((y_max + margin) / scale)),
+        ])
+    free = [[[int(x / scale), int(y / scale)] for x, y in box] for box in free_list[0]]
+    return horizontal, free
+
+
+class TextPrefilter:
+    """Skip text-free images and restrict recognition to detected regions.
+
+    Args:
+        mode: "detect" (EasyOCR detection on a thumbnail) or "edges" (edge heuristic)
+        sensitivity: Value in [0, 1]; higher finds fainter text but skips less
+        thumbnail_side: Longest side of the thumbnail the prefilter looks at
+    """
+
+    def __init__(self, mode="detect", sensitivity=DEFAULT_SENSITIVITY,
+                 thumbnail_side=DEFAULT_THUMBNAIL_SIDE):
+        if mode not in MODES:
+            raise ValueError(f"Unknown prefilter mode '{mode}' (choose from: {', '.join(MODES)})")
+        self.mode = mode
+        self.sensitivity = sensitivity
+        self.thumbnail_side = thumbnail_side
+        self._lock = threading.Lock()
+        self.images_checked = 0
+        self.images_skipped = 0
+        self.regions_found = 0
+
+    def _count(self, skipped, regions):
+        with self._lock:
+            self.images_checked += 1
+            self.images_skipped += int(skipped)
+            self.regions_found += regions
+        increment("prefilter_images_total", mode=self.mode,
+                  result="skipped" if skipped else "passed")
+        if regions:
+            increment("prefilter_regions_total", regions, mode=self.mode)
+
+    def read(self, reader, image, recognize_regions=True, **readtext_options):
+        """Recognize an image unless the prefilter finds no text in it.
+
+        Args:
+            reader: EasyOCR reader
+            image: Image path, encoded bytes or decoded array
+            recognize_regions: In "detect" mode, recognize only the detected
+                regions instead of calling ``readtext`` on the whole image
+            **readtext_options: Extra keyword arguments for ``readtext``
+
+        Returns:
+            List of (bbox, text, confidence) tuples, or None if the image
+            passed the prefilter but the caller should run its own recognition
+            (``recognize_regions`` False or "edges" mode)
+        """
+        from batched_recognition import decode
+
+        if isinstance(image, os.PathLike):
+            image = os.fspath(image)
+        color, grey = decode(image)
+        with timer("prefilter", mode=self.mode):
+            if self.mode == "edges":
+                regions = count_text_candidates(grey, self.sensitivity, self.thumbnail_side)
+                horizontal, free = None, None
+            else:
+                horizontal, free = detect_regions(reader, color, self.sensitivity,
+                                                  self.thumbnail_side)
+                regions = len(horizontal) + len(free)
+        self._count(regions == 0, regions)
+        if regions == 0:
+            return []
+        if horizontal is None or not recognize_regions:
+            return None
+        with timer("recognition", regions="true"):
+            return reader.recognize(grey, horizontal, free, reformat=False, **readtext_options)
+
+    def stats(self):
+        """Return the skip counters."""
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "images_checked": self.images_checked,
+                "images_skipped": self.images_skipped,
+                "regions_found": self.regions_found,
+            }
+
+
+_prefilters = {}
+_prefilters_lock = threading.Lock()
+
+
+def get_prefilter(mode="detect", sensitivity=DEFAULT_SENSITIVITY):
+    """Return the shared prefilter for a mode and sensitivity."""
+    key = (mode, float(sensitivity))
+    with _prefilters_lock:
+        prefilter = _prefilters.get(key)
+        if prefilter is None:
+            prefilter = _prefilters[key] = TextPrefilter(mode, sensitivity)
+        return prefilter
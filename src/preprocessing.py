@@ -0,0 +1,280 @@
+"""Declarative image preprocessing on a single grayscale buffer.
+
+Uploads are decoded straight into one 8-bit grayscale buffer (no RGB copy)
+and then passed through a chain of steps described by a short spec, e.g.::
+
+    "resize:max_side=1600,denoise,threshold:block_size=11:c=2"
+
+Steps work in place wherever OpenCV allows it; steps that must change the
+buffer shape (resize, deskew) allocate exactly one new buffer.  Every pipeline
+counts the buffers it allocates so the cost per image can be measured, and
+tracks the geometry those steps apply so bboxes found on the preprocessed
+image can be mapped back to the source with ``map_bbox``.
+"""
+
+import threading
+
+from metrics import timer
+
+# Spec used by the Streamlit app's "OpenCV Pre-processing" option
+DEFAULT_SPEC = "threshold"
+
+
+def decode_grayscale(source, inplace=False):
+    """Decode encoded image bytes or an image file directly into grayscale.
+
+    Args:
+        source: Encoded image bytes, a file path, or an already decoded array
+        inplace: Return a 2-D array source itself instead of a copy, so the
+            in-place steps may modify the caller's buffer (default: False)
+
+    Returns:
+        2-D uint8 array
+    """
+    import cv2
+    import numpy as np
+
+    if hasattr(source, "shape"):
+        if source.ndim == 2:
+            return source if inplace else source.copy()
+        code = cv2.COLOR_BGRA2GRAY if source.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+        return cv2.cvtColor(source, code)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = np.frombuffer(source, dtype=np.uint8)
+    else:
+        data = np.fromfile(str(source), dtype=np.uint8)
+    image = cv2.imdecode(data, cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        raise ValueError("Cannot decode image")
+    return image
+
+
+def threshold(image, block_size=11, c=2):
+    """Adaptive Gaussian threshold, in place."""
+    import cv2
+
+    return cv2.adaptiveThreshold(
+        image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY,
+        int(block_size), float(c), dst=image,
+    )
+
+
+def denoise(image, ksize=3):
+    """Median filter to remove salt-and-pepper noise, in place."""
+    import cv2
+
+    return cv2.medianBlur(image, int(ksize), dst=image)
+
+
+def deskew_matrix(image, max_angle=15.0, min_angle=0.5):
+    """Estimate the rotation that makes the dominant text direction horizontal.
+
+    The image is binarized with Otsu's threshold (dark text on a light
+    background becomes the foreground) and the skew angle is taken from the
+    minimum-area rectangle around the text pixels.
+
+    Returns:
+        2x3 affine rotation matrix, or None if the image is already straight
+        (or skewed by more than ``max_angle``)
+    """
+    import cv2
+
+    _, ink = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    coords = cv2.findNonZero(ink)
+    if coords is None:
+        return None
+    angle = cv2.minAreaRect(coords)[-1]
+    if angle > 45:
+        angle -= 90
+    if abs(angle) < float(min_angle) or abs(angle) > float(max_angle):
+        return None
+    height, width = image.shape
+    return cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+
+
+def warp(image, matrix):
+    """Apply a 2x3 affine matrix, filling uncovered corners with white."""
+    import cv2
+
+    height, width = image.shape
+    return cv2.warpAffine(image, matrix, (width, height), flags=cv2.INTER_LINEAR,
+                          borderMode=cv2.BORDER_CONSTANT, borderValue=255)
+
+
+def deskew(image, max_angle=15.0, min_angle=0.5):
+    """Rotate the image so the dominant text direction is horizontal.
+
+    Images that are already straight are returned unchanged.
+    """
+    matrix = deskew_matrix(image, max_angle, min_angle)
+    return image if matrix is None else warp(image, matrix)
+
+
+def resize(image, max_side=1600, scale=None):
+    """Shrink the image so its longest side is at most ``max_side``."""
+    import cv2
+
+    height, width = image.shape[:2]
+    factor = float(scale) if scale else min(1.0, float(max_side) / max(height, width))
+    if factor == 1.0:
+        return image
+    size = (max(1, round(width * factor)), max(1, round(height * factor)))
+    interpolation = cv2.INTER_AREA if factor < 1.0 else cv2.INTER_LINEAR
+    return cv2.resize(image, size, interpolation=interpolation)
+
+
+STEPS = {
+    "deskew": deskew,
+    "denoise": denoise,
+    "resize": resize,
+    "threshold": threshold,
+}
+
+# Steps that rotate or shear the image, by the function estimating their
+# affine matrix (the pipeline applies the matrix with ``warp``)
+AFFINE_STEPS = {
+    "deskew": deskew_matrix,
+}
+
+
+def map_bbox(bbox, matrix):
+    """Map every point of a bbox through a 2x3 affine matrix, rounding to int."""
+    return [[int(round(matrix[0][0] * float(x) + matrix[0][1] * float(y) + matrix[0][2])),
+             int(round(matrix[1][0] * float(x) + matrix[1][1] * float(y) + matrix[1][2]))]
+            for x, y in bbox]
+
+
+def parse_spec(spec):
+    """Parse a step spec such as ``"resize:max_side=1600,threshold:c=2"``.
+
+    Returns:
+        List of (step_name, params) tuples
+
+    Raises:
+        ValueError: If a step name or parameter is malformed
+    """
+    steps = []
+    for chunk in filter(None, (part.strip() for part in spec.split(","))):
+        name, *options = chunk.split(":")
+        if name not in STEPS:
+            raise ValueError(
+                f"Unknown preprocessing step '{name}' (choose from: {', '.join(sorted(STEPS))})"
+            )
+        params = {}
+        for option in options:
+            key, sep, value = option.partition("=")
+            if not sep:
+                raise ValueError(f"Expected key=value in preprocessing step '{chunk}'")
+            params[key.strip()] = value.strip()
+        steps.append((name, params))
+    return steps
+
+
+class PreprocessPipeline:
+    """Chain of preprocessing steps applied to one grayscale buffer.
+
+    Args:
+        steps: Spec string or list of (step_name, params) tuples
+    """
+
+    def __init__(self, steps=DEFAULT_SPEC):
+        self.spec = steps if isinstance(steps, str) else ",".join(
+            name + "".join(f":{k}={v}" for k, v in params.items()) for name, params in steps
+        )
+        self.steps = parse_spec(steps) if isinstance(steps, str) else list(steps)
+        self._lock = threading.Lock()
+        self.images = 0
+        self.allocations = 0
+        self.bytes_allocated = 0
+
+    def process(self, source, inplace=False):
+        """Decode and preprocess an image.
+
+        Args:
+            source: Encoded image bytes, a file path or a decoded array
+            inplace: Let the steps modify a 2-D array source in place instead
+                of a copy (default: False)
+
+        Returns:
+            Tuple of (grayscale image, matrix) where ``matrix`` is the 2x3
+            affine transform mapping coordinates in the output back to the
+            source (see ``map_bbox``)
+        """
+        import numpy as np
+
+        allocations = []
+        with timer("decode"):
+            image = decode_grayscale(source, inplace=inplace)
+        if not (hasattr(source, "shape") and image is source):
+            allocations.append(image.nbytes)
+        # Source-to-output transform accumulated over the geometric steps
+        forward = np.eye(3)
+
+        with timer("preprocess"):
+            for name, params in self.steps:
+                height, width = image.shape[:2]
+                if name in AFFINE_STEPS:
+                    matrix = AFFINE_STEPS[name](image, **params)
+                    result = image if matrix is None else warp(image, matrix)
+                    if matrix is not None:
+                        forward = np.vstack([matrix, [0.0, 0.0, 1.0]]) @ forward
+                else:
+                    result = STEPS[name](image, **params)
+                    if result.shape[:2] != (height, width):
+                        forward = np.diag([result.shape[1] / width,
+                                           result.shape[0] / height, 1.0]) @ forward
+                if result is not image:
+                    allocations.append(result.nbytes)
+                image = result
+
+        with self._lock:
+            self.images += 1
+            self.allocations += len(allocations)
+            self.bytes_allocated += sum(allocations)
+        return image, np.linalg.inv(forward)[:2]
+
+    def run(self, source, inplace=False):
+        """Decode and preprocess an image, returning only the image."""
+        return self.process(source, inplace=inplace)[0]
+
+    def __call__(self, source):
+        return self.run(source)
+
+    def stats(self):
+        """Return buffer allocation counters per processed image."""
+        with self._lock:
+            images = max(1, self.images)
+            return {
+                "images": self.images,
+                "allocations_per_image": self.allocations / images,
+                "bytes_per_image": self.bytes_allocated / images,
+            }
+
+
+_pipelines = {}
+
+
+def get_pipeline(spec):
+    """Return a shared pipeline for a spec string (or the pipeline itself)."""
+    if isinstance(spec, PreprocessPipeline):
+        return spec
+    pipeline = _pipelines.get(spec)
+    if pipeline is None:
+        pipeline = _pipelines.setdefault(spec, PreprocessPipeline(spec))
+    return pipeline
+
+
+def measure_allocations(pipeline, source):
+    """Measure peak traced memory for preprocessing one image.
+
+    Returns:
+        Peak bytes allocated through Python/NumPy while processing ``source``
+    """
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        pipeline.run(source)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
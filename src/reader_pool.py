@@ -0,0 +1,216 @@
+"""Process-wide cache of EasyOCR readers.
+
+Building an ``easyocr.Reader`` loads the detection and recognition networks
+from disk, which takes seconds and hundreds of MB.  The registry in this
+module keeps readers alive between calls so each language set is loaded once
+per process, evicting the least recently used reader when either the reader
+count or the memory budget is exceeded.
+"""
+
+import threading
+from collections import OrderedDict
+
+from metrics import increment, timer
+
+# Upper bound on the number of readers kept resident at the same time
+DEFAULT_MAX_READERS = 4
+
+# Total memory budget for resident readers, in megabytes
+DEFAULT_MEMORY_BUDGET_MB = 2048
+
+# Fallback size used when a reader's weights cannot be measured
+DEFAULT_READER_SIZE_MB = 300
+
+
+def normalize_languages(languages):
+    """Normalize a language list into a hashable, order-independent key.
+
+    Args:
+        languages: Iterable of EasyOCR language codes (e.g. ['en', 'hi'])
+
+    Returns:
+        Sorted tuple of unique, lower-cased language codes
+    """
+    if isinstance(languages, str):
+        languages = [languages]
+    codes = {code.strip().lower() for code in languages if code and code.strip()}
+    if not codes:
+        raise ValueError("At least one language code is required")
+    return tuple(sorted(codes))
+
+
+def estimate_reader_size(reader):
+    """Estimate the resident size of a reader from its model weights.
+
+    Args:
+        reader: An ``easyocr.Reader`` instance
+
+    Returns:
+        Estimated size in bytes
+    """
+    total = 0
+    for attr in ("detector", "recognizer"):
+        model = getattr(reader, attr, None)
+        try:
+            total += sum(p.numel() * p.element_size() for p in model.parameters())
+        except Exception:
+            continue
+    if not isinstance(total, int) or total <= 0:
+        return DEFAULT_READER_SIZE_MB * 1024 * 1024
+    return total
+
+
+def _easyocr_factory(languages, **options):
+    """Build a new EasyOCR reader (imported on demand)."""
+    import easyocr
+
+    return easyocr.Reader(list(languages), **options)
+
+
+class ReaderRegistry:
+    """LRU cache of EasyOCR readers keyed by language set and device options.
+
+    Args:
+        factory: Callable ``factory(languages, **options)`` returning a reader
+        max_readers: Maximum number of readers kept resident
+        memory_budget_mb: Maximum estimated memory for all resident readers
+        size_estimator: Callable returning the size of a reader in bytes
+    """
+
+    def __init__(self, factory=None, max_readers=DEFAULT_MAX_READERS,
+                 memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, size_estimator=None):
+        self.factory = factory or _easyocr_factory
+        self.max_readers = max_readers
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.size_estimator = size_estimator or estimate_reader_size
+        self._readers = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.RLock()
+        # One lock per key being loaded, so a slow load only blocks callers
+        # waiting for the same reader
+        self._loading = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(languages, **options):
+        """Build the cache key for a language set and reader options."""
+        return (normalize_languages(languages), tuple(sorted(options.items())))
+
+    def get(self, languages, **options):
+        """Return a cached reader, loading it on first use.
+
+        Args:
+            languages: List of language codes to recognize
+            **options: Extra keyword arguments for the reader (e.g. gpu=False)
+
+        Returns:
+            Reader instance shared by every caller with the same key
+        """
+        key = self.make_key(languages, **options)
+        with self._lock:
+            reader = self._hit(key)
+            if reader is not None:
+                return reader
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        # Models load outside the registry lock, so hits for other keys
+        # never wait on a load that takes seconds
+        with load_lock:
+            with self._lock:
+                # Another caller may have finished loading while this one waited
+                reader = self._hit(key)
+                if reader is not None:
+                    return reader
+                self.misses += 1
+                increment("cache_requests_total", cache="reader", result="miss")
+            try:
+                with timer("model_load"):
+                    reader = self.factory(key[0], **options)
+                size = self.size_estimator(reader)
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+            with self._lock:
+                self._readers[key] = reader
+                self._sizes[key] = size
+                self._evict(keep=key)
+            return reader
+
+    def _hit(self, key):
+        """Return the resident reader for key (marking it recently used), or None."""
+        reader = self._readers.get(key)
+        if reader is not None:
+            self._readers.move_to_end(key)
+            self.hits += 1
+            increment("cache_requests_total", cache="reader", result="hit")
+        return reader
+
+    def _evict(self, keep):
+        """Drop least recently used readers until within count and memory limits."""
+        while len(self._readers) > 1 and (
+            len(self._readers) > self.max_readers
+            or self.memory_usage() > self.memory_budget
+        ):
+            oldest = next(iter(self._readers))
+            if oldest == keep:
+                break
+            del self._readers[oldest]
+            del self._sizes[oldest]
+            self.evictions += 1
+
+    def memory_usage(self):
+        """Return the estimated memory held by resident readers, in bytes."""
+        return sum(self._sizes.values())
+
+    def discard(self, languages, **options):
+        """Remove a single reader from the cache if present."""
+        key = self.make_key(languages, **options)
+        with self._lock:
+            self._readers.pop(key, None)
+            self._sizes.pop(key, None)
+
+    def clear(self):
+        """Remove every cached reader and reset counters."""
+        with self._lock:
+            self._readers.clear()
+            self._sizes.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def keys(self):
+        """Return the keys of resident readers, least recently used first."""
+        with self._lock:
+            return list(self._readers)
+
+    def __len__(self):
+        return len(self._readers)
+
+    def __contains__(self, languages):
+        return self.make_key(languages) in self._readers
+
+
+_registry = ReaderRegistry()
+
+
+def get_registry():
+    """Return the process-wide reader registry."""
+    return _registry
+
+
+def get_reader(languages=('en',), **options):
+    """Return the shared EasyOCR reader for a language set.
+
+    Args:
+        languages: List of language codes to recognize (default: ['en'])
+        **options: Extra keyword arguments for ``easyocr.Reader``
+
+    Returns:
+        Cached ``easyocr.Reader`` instance
+    """
+    return _registry.get(languages, **options)
+
+
+def clear_readers():
+    """Drop every reader held by the process-wide registry."""
+    _registry.clear()
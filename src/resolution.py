@@ -0,0 +1,138 @@
+"""Adaptive input resolution for recognition.
+
+Phone photos are often 12 megapixels even when the text on them is large, and
+running ``readtext`` at full size dominates both latency and peak memory.  The
+policy in this module runs a cheap detection pass on a thumbnail to estimate
+how tall the text is, downscales the image to the smallest size that keeps the
+text tall enough for the recognizer, and maps the resulting bboxes back to the
+original coordinates.
+"""
+
+from metrics import timer
+
+# Text height (in pixels) the recognizer still reads reliably
+DEFAULT_MIN_TEXT_HEIGHT = 24
+
+# Longest side of the thumbnail used to estimate text scale
+DEFAULT_THUMBNAIL_SIDE = 640
+
+# Images are never scaled below this longest side
+DEFAULT_MIN_SIDE = 480
+
+# Percentile of detected text heights used as the reference height, kept low so
+# the smallest text in the image survives the downscale
+TEXT_HEIGHT_PERCENTILE = 10
+
+# Scale factors above this are not worth a resize
+_MIN_USEFUL_REDUCTION = 0.9
+
+
+def load_image(image):
+    """Return a decoded array for a path, encoded bytes or an existing array."""
+    if hasattr(image, "shape"):
+        return image
+    import cv2
+    import numpy as np
+
+    if isinstance(image, (bytes, bytearray)):
+        data = np.frombuffer(image, dtype=np.uint8)
+    else:
+        with open(image, "rb") as handle:
+            data = np.frombuffer(handle.read(), dtype=np.uint8)
+    decoded = cv2.imdecode(data, cv2.IMREAD_COLOR)
+    if decoded is None:
+        raise ValueError(f"Cannot decode image: {image if isinstance(image, str) else '<bytes>'}")
+    return decoded
+
+
+def resize(image, scale):
+    """Resize an image by a scale factor using area interpolation."""
+    import cv2
+
+    height, width = image.shape[:2]
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+
+def estimate_text_height(reader, image, thumbnail_side=DEFAULT_THUMBNAIL_SIDE,
+                         percentile=TEXT_HEIGHT_PERCENTILE):
+    """Estimate the height of the smaller text in an image.
+
+    Runs EasyOCR's detection network (no recognition) on a thumbnail.
+
+    Args:
+        reader: EasyOCR reader used for its ``detect`` method
+        image: Decoded image array
+        thumbnail_side: Longest side of the thumbnail
+        percentile: Percentile of detected box heights to report
+
+    Returns:
+        Estimated text height in original-image pixels, or None if no text was
+        detected
+    """
+    import numpy as np
+
+    height, width = image.shape[:2]
+    thumb_scale = min(1.0, thumbnail_side / max(height, width))
+    thumbnail = resize(image, thumb_scale) if thumb_scale < 1.0 else image
+
+    with timer("detection"):
+        horizontal_list, free_list = reader.detect(
+            thumbnail, canvas_size=thumbnail_side, min_size=4
+        )
+    heights = [box[3] - box[2] for box in horizontal_list[0]]
+    heights += [
+        max(point[1] for point in box) - min(point[1] for point in box)
+        for box in free_list[0]
+    ]
+    heights = [h for h in heights if h > 0]
+    if not heights:
+        return None
+    return float(np.percentile(heights, percentile)) / thumb_scale
+
+
+def choose_scale(image_shape, text_height, min_text_height=DEFAULT_MIN_TEXT_HEIGHT,
+                 min_side=DEFAULT_MIN_SIDE):
+    """Pick the downscale factor for an image.
+
+    Returns:
+        Scale in (0, 1]; 1.0 means the image is left at full size
+    """
+    if not text_height:
+        return 1.0
+    scale = min(1.0, min_text_height / text_height)
+    scale = max(scale, min(1.0, min_side / max(image_shape[:2])))
+    return 1.0 if scale > _MIN_USEFUL_REDUCTION else scale
+
+
+def scale_bbox(bbox, factor):
+    """Multiply every point of a bbox by ``factor``, rounding to int."""
+    return [[int(round(float(x) * factor)), int(round(float(y) * factor))] for x, y in bbox]
+
+
+def read_downscaled(reader, image, min_text_height=DEFAULT_MIN_TEXT_HEIGHT,
+                    min_side=DEFAULT_MIN_SIDE, **readtext_options):
+    """Run ``readtext`` at the smallest resolution that keeps text legible.
+
+    Args:
+        reader: EasyOCR reader
+        image: Image path, encoded bytes or decoded array
+        min_text_height: Smallest text height to preserve, in pixels
+        min_side: Longest side the image is never scaled below
+        **readtext_options: Extra keyword arguments for ``readtext``
+
+    Returns:
+        List of (bbox, text, confidence) tuples in original-image coordinates
+    """
+    with timer("decode"):
+        image = load_image(image)
+    text_height = estimate_text_height(reader, image)
+    scale = choose_scale(image.shape, text_height, min_text_height, min_side)
+    if scale >= 1.0:
+        with timer("recognition"):
+            return reader.readtext(image, **readtext_options)
+
+    image = resize(image, scale)
+    with timer("recognition"):
+        results = reader.readtext(image, **readtext_options)
+    return [(scale_bbox(bbox, 1.0 / scale), text, conf) for (bbox, text, conf) in results]
@@ -0,0 +1,218 @@
+"""Columnar container for OCR results.
+
+Results travel through the code as lists of ``(bbox, text, confidence)``
+tuples whose bboxes are nested lists of points.  That is convenient for one
+image but allocation-heavy for batch jobs with millions of regions.
+``OcrResults`` keeps the same data in three columns: a float32 array of
+bboxes with shape (n, 4, 2), a float64 array of confidences and a packed
+UTF-8 string table (one byte buffer plus offsets).  Filtering, reading order
+and joining run on the arrays, the columns export to Arrow and Parquet
+without copying, and iterating still yields ``(bbox, text, confidence)``
+tuples, so it can be passed wherever a result list is expected.
+
+Arrow and Parquet export need ``pyarrow`` (``pip install pyarrow``), which is
+only imported by those methods.
+"""
+
+from tiling import LINE_TOLERANCE
+
+# Points per bbox (EasyOCR returns four corners, clockwise from top left)
+BBOX_POINTS = 4
+
+
+def _pack_texts(texts):
+    """Encode texts into one UTF-8 byte array plus (n + 1) offsets."""
+    import numpy as np
+
+    encoded = [text.encode("utf-8") for text in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(text) for text in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+class OcrResults:
+    """Column-oriented (bbox, text, confidence) results.
+
+    Args:
+        boxes: float32 array of shape (n, 4, 2)
+        confidences: float64 array of shape (n,)
+        data: uint8 array with every text encoded as UTF-8, back to back
+        offsets: int64 array of shape (n + 1,); text i is data[offsets[i]:offsets[i + 1]]
+    """
+
+    def __init__(self, boxes, confidences, data, offsets):
+        self.boxes = boxes
+        self.confidences = confidences
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_results(cls, results):
+        """Build the columns from (bbox, text, confidence) tuples (or another OcrResults)."""
+        import numpy as np
+
+        if isinstance(results, cls):
+            return results
+        results = list(results)
+        boxes = np.asarray([bbox for bbox, _, _ in results], dtype=np.float32)
+        confidences = np.asarray([conf for _, _, conf in results], dtype=np.float64)
+        data, offsets = _pack_texts(text for _, text, _ in results)
+        return cls(boxes.reshape(len(results), BBOX_POINTS, 2), confidences, data, offsets)
+
+    @classmethod
+    def concatenate(cls, parts):
+        """Join several containers into one, in order."""
+        import numpy as np
+
+        parts = [cls.from_results(part) for part in parts]
+        if not parts:
+            return cls.from_results([])
+        # Each part's offsets restart at zero, so shift them by the bytes before it
+        shifts = np.cumsum([0] + [len(part.data) for part in parts[:-1]])
+        offsets = np.concatenate(
+            [parts[0].offsets[:1]] + [part.offsets[1:] + shift for part, shift in zip(parts, shifts)]
+        )
+        return cls(np.concatenate([part.boxes for part in parts]),
+                   np.concatenate([part.confidences for part in parts]),
+                   np.concatenate([part.data for part in parts]),
+                   offsets)
+
+    def __len__(self):
+        return len(self.confidences)
+
+    def text(self, index):
+        """Decode the text of one region."""
+        return self.data[self.offsets[index]:self.offsets[index + 1]].tobytes().decode("utf-8")
+
+    @property
+    def texts(self):
+        """List of every region's text."""
+        packed = self.data.tobytes()
+        bounds = self.offsets.tolist()
+        return [packed[start:end].decode("utf-8") for start, end in zip(bounds, bounds[1:])]
+
+    def __iter__(self):
+        return iter(zip(self.boxes.tolist(), self.texts, self.confidences.tolist()))
+
+    def __getitem__(self, index):
+        """Return one (bbox, text, confidence) tuple, or a container for a slice, mask or index array."""
+        import numpy as np
+
+        if isinstance(index, (int, np.integer)):
+            index = range(len(self))[index]
+            return self.boxes[index].tolist(), self.text(index), float(self.confidences[index])
+        return self.take(np.arange(len(self))[index])
+
+    def __eq__(self, other):
+        """Compare region by region with another container or a list of tuples."""
+        try:
+            return list(self) == [tuple(result) for result in other]
+        except TypeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"OcrResults({len(self)} regions)"
+
+    def take(self, indices):
+        """Return the regions at the given indices, in that order."""
+        import numpy as np
+
+        indices = np.asarray(indices, dtype=np.int64)
+        starts = self.offsets[indices]
+        lengths = self.offsets[indices + 1] - starts
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # Source byte of every output byte: its text's start plus its position in the text
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return OcrResults(self.boxes[indices], self.confidences[indices],
+                          self.data[positions], offsets)
+
+    def with_texts(self, texts):
+        """Return the same regions with replaced texts (e.g. after correction)."""
+        return OcrResults(self.boxes, self.confidences, *_pack_texts(texts))
+
+    def map_boxes(self, matrix):
+        """Map every bbox point through a 2x3 affine matrix, rounding to whole pixels."""
+        import numpy as np
+
+        matrix = np.asarray(matrix, dtype=np.float64)
+        boxes = np.rint(self.boxes @ matrix[:, :2].T + matrix[:, 2])
+        return OcrResults(boxes.astype(np.float32), self.confidences, self.data, self.offsets)
+
+    def filter(self, min_confidence):
+        """Keep the regions whose confidence is at least ``min_confidence``."""
+        import numpy as np
+
+        return self.take(np.flatnonzero(self.confidences >= min_confidence))
+
+    def bounds(self):
+        """Axis-aligned (x_min, y_min, x_max, y_max) of every bbox, shape (n, 4)."""
+        import numpy as np
+
+        return np.concatenate([self.boxes.min(axis=1), self.boxes.max(axis=1)], axis=1)
+
+    def reading_order(self, tolerance=LINE_TOLERANCE):
+        """Sort regions into lines (top to bottom) and each line left to right.
+
+        A region starts a new line when its vertical center is further from
+        the previous region's than ``tolerance`` times the taller of the two,
+        which matches ``tiling.reading_order`` for level text lines.
+        """
+        import numpy as np
+
+        if len(self) < 2:
+            return self
+        bounds = self.bounds()
+        centers = (bounds[:, 1] + bounds[:, 3]) / 2
+        heights = bounds[:, 3] - bounds[:, 1]
+        by_center = np.argsort(centers, kind="stable")
+        centers, heights = centers[by_center], heights[by_center]
+        new_line = np.abs(np.diff(centers)) > tolerance * np.maximum(heights[1:], heights[:-1])
+        lines = np.concatenate([[0], np.cumsum(new_line)])
+        order = np.lexsort((bounds[by_center, 0], lines))
+        return self.take(by_center[order])
+
+    def join(self, separator=" "):
+        """Join every text with ``separator`` (like ``main.join_text``) in one pass."""
+        import numpy as np
+
+        count = len(self)
+        if count == 0:
+            return ""
+        separator = np.frombuffer(separator.encode("utf-8"), dtype=np.uint8)
+        width = len(separator)
+        lengths = np.diff(self.offsets)
+        joined = np.empty(len(self.data) + width * (count - 1), dtype=np.uint8)
+        joined[np.arange(len(self.data)) + np.repeat(np.arange(count) * width, lengths)] = self.data
+        if width:
+            starts = self.offsets[1:-1] + np.arange(count - 1) * width
+            joined[(starts[:, None] + np.arange(width)).ravel()] = np.tile(separator, count - 1)
+        return joined.tobytes().decode("utf-8")
+
+    def to_arrow(self):
+        """Export as a ``pyarrow.Table`` sharing the column buffers (no copies).
+
+        Columns: ``bbox`` (fixed-size list of 8 float32: x0, y0, ... x3, y3),
+        ``text`` (large_string) and ``confidence`` (float64).
+        """
+        import numpy as np
+        import pyarrow as pa
+
+        boxes = np.ascontiguousarray(self.boxes).reshape(-1)
+        text = pa.Array.from_buffers(
+            pa.large_string(), len(self),
+            [None, pa.py_buffer(self.offsets), pa.py_buffer(self.data)],
+        )
+        return pa.table({
+            "bbox": pa.FixedSizeListArray.from_arrays(pa.array(boxes), BBOX_POINTS * 2),
+            "text": text,
+            "confidence": pa.array(self.confidences),
+        })
+
+    def write_parquet(self, path, **options):
+        """Write the columns to a Parquet file (options go to ``pyarrow.parquet.write_table``)."""
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), path, **options)
@@ -0,0 +1,239 @@
+"""Script identification that routes text regions to per-script readers.
+
+Loading one EasyOCR reader for every language that might appear costs memory
+and recognition time for scripts that are not in the image.  The router in
+this module runs detection once (the detector is shared by all languages),
+classifies every detected region as Latin, Devanagari, Arabic or CJK with a
+cheap shape heuristic on its binarized crop, and recognizes each group of
+regions with the reader for that script, taken from the shared reader pool.
+Readers for scripts that never show up are never loaded.
+"""
+
+import os
+
+from metrics import increment, timer
+from reader_pool import get_reader
+
+# EasyOCR language set used for each script (each set is a valid Reader
+# combination; English is included for mixed signage and digits)
+SCRIPT_LANGUAGES = {
+    "latin": ("en",),
+    "devanagari": ("hi", "en"),
+    "arabic": ("ar", "en"),
+    "cjk": ("ja", "en"),
+}
+
+# Script used when a region is not confidently anything else
+DEFAULT_SCRIPT = "latin"
+
+# Height (pixels) region crops are normalized to before classification
+CLASSIFY_HEIGHT = 32
+
+# Share of the region width a single top row must cover with joined strokes
+# to count as the Devanagari headline (shirorekha)
+HEADLINE_COVERAGE = 0.6
+
+# Top share of the normalized crop searched for the headline (and bottom
+# share searched for a mirrored stroke, as in Latin E, B and Z)
+HEADLINE_BAND = 0.45
+
+# Mean ink runs per column above which a region looks like CJK strokes
+CJK_MIN_CROSSINGS = 2.6
+
+# Share of the region width a single lower-half row must cover with joined
+# strokes for the baseline joining cursive Arabic letters
+BASELINE_COVERAGE = 0.55
+
+# Only strokes at least this many times the text height long count towards
+# a headline or baseline; single Latin letters (T, E, L) never are
+MIN_JOINED_RUN = 1.5
+
+
+def parse_scripts(spec):
+    """Parse "auto" or a comma-separated script list into a tuple of scripts.
+
+    Raises:
+        ValueError: If a script name is unknown
+    """
+    if not spec or spec == "auto":
+        return tuple(SCRIPT_LANGUAGES)
+    scripts = tuple(dict.fromkeys(part.strip() for part in spec.split(",") if part.strip()))
+    unknown = [script for script in scripts if script not in SCRIPT_LANGUAGES]
+    if unknown or not scripts:
+        raise ValueError(
+            f"Unknown script '{', '.join(unknown) or spec}' "
+            f"(choose from: auto, {', '.join(SCRIPT_LANGUAGES)})"
+        )
+    return scripts
+
+
+def _runs(row):
+    """Lengths of the runs of ink pixels in a boolean row."""
+    runs = []
+    current = 0
+    for value in row:
+        if value:
+            current += 1
+        elif current:
+            runs.append(current)
+            current = 0
+    if current:
+        runs.append(current)
+    return runs
+
+
+def _joined_row(rows, coverage):
+    """Return True if long joined strokes cover most of one row.
+
+    Only runs of at least ``MIN_JOINED_RUN`` text heights count, so the bars
+    of a few adjacent Latin capitals touching by chance (the tops of "ST")
+    do not add up to a headline the way a word-long stroke does.
+    """
+    for row in rows:
+        joined = sum(run for run in _runs(row) if run >= MIN_JOINED_RUN * CLASSIFY_HEIGHT)
+        if joined >= coverage * len(row):
+            return True
+    return False
+
+
+def ink_mask(crop):
+    """Binarize a grayscale crop so that text strokes are True."""
+    import cv2
+
+    import numpy as np
+
+    _, binary = cv2.threshold(crop, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    ink = binary > 0
+    # The crop's border is mostly background; bold text can cover more than
+    # half of the area, so the majority class is not a reliable guide
+    border = np.concatenate([ink[0], ink[-1], ink[1:-1, 0], ink[1:-1, -1]])
+    return ~ink if border.mean() > 0.5 else ink
+
+
+def classify_script(crop, scripts=None):
+    """Guess the script of one text region.
+
+    Args:
+        crop: Grayscale crop of a single detected text region
+        scripts: Scripts to choose from (default: all of ``SCRIPT_LANGUAGES``)
+
+    Returns:
+        Script name; ``DEFAULT_SCRIPT`` (or the first allowed script) when
+        nothing else matches
+    """
+    import cv2
+    import numpy as np
+
+    scripts = scripts or tuple(SCRIPT_LANGUAGES)
+    fallback = DEFAULT_SCRIPT if DEFAULT_SCRIPT in scripts else scripts[0]
+    height, width = crop.shape[:2]
+    if height < 4 or width < 4 or len(scripts) == 1:
+        return fallback
+    scale = CLASSIFY_HEIGHT / float(height)
+    crop = cv2.resize(crop, (max(4, int(round(width * scale))), CLASSIFY_HEIGHT),
+                      interpolation=cv2.INTER_AREA)
+    ink = ink_mask(crop)
+    columns = np.nonzero(ink.any(axis=0))[0]
+    if len(columns) == 0:
+        return fallback
+    ink = ink[:, columns[0]:columns[-1] + 1]
+
+    # Devanagari letters hang from one continuous headline near the top;
+    # serif Latin capitals (BEE, EFFECT) join as much ink at the bottom
+    band = int(CLASSIFY_HEIGHT * HEADLINE_BAND)
+    top, bottom = ink[:band], ink[-band:]
+    if "devanagari" in scripts and _joined_row(top, HEADLINE_COVERAGE) and \
+            not _joined_row(bottom, HEADLINE_COVERAGE):
+        return "devanagari"
+
+    # CJK glyphs stack many horizontal strokes in every column
+    if "cjk" in scripts:
+        padded = np.vstack([np.zeros((1, ink.shape[1]), dtype=bool), ink])
+        crossings = (padded[1:] & ~padded[:-1]).sum(axis=0)
+        inked = crossings[crossings > 0]
+        if len(inked) and inked.mean() >= CJK_MIN_CROSSINGS:
+            return "cjk"
+
+    # Cursive Arabic joins letters along a baseline in the lower half
+    if "arabic" in scripts and _joined_row(ink[CLASSIFY_HEIGHT // 2:], BASELINE_COVERAGE) and \
+            not _joined_row(top, BASELINE_COVERAGE):
+        return "arabic"
+
+    return fallback
+
+
+def _region_bounds(region, horizontal):
+    """Return (x0, y0, x1, y1) of a horizontal box or a free-form quadrilateral."""
+    if horizontal:
+        x_min, x_max, y_min, y_max = region
+        return x_min, y_min, x_max, y_max
+    xs = [point[0] for point in region]
+    ys = [point[1] for point in region]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+class ScriptReader:
+    """Reader-compatible wrapper whose ``readtext`` routes regions by script.
+
+    Code written against an EasyOCR reader (such as video mode's incremental
+    OCR) can use it to honour ``--scripts``.
+
+    Args:
+        scripts: Scripts to consider (default: all of ``SCRIPT_LANGUAGES``)
+        detector_languages: Language set of the reader whose detector is used
+    """
+
+    def __init__(self, scripts=None, detector_languages=("en",)):
+        self.scripts = scripts
+        self.detector_languages = tuple(detector_languages)
+
+    def readtext(self, image, **recognize_options):
+        """Detect and recognize like ``read_by_script``."""
+        return read_by_script(image, self.scripts, self.detector_languages,
+                              **recognize_options)
+
+
+def read_by_script(image, scripts=None, detector_languages=("en",), **recognize_options):
+    """Detect text once, then recognize each region with its script's reader.
+
+    Args:
+        image: Image path, encoded bytes or decoded array
+        scripts: Scripts to consider (default: all of ``SCRIPT_LANGUAGES``)
+        detector_languages: Language set of the reader whose detector is used
+        **recognize_options: Extra keyword arguments for ``reader.recognize``
+
+    Returns:
+        List of (bbox, text, confidence) tuples in reading order
+    """
+    from batched_recognition import decode
+    from tiling import box_bounds, reading_order
+
+    if isinstance(image, os.PathLike):
+        image = os.fspath(image)
+    color, grey = decode(image)
+    detector = get_reader(list(detector_languages))
+    with timer("detection"):
+        horizontal_list, free_list = detector.detect(color)
+
+    height, width = grey.shape[:2]
+    groups = {}
+    with timer("script_detection"):
+        for horizontal, regions in ((True, horizontal_list[0]), (False, free_list[0])):
+            for region in regions:
+                x0, y0, x1, y1 = _region_bounds(region, horizontal)
+                crop = grey[max(0, int(y0)):min(height, int(y1)),
+                            max(0, int(x0)):min(width, int(x1))]
+                script = classify_script(crop, scripts)
+                increment("script_regions_total", script=script)
+                group = groups.setdefault(script, ([], []))
+                group[0 if horizontal else 1].append(region)
+
+    candidates = []
+    for script, (horizontal, free) in groups.items():
+        reader = get_reader(list(SCRIPT_LANGUAGES[script]))
+        with timer("recognition", script=script):
+            results = reader.recognize(grey, horizontal, free, reformat=False,
+                                       **recognize_options)
+        candidates.extend({"bounds": box_bounds(result[0]), "result": result}
+                          for result in results)
+    return [candidate["result"] for candidate in reading_order(candidates)]
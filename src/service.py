@@ -0,0 +1,464 @@
+"""Long-running HTTP OCR service with dynamic micro-batching.
+
+Readers are loaded once at startup and shared by every request.  Concurrent
+requests are collected into micro-batches (up to ``max_batch_size`` images,
+waiting at most ``max_wait`` seconds for the batch to fill) before recognition
+runs on EasyOCR's batched entry points, and the texts of a batch are
+translated together by the batched translation engine.
+
+Endpoints:
+    POST /ocr             Image bytes in the body; returns the result (sync)
+    POST /jobs            Image bytes in the body; returns a job id (async)
+    GET  /jobs/<id>       Job status and, once done, its result
+    GET  /stats           Queue depth, batch and latency statistics as JSON
+    GET  /metrics         Prometheus text export of every metric
+    GET  /healthz         Liveness check
+
+Query parameters for POST: ``translate`` (target language), ``languages``
+(comma-separated OCR languages) and ``name`` (label echoed as "image").
+
+Usage:
+    python src/service.py --port 8080 --languages en --max-batch-size 8
+    python src/service.py --translator local   # no translation API calls
+"""
+
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from batched_recognition import readtext_many
+from metrics import get_metrics, increment, record_failure, timer
+from output import image_to_record
+from reader_pool import ReaderRegistry, normalize_languages
+from resolution import load_image
+from translation_engine import BACKENDS, TranslationEngine, create_backend
+
+# Largest number of images recognized in one micro-batch
+DEFAULT_MAX_BATCH_SIZE = 8
+
+# Longest time (seconds) the first request of a batch waits for more requests
+DEFAULT_MAX_WAIT = 0.01
+
+# Finished async jobs kept for polling before the oldest are dropped
+DEFAULT_MAX_JOBS = 10000
+
+# Largest accepted request body, in bytes
+MAX_BODY_BYTES = 50 * 1024 * 1024
+
+
+class MicroBatcher:
+    """Collect concurrent submissions into batches for one worker thread.
+
+    Args:
+        process_batch: Callable taking a list of items and returning a list of
+            results in the same order
+        max_batch_size: Largest number of items per batch
+        max_wait: Seconds the first item of a batch waits for the batch to fill
+        name: Label used for the exported metrics
+    """
+
+    def __init__(self, process_batch, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_wait=DEFAULT_MAX_WAIT, name="ocr"):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.name = name
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"{name}-batcher",
+                                        daemon=True)
+        self._thread.start()
+
+    def submit(self, item):
+        """Queue an item and return a Future for its result."""
+        if self._closed:
+            raise RuntimeError("Batcher is closed")
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        get_metrics().set_gauge("queue_depth", self._queue.qsize(), queue=self.name)
+        return future
+
+    def queue_depth(self):
+        """Return the number of items waiting for a batch."""
+        return self._queue.qsize()
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    entry = self._queue.get(timeout=remaining)
+                else:
+                    # Past the deadline, only take what is already queued
+                    entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is None:
+                # Put the sentinel back so the loop stops after this batch
+                self._queue.put(None)
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        metrics = get_metrics()
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            started = time.perf_counter()
+            metrics.set_gauge("queue_depth", self._queue.qsize(), queue=self.name)
+            metrics.observe("batch_size", len(batch), queue=self.name)
+            for _, _, queued_at in batch:
+                metrics.observe("queue_wait_seconds", started - queued_at, queue=self.name)
+
+            items = [item for item, _, _ in batch]
+            try:
+                results = self.process_batch(items)
+            except Exception as e:
+                record_failure(f"{self.name}_batch", e)
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future, _), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def close(self):
+        """Finish queued items and stop the worker thread."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+
+class OcrService:
+    """Recognition and translation behind a micro-batching queue.
+
+    Args:
+        languages: Default OCR languages, loaded at startup
+        confidence_threshold: Minimum confidence score to include text
+        registry: ReaderRegistry to load readers from (default: EasyOCR readers)
+        translation_engine: TranslationEngine for translations (default: Google)
+        max_batch_size: Largest number of images per micro-batch
+        max_wait: Seconds to wait for a micro-batch to fill
+        max_jobs: Number of async jobs remembered for polling
+    """
+
+    def __init__(self, languages=("en",), confidence_threshold=0.5, registry=None,
+                 translation_engine=None, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_wait=DEFAULT_MAX_WAIT, max_jobs=DEFAULT_MAX_JOBS):
+        self.languages = normalize_languages(languages)
+        self.confidence_threshold = confidence_threshold
+        self.registry = registry if registry is not None else ReaderRegistry()
+        if translation_engine is None:
+            translation_engine = TranslationEngine()
+        self.translation_engine = translation_engine
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()
+        self._jobs_lock = threading.Lock()
+        self._latencies = []
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+
+        # Load the default readers before accepting traffic
+        self.registry.get(self.languages)
+        self.batcher = MicroBatcher(self.process_batch, max_batch_size, max_wait)
+
+    def recognize(self, reader, images):
+        """Run batched recognition on decoded images and apply the confidence filter.
+
+        Returns:
+            One list of (bbox, text, confidence) tuples (or an exception) per image
+        """
+        outputs = readtext_many(reader, images, max_batch_size=self.batcher.max_batch_size)
+        return [
+            results if isinstance(results, Exception) else
+            [(bbox, text, conf) for (bbox, text, conf) in results
+             if conf >= self.confidence_threshold]
+            for results in outputs
+        ]
+
+    def process_batch(self, requests):
+        """Recognize and translate one micro-batch of request dicts.
+
+        Returns:
+            List of JSON-ready records (or exceptions) in request order
+        """
+        outcomes = [None] * len(requests)
+        groups = {}
+        for index, request in enumerate(requests):
+            start = time.perf_counter()
+            try:
+                with timer("decode"):
+                    image = load_image(request["image"])
+            except Exception as e:
+                record_failure("decode", e)
+                outcomes[index] = (request, e, {})
+                continue
+            timings = {"decode": time.perf_counter() - start}
+            languages = request.get("languages") or self.languages
+            groups.setdefault(languages, []).append((index, image, timings))
+
+        # One batched recognition call per language set in the micro-batch
+        for languages, members in groups.items():
+            start = time.perf_counter()
+            try:
+                reader = self.registry.get(languages)
+                with timer("recognition", batched="true"):
+                    batch_results = self.recognize(reader, [image for _, image, _ in members])
+            except Exception as e:
+                batch_results = [e] * len(members)
+            elapsed = time.perf_counter() - start
+            for (index, _, timings), results in zip(members, batch_results):
+                timings["ocr"] = elapsed
+                if isinstance(results, Exception):
+                    record_failure("ocr", results)
+                else:
+                    increment("images_total")
+                outcomes[index] = (requests[index], results, timings)
+
+        # Translate every text of the batch together
+        segments = [
+            (" ".join(text for (_, text, _) in results), request["translate"])
+            for request, results, _ in outcomes
+            if request.get("translate") and not isinstance(results, Exception) and results
+        ]
+        translations = iter(())
+        if segments:
+            start = time.perf_counter()
+            translations = iter(self.translation_engine.translate_segments(segments))
+            elapsed = time.perf_counter() - start
+
+        records = []
+        for request, results, timings in outcomes:
+            if isinstance(results, Exception):
+                records.append(results)
+                continue
+            translation = None
+            if request.get("translate") and results:
+                translation = next(translations)
+                timings["translate"] = elapsed
+            records.append(image_to_record(request.get("name", "upload"), results,
+                                           request.get("translate"), translation, timings))
+        return records
+
+    def submit(self, image, translate=None, languages=None, name="upload"):
+        """Queue one image and return a Future for its record."""
+        request = {"image": image, "translate": translate, "name": name,
+                   "languages": normalize_languages(languages) if languages else None}
+        started = time.perf_counter()
+        future = self.batcher.submit(request)
+        future.add_done_callback(lambda _: self._record_latency(started))
+        return future
+
+    def _record_latency(self, started):
+        elapsed = time.perf_counter() - started
+        get_metrics().observe("request_seconds", elapsed)
+        with self._stats_lock:
+            self.requests += 1
+            self._latencies.append(elapsed)
+            del self._latencies[:-1000]
+
+    def process(self, image, translate=None, languages=None, name="upload", timeout=None):
+        """Process one image synchronously (through the micro-batcher)."""
+        return self.submit(image, translate, languages, name).result(timeout)
+
+    def create_job(self, image, translate=None, languages=None, name="upload"):
+        """Queue one image as an async job and return its id."""
+        job_id = uuid.uuid4().hex
+        future = self.submit(image, translate, languages, name)
+        with self._jobs_lock:
+            self._jobs[job_id] = future
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        return job_id
+
+    def job_status(self, job_id):
+        """Return the status dict of a job, or None if it is unknown."""
+        with self._jobs_lock:
+            future = self._jobs.get(job_id)
+        if future is None:
+            return None
+        if not future.done():
+            return {"job_id": job_id, "status": "queued"}
+        error = future.exception()
+        if error is not None:
+            return {"job_id": job_id, "status": "error", "error": str(error)}
+        return {"job_id": job_id, "status": "done", "result": future.result()}
+
+    def stats(self):
+        """Return queue depth, request count and latency percentiles."""
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            requests = self.requests
+
+        def pick(fraction):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+        metrics = get_metrics()
+        return {
+            "queue_depth": self.batcher.queue_depth(),
+            "requests": requests,
+            "latency_p50": pick(0.5),
+            "latency_p99": pick(0.99),
+            "batch_size": metrics.histogram("batch_size", queue=self.batcher.name),
+            "queue_wait": metrics.histogram("queue_wait_seconds", queue=self.batcher.name),
+            "max_batch_size": self.batcher.max_batch_size,
+            "max_wait": self.batcher.max_wait,
+        }
+
+    def close(self):
+        """Drain the queue and stop the batcher."""
+        self.batcher.close()
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """HTTP front end for an OcrService (set as ``server.service``)."""
+
+    server_version = "Img2TranslatedTxt"
+
+    def log_message(self, format, *args):
+        # Request logging is left to the metrics endpoint
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_text(self, status, text):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_request(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            raise ValueError("Request body must contain the image bytes")
+        if length > MAX_BODY_BYTES:
+            raise ValueError("Image is too large")
+        query = parse_qs(urlparse(self.path).query)
+        languages = query.get("languages", [None])[0]
+        return {
+            "image": self.rfile.read(length),
+            "translate": query.get("translate", [None])[0],
+            "languages": languages.split(",") if languages else None,
+            "name": query.get("name", ["upload"])[0],
+        }
+
+    def do_POST(self):
+        service = self.server.service
+        path = urlparse(self.path).path
+        if path not in ("/ocr", "/jobs"):
+            self._send_json(404, {"error": "Not found"})
+            return
+        try:
+            request = self._read_request()
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        if path == "/jobs":
+            job_id = service.create_job(**request)
+            self._send_json(202, {"job_id": job_id, "status": "queued"})
+            return
+        try:
+            self._send_json(200, service.process(**request))
+        except Exception as e:
+            self._send_json(422, {"error": str(e)})
+
+    def do_GET(self):
+        service = self.server.service
+        path = urlparse(self.path).path
+        if path == "/healthz":
+            self._send_json(200, {"status": "ok"})
+        elif path == "/stats":
+            self._send_json(200, service.stats())
+        elif path == "/metrics":
+            self._send_text(200, get_metrics().to_prometheus())
+        elif path.startswith("/jobs/"):
+            status = service.job_status(path[len("/jobs/"):])
+            if status is None:
+                self._send_json(404, {"error": "Unknown job"})
+            else:
+                self._send_json(200, status)
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+
+def create_server(service, host="127.0.0.1", port=8080):
+    """Build a threaded HTTP server bound to ``service`` (port 0 picks a free port)."""
+    server = ThreadingHTTPServer((host, port), ServiceHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def build_parser():
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="service.py",
+        description="Serve OCR and translation over HTTP with micro-batching.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--languages", default="en",
+                        help="comma-separated OCR languages loaded at startup")
+    parser.add_argument("--confidence", type=float, default=0.5,
+                        help="minimum confidence score to include text")
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                        help="largest number of images per micro-batch")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT * 1000,
+                        help="longest wait for a micro-batch to fill, in milliseconds")
+    parser.add_argument("--translator", choices=sorted(BACKENDS), default="google",
+                        help="translation backend ('local' works offline)")
+    return parser
+
+
+def main(argv=None):
+    """Run the OCR service until interrupted."""
+    args = build_parser().parse_args(argv)
+    service = OcrService(
+        languages=args.languages.split(","),
+        confidence_threshold=args.confidence,
+        translation_engine=TranslationEngine(create_backend(args.translator)),
+        max_batch_size=args.max_batch_size,
+        max_wait=args.max_wait_ms / 1000.0,
+    )
+    server = create_server(service, args.host, args.port)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
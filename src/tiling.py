@@ -0,0 +1,187 @@
+"""Tiled OCR for very large images.
+
+Posters and scanned sheets full of small text are too big to recognize whole
+and lose their text when downscaled.  The helpers in this module split the
+image into overlapping tiles, recognize the tiles in parallel, shift every
+bbox back into global coordinates, drop the duplicates found in the overlaps
+and rebuild the reading order.
+
+The whole image is still decoded into one buffer first; tiling bounds the
+size of each recognition input (and the detector's working memory), not the
+memory held by the decoded image.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import timer
+from resolution import load_image
+
+# Side length of a square tile, in pixels
+DEFAULT_TILE_SIZE = 1024
+
+# Overlap between neighbouring tiles; must exceed the tallest text line
+DEFAULT_OVERLAP = 128
+
+# Share of the smaller box covered by a larger one for both to count as duplicates
+DUPLICATE_OVERLAP = 0.5
+
+# Boxes whose vertical centers differ by less than this share of the line
+# height are on the same line
+LINE_TOLERANCE = 0.5
+
+# Distance (pixels) from an inner tile edge at which a box counts as cut off
+EDGE_MARGIN = 2
+
+
+def plan_tiles(height, width, tile_size=DEFAULT_TILE_SIZE, overlap=DEFAULT_OVERLAP):
+    """Split an image into overlapping tiles covering every pixel.
+
+    Returns:
+        List of (x0, y0, x1, y1) tile rectangles, row by row
+    """
+    if overlap >= tile_size:
+        raise ValueError("Tile overlap must be smaller than the tile size")
+
+    def starts(length):
+        if length <= tile_size:
+            return [0]
+        step = tile_size - overlap
+        positions = list(range(0, length - tile_size, step))
+        positions.append(length - tile_size)
+        return positions
+
+    return [
+        (x, y, min(x + tile_size, width), min(y + tile_size, height))
+        for y in starts(height)
+        for x in starts(width)
+    ]
+
+
+def box_bounds(bbox):
+    """Return the axis-aligned (x_min, y_min, x_max, y_max) of a bbox."""
+    xs = [float(x) for x, _ in bbox]
+    ys = [float(y) for _, y in bbox]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def offset_bbox(bbox, dx, dy):
+    """Shift every point of a bbox by (dx, dy)."""
+    return [[int(round(float(x) + dx)), int(round(float(y) + dy))] for x, y in bbox]
+
+
+def _cut_off(bounds, tile, image_size):
+    """Return True if a box touches a tile edge that is not an image edge."""
+    x_min, y_min, x_max, y_max = bounds
+    x0, y0, x1, y1 = tile
+    width, height = image_size
+    return ((x0 > 0 and x_min - x0 <= EDGE_MARGIN)
+            or (y0 > 0 and y_min - y0 <= EDGE_MARGIN)
+            or (x1 < width and x1 - x_max <= EDGE_MARGIN)
+            or (y1 < height and y1 - y_max <= EDGE_MARGIN))
+
+
+def _overlap_share(a, b):
+    """Intersection area divided by the area of the smaller box."""
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    smaller = min((a[2] - a[0]) * (a[3] - a[1]), (b[2] - b[0]) * (b[3] - b[1]))
+    return width * height / smaller if smaller > 0 else 0.0
+
+
+def deduplicate(candidates, threshold=DUPLICATE_OVERLAP):
+    """Drop boxes found twice in tile overlaps.
+
+    Args:
+        candidates: List of dicts with "bounds", "result" and "cut_off" keys
+        threshold: Overlap share above which two boxes are duplicates
+
+    Returns:
+        Kept candidates; a complete box beats one cut off by a tile edge, then
+        the larger box, then the more confident one
+    """
+    ranked = sorted(
+        candidates,
+        key=lambda c: (not c["cut_off"],
+                       (c["bounds"][2] - c["bounds"][0]) * (c["bounds"][3] - c["bounds"][1]),
+                       c["result"][2]),
+        reverse=True,
+    )
+    kept = []
+    for candidate in ranked:
+        if all(_overlap_share(candidate["bounds"], other["bounds"]) < threshold
+               for other in kept):
+            kept.append(candidate)
+    return kept
+
+
+def reading_order(candidates, tolerance=LINE_TOLERANCE):
+    """Sort boxes into lines (top to bottom) and each line left to right."""
+    remaining = sorted(candidates, key=lambda c: (c["bounds"][1] + c["bounds"][3]) / 2)
+    lines = []
+    for candidate in remaining:
+        x_min, y_min, x_max, y_max = candidate["bounds"]
+        center, height = (y_min + y_max) / 2, y_max - y_min
+        if lines:
+            line = lines[-1]
+            if abs(center - line["center"]) <= tolerance * max(height, line["height"]):
+                line["members"].append(candidate)
+                # Track the mean center so slightly slanted lines stay together
+                count = len(line["members"])
+                line["center"] += (center - line["center"]) / count
+                continue
+        lines.append({"center": center, "height": height, "members": [candidate]})
+    return [member for line in lines
+            for member in sorted(line["members"], key=lambda c: c["bounds"][0])]
+
+
+def read_tiled(reader, image, tile_size=DEFAULT_TILE_SIZE, overlap=DEFAULT_OVERLAP,
+               workers=None, **readtext_options):
+    """Run ``readtext`` on overlapping tiles and merge the results.
+
+    Args:
+        reader: EasyOCR reader (shared by the tile threads)
+        image: Image path, encoded bytes or decoded array
+        tile_size: Side length of a tile in pixels
+        overlap: Overlap between neighbouring tiles in pixels
+        workers: Tiles recognized in parallel (default: CPU count)
+        **readtext_options: Extra keyword arguments for ``readtext``
+
+    Returns:
+        List of (bbox, text, confidence) tuples in global coordinates and
+        reading order
+    """
+    import numpy as np
+
+    with timer("decode"):
+        image = load_image(image)
+    height, width = image.shape[:2]
+    tiles = plan_tiles(height, width, tile_size, overlap)
+    if len(tiles) == 1:
+        with timer("recognition"):
+            return reader.readtext(image, **readtext_options)
+
+    def recognize(tile):
+        x0, y0, x1, y1 = tile
+        # Slicing is a view; only the tile being recognized is copied
+        crop = np.ascontiguousarray(image[y0:y1, x0:x1])
+        with timer("recognition", tiled="true"):
+            results = reader.readtext(crop, **readtext_options)
+        candidates = []
+        for bbox, text, conf in results:
+            global_bbox = offset_bbox(bbox, x0, y0)
+            bounds = box_bounds(global_bbox)
+            candidates.append({
+                "bounds": bounds,
+                "result": (global_bbox, text, conf),
+                "cut_off": _cut_off(bounds, tile, (width, height)),
+            })
+        return candidates
+
+    workers = workers or min(len(tiles), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        candidates = [c for tile_candidates in executor.map(recognize, tiles)
+                      for c in tile_candidates]
+    return [c["result"] for c in reading_order(deduplicate(candidates))]
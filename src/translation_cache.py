@@ -0,0 +1,263 @@
+"""Two-tier translation cache: in-memory LRU backed by SQLite on disk.
+
+Signage and product images repeat the same strings constantly, so translated
+phrases are remembered per (source text, source language, target language,
+backend).  Lookups hit the in-process LRU first and fall back to the on-disk
+store, which survives between runs.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+from metrics import increment
+
+# Default number of entries kept in the in-memory tier
+DEFAULT_MEMORY_ENTRIES = 10000
+
+# Default number of entries kept in the on-disk tier
+DEFAULT_DISK_ENTRIES = 1000000
+
+# Default time-to-live for cached translations (30 days), in seconds
+DEFAULT_TTL = 30 * 24 * 3600
+
+# Number of writes between TTL/size sweeps of the on-disk tier
+_SWEEP_INTERVAL = 1000
+
+
+def default_cache_dir():
+    """Return the directory used for persistent caches.
+
+    Honours the ``IMG2TXT_CACHE_DIR`` environment variable and falls back to
+    ``~/.cache/img2translatedtxt``.
+    """
+    return Path(os.environ.get("IMG2TXT_CACHE_DIR")
+                or Path.home() / ".cache" / "img2translatedtxt")
+
+
+def normalize_text(text):
+    """Normalize source text so trivially different inputs share a key."""
+    return unicodedata.normalize("NFC", " ".join(text.split()))
+
+
+def make_key(text, target_language, source_language="auto", backend="google"):
+    """Build the cache key for a translation request.
+
+    Returns:
+        Hex digest identifying (normalized text, source, target, backend)
+    """
+    raw = "\x1f".join(
+        [backend, source_language, target_language, normalize_text(text)]
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """In-memory LRU in front of an optional SQLite store.
+
+    Args:
+        db_path: Path of the SQLite database, or None for a memory-only cache
+        max_memory_entries: Maximum entries in the in-memory tier
+        max_disk_entries: Maximum entries in the on-disk tier
+        ttl: Seconds after which a cached translation expires (None = never)
+    """
+
+    def __init__(self, db_path=None, max_memory_entries=DEFAULT_MEMORY_ENTRIES,
+                 max_disk_entries=DEFAULT_DISK_ENTRIES, ttl=DEFAULT_TTL):
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if db_path is not None:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " key TEXT PRIMARY KEY,"
+                " source_text TEXT NOT NULL,"
+                " source_language TEXT NOT NULL,"
+                " target_language TEXT NOT NULL,"
+                " backend TEXT NOT NULL,"
+                " translation TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS translations_accessed"
+                " ON translations (accessed_at)"
+            )
+            self._conn.commit()
+
+    def _expired(self, created_at, now):
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def get(self, text, target_language, source_language="auto", backend="google"):
+        """Look up a cached translation.
+
+        Returns:
+            Translated text, or None on a miss
+        """
+        key = make_key(text, target_language, source_language, backend)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                translation, created_at = entry
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    increment("cache_requests_total", cache="translation", result="hit")
+                    return translation
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT translation, created_at FROM translations WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is not None and not self._expired(row[1], now):
+                    self._conn.execute(
+                        "UPDATE translations SET accessed_at = ? WHERE key = ?",
+                        (now, key),
+                    )
+                    self._conn.commit()
+                    self._remember(key, row[0], row[1])
+                    self.disk_hits += 1
+                    increment("cache_requests_total", cache="translation", result="hit")
+                    return row[0]
+
+            self.misses += 1
+            increment("cache_requests_total", cache="translation", result="miss")
+            return None
+
+    def set(self, text, target_language, translation, source_language="auto",
+            backend="google"):
+        """Store a translation in both tiers."""
+        key = make_key(text, target_language, source_language, backend)
+        now = time.time()
+        with self._lock:
+            self._remember(key, translation, now)
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, normalize_text(text), source_language, target_language,
+                 backend, translation, now, now),
+            )
+            self._writes += 1
+            if self._writes % _SWEEP_INTERVAL == 0:
+                self._sweep(now)
+            self._conn.commit()
+
+    def _remember(self, key, translation, created_at):
+        self._memory[key] = (translation, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _sweep(self, now):
+        """Drop expired rows and trim the on-disk tier to its size limit."""
+        if self.ttl is not None:
+            self._conn.execute(
+                "DELETE FROM translations WHERE created_at < ?", (now - self.ttl,)
+            )
+        self._conn.execute(
+            "DELETE FROM translations WHERE key IN ("
+            " SELECT key FROM translations ORDER BY accessed_at DESC"
+            " LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,),
+        )
+
+    def sweep(self):
+        """Run TTL and size eviction on the on-disk tier now."""
+        with self._lock:
+            if self._conn is not None:
+                self._sweep(time.time())
+                self._conn.commit()
+
+    def get_or_translate(self, text, target_language, translate, source_language="auto",
+                         backend="google"):
+        """Return a cached translation or compute, store and return it.
+
+        Args:
+            text: Text to translate
+            target_language: Target language code
+            translate: Callable ``translate(text)`` used on a miss
+
+        Returns:
+            Translated text
+        """
+        cached = self.get(text, target_language, source_language, backend)
+        if cached is not None:
+            return cached
+        translation = translate(text)
+        if translation is not None:
+            self.set(text, target_language, translation, source_language, backend)
+        return translation
+
+    def stats(self):
+        """Return hit/miss counters and tier sizes."""
+        with self._lock:
+            disk_entries = 0
+            if self._conn is not None:
+                disk_entries = self._conn.execute(
+                    "SELECT COUNT(*) FROM translations"
+                ).fetchone()[0]
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+            }
+
+    def clear(self):
+        """Remove every cached translation and reset counters."""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM translations")
+                self._conn.commit()
+            self.memory_hits = self.disk_hits = self.misses = 0
+
+    def close(self):
+        """Close the on-disk store."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_cache = None
+
+
+def get_translation_cache():
+    """Return the process-wide translation cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        try:
+            _cache = TranslationCache(default_cache_dir() / "translations.sqlite3")
+        except (OSError, sqlite3.Error) as e:
+            print(f"Translation cache unavailable on disk, using memory only: {str(e)}")
+            _cache = TranslationCache()
+    return _cache
+
+
+def set_translation_cache(cache):
+    """Replace the process-wide translation cache (e.g. memory-only in tests)."""
+    global _cache
+    _cache = cache
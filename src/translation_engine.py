@@ -0,0 +1,463 @@
+"""Batched, deduplicated and concurrent translation of many segments.
+
+``translate_text`` handles one string per HTTP round trip.  The engine in this
+module accepts many segments at once, drops duplicates and cached phrases,
+groups the rest by target language, packs them into provider-sized batches and
+sends the batches concurrently over pooled clients, with a rate limiter and
+retry with exponential backoff.
+"""
+
+import queue
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from metrics import record_failure, timer
+from translation_cache import get_translation_cache, normalize_text
+
+# Google Translate rejects requests longer than 5000 characters
+GOOGLE_MAX_CHARS = 5000
+
+# Long texts are split into chunks of at most this many characters, each
+# translated in its own concurrent request
+DEFAULT_CHUNK_CHARS = 1000
+
+# Whitespace after Latin sentence-ending punctuation, or right after CJK
+# full stops, question and exclamation marks
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?;])\s+|(?<=[\u3002\uff01\uff1f])\s*")
+
+
+class TranslationBackend:
+    """Interface for translation providers used by the engine.
+
+    Subclasses implement ``translate_batch`` and set the batch limits of the
+    provider.
+    """
+
+    name = "base"
+    max_batch_chars = GOOGLE_MAX_CHARS
+    max_batch_size = 100
+
+    def translate_batch(self, texts, target_language, source_language="auto"):
+        """Translate a list of texts in a single provider call.
+
+        Returns:
+            List of translated texts, in the same order as ``texts``
+        """
+        raise NotImplementedError
+
+
+class ClientPool:
+    """Pool of reusable provider clients per (source, target) language pair.
+
+    Clients are created lazily up to ``size`` per language pair and lent out
+    to one thread at a time, since translator objects keep request state.
+    """
+
+    def __init__(self, factory, size=4):
+        self.factory = factory
+        self.size = size
+        self._pools = {}
+        self._created = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self, source_language, target_language):
+        """Borrow a client for a language pair, creating one if needed."""
+        key = (source_language, target_language)
+        with self._lock:
+            pool = self._pools.setdefault(key, queue.LifoQueue())
+            create = pool.empty() and self._created.get(key, 0) < self.size
+            if create:
+                self._created[key] = self._created.get(key, 0) + 1
+        client = self.factory(source_language, target_language) if create else pool.get()
+        try:
+            yield client
+        finally:
+            pool.put(client)
+
+
+class GoogleBackend(TranslationBackend):
+    """Google Translate via deep-translator, with pooled clients.
+
+    Several short segments are packed into one newline-separated request and
+    split again on the way back; if the provider does not preserve the line
+    structure the batch falls back to one request per segment.
+    """
+
+    name = "google"
+    max_batch_chars = GOOGLE_MAX_CHARS
+    max_batch_size = 50
+
+    def __init__(self, pool_size=4):
+        self.pool = ClientPool(self._make_client, size=pool_size)
+
+    @staticmethod
+    def _make_client(source_language, target_language):
+        from deep_translator import GoogleTranslator
+
+        return GoogleTranslator(source=source_language, target=target_language)
+
+    def translate_batch(self, texts, target_language, source_language="auto"):
+        with self.pool.acquire(source_language, target_language) as client:
+            if len(texts) == 1:
+                return [client.translate(texts[0])]
+            translated = client.translate("\n".join(texts))
+            lines = translated.split("\n") if translated else []
+            if len(lines) == len(texts):
+                return [line.strip() for line in lines]
+            return [client.translate(text) for text in texts]
+
+
+class LocalBackend(TranslationBackend):
+    """Offline stand-in backend for tests and load testing.
+
+    Returns ``"[<target>] <text>"`` after sleeping ``latency`` seconds per
+    batch to simulate a network round trip.
+    """
+
+    name = "local"
+
+    def __init__(self, latency=0.0, max_batch_chars=GOOGLE_MAX_CHARS, max_batch_size=50):
+        self.latency = latency
+        self.max_batch_chars = max_batch_chars
+        self.max_batch_size = max_batch_size
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def translate_batch(self, texts, target_language, source_language="auto"):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return [f"[{target_language}] {text}" for text in texts]
+
+
+BACKENDS = {
+    "google": GoogleBackend,
+    "local": LocalBackend,
+}
+
+
+def create_backend(name, **kwargs):
+    """Instantiate a translation backend by name ('google' or 'local')."""
+    try:
+        return BACKENDS[name](**kwargs)
+    except KeyError:
+        raise ValueError(
+            f"Unknown translation backend '{name}' "
+            f"(choose from: {', '.join(sorted(BACKENDS))})"
+        ) from None
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting calls per second.
+
+    Args:
+        rate: Sustained calls per second (None disables limiting)
+        burst: Maximum calls allowed back to back
+    """
+
+    def __init__(self, rate=None, burst=1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a call is allowed."""
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def pack_batches(texts, max_chars, max_items):
+    """Greedily pack texts into batches within provider limits.
+
+    Texts containing newlines, or longer than ``max_chars`` on their own, are
+    sent as single-item batches.
+
+    Returns:
+        List of lists of texts
+    """
+    batches = []
+    current = []
+    size = 0
+    for text in texts:
+        if "\n" in text or len(text) >= max_chars:
+            batches.append([text])
+            continue
+        added = len(text) + (1 if current else 0)
+        if current and (size + added > max_chars or len(current) >= max_items):
+            batches.append(current)
+            current, size, added = [], 0, len(text)
+        current.append(text)
+        size += added
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _split_long(sentence, max_chars):
+    """Split one over-long sentence at word boundaries (or hard, without spaces).
+
+    Returns:
+        List of (piece, separator) pairs, where separator is the whitespace
+        removed after the piece ("" after a hard cut and the last piece)
+    """
+    pieces = []
+    while len(sentence) > max_chars:
+        cut = sentence.rfind(" ", 0, max_chars + 1)
+        if cut <= 0:
+            cut = max_chars
+        piece, rest = sentence[:cut].rstrip(), sentence[cut:]
+        following = rest.lstrip()
+        pieces.append((piece, sentence[len(piece):len(sentence) - len(following)]))
+        sentence = following
+    if sentence:
+        pieces.append((sentence, ""))
+    return pieces
+
+
+def split_chunks(text, max_chars=DEFAULT_CHUNK_CHARS):
+    """Split text into chunks of whole sentences, keeping what separates them.
+
+    Sentences are packed greedily with their original separators; a sentence
+    longer than ``max_chars`` is split at word boundaries.
+
+    Returns:
+        List of (chunk, separator) pairs in text order; concatenating every
+        chunk and separator reproduces the stripped text, so newlines and the
+        missing spaces between CJK sentences survive reassembly
+    """
+    text = text.strip()
+    sentences, start = [], 0
+    for match in SENTENCE_BOUNDARY.finditer(text):
+        sentences.append((text[start:match.start()], match.group()))
+        start = match.end()
+    sentences.append((text[start:], ""))
+
+    chunks = []
+    current, pending = "", ""
+    for sentence, boundary in sentences:
+        pieces = _split_long(sentence, max_chars)
+        if not pieces:
+            pending += boundary
+            continue
+        # The sentence boundary follows the sentence's last piece
+        pieces[-1] = (pieces[-1][0], pieces[-1][1] + boundary)
+        for piece, separator in pieces:
+            if current and len(current) + len(pending) + len(piece) <= max_chars:
+                current += pending + piece
+            else:
+                if current:
+                    chunks.append((current, pending))
+                current = piece
+            pending = separator
+    if current:
+        chunks.append((current, ""))
+    return chunks
+
+
+def split_text(text, max_chars=DEFAULT_CHUNK_CHARS):
+    """Split text into chunks of whole sentences within a size limit.
+
+    Returns:
+        List of non-empty chunks in text order (see ``split_chunks``)
+    """
+    return [chunk for chunk, _ in split_chunks(text, max_chars)]
+
+
+class TranslationEngine:
+    """Translate many segments with deduplication, batching and concurrency.
+
+    Args:
+        backend: TranslationBackend instance (default: GoogleBackend)
+        max_concurrency: Maximum batches in flight at the same time
+        rate_limit: Maximum provider calls per second (None = unlimited)
+        max_retries: Retries per batch after the first failure
+        backoff: Base delay in seconds for exponential backoff
+        cache: TranslationCache to consult (default: process-wide cache)
+    """
+
+    def __init__(self, backend=None, max_concurrency=8, rate_limit=None,
+                 max_retries=3, backoff=0.5, cache=None):
+        self.backend = backend or GoogleBackend(pool_size=max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = RateLimiter(rate_limit, burst=max_concurrency)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "segments": 0,
+            "unique": 0,
+            "cache_hits": 0,
+            "batches": 0,
+            "retries": 0,
+            "failures": 0,
+            "chunks": 0,
+        }
+
+    def _call_with_retry(self, texts, target_language, source_language):
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                with timer("translation", backend=self.backend.name):
+                    return self.backend.translate_batch(texts, target_language,
+                                                        source_language)
+            except Exception as e:
+                record_failure("translation", e)
+                if attempt == self.max_retries:
+                    raise
+                with self._stats_lock:
+                    self.stats["retries"] += 1
+                time.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+
+    def translate_segments(self, segments, source_language="auto", pack=True):
+        """Translate (text, target_language) pairs.
+
+        Args:
+            segments: Iterable of (text, target_language) tuples
+            pack: Pack short segments into shared provider calls; when False
+                every unique segment is sent as its own concurrent call
+
+        Returns:
+            List of translated texts in input order; segments that could not be
+            translated are returned unchanged
+        """
+        segments = list(segments)
+        cache = self.cache or get_translation_cache()
+        with self._stats_lock:
+            self.stats["segments"] += len(segments)
+
+        # Deduplicate by normalized text and group by target language
+        resolved = {}
+        pending = {}
+        cache_hits = 0
+        for text, target_language in segments:
+            key = (normalize_text(text), target_language)
+            if key in resolved or key in pending.get(target_language, {}):
+                continue
+            if not key[0]:
+                continue
+            cached = cache.get(key[0], target_language, source_language, self.backend.name)
+            if cached is not None:
+                resolved[key] = cached
+                cache_hits += 1
+            else:
+                pending.setdefault(target_language, {})[key] = key[0]
+        with self._stats_lock:
+            self.stats["cache_hits"] += cache_hits
+            self.stats["unique"] += len(resolved) + sum(map(len, pending.values()))
+
+        futures = []
+        for target_language, group in pending.items():
+            if pack:
+                batches = pack_batches(
+                    list(group.values()),
+                    self.backend.max_batch_chars,
+                    self.backend.max_batch_size,
+                )
+            else:
+                batches = [[text] for text in group.values()]
+            for batch in batches:
+                future = self._executor.submit(
+                    self._call_with_retry, batch, target_language, source_language
+                )
+                futures.append((target_language, batch, future))
+        with self._stats_lock:
+            self.stats["batches"] += len(futures)
+
+        for target_language, batch, future in futures:
+            try:
+                translations = future.result()
+            except Exception as e:
+                print(f"Translation error: {str(e)}")
+                with self._stats_lock:
+                    self.stats["failures"] += len(batch)
+                translations = [None] * len(batch)
+            for text, translated in zip(batch, translations):
+                if translated is None:
+                    resolved[(text, target_language)] = text
+                    continue
+                resolved[(text, target_language)] = translated
+                cache.set(text, target_language, translated, source_language,
+                          self.backend.name)
+
+        return [
+            resolved.get((normalize_text(text), target_language), text)
+            if normalize_text(text) else text
+            for text, target_language in segments
+        ]
+
+    def translate_many(self, texts, target_language, source_language="auto"):
+        """Translate a list of texts into one target language.
+
+        Returns:
+            List of translated texts in input order
+        """
+        return self.translate_segments(
+            [(text, target_language) for text in texts], source_language
+        )
+
+    def translate_long(self, text, target_language, source_language="auto",
+                       max_chars=DEFAULT_CHUNK_CHARS):
+        """Translate a long text as concurrent sentence chunks, reassembled in order.
+
+        Each chunk is cached, retried and, if it still fails, left untranslated
+        on its own, so one bad chunk does not discard the rest and latency
+        follows the slowest chunk rather than the total length.
+
+        Returns:
+            Translated text
+        """
+        max_chars = min(max_chars, self.backend.max_batch_chars)
+        chunks = split_chunks(text, max_chars)
+        if len(chunks) <= 1:
+            return self.translate_segments([(text, target_language)], source_language)[0]
+        with self._stats_lock:
+            self.stats["chunks"] += len(chunks)
+        translated = self.translate_segments(
+            [(chunk, target_language) for chunk, _ in chunks], source_language, pack=False
+        )
+        # Rejoin with the separators the split consumed (newlines, or none for CJK)
+        return "".join(text + separator
+                       for text, (_, separator) in zip(translated, chunks))
+
+    def close(self):
+        """Shut down the worker threads."""
+        self._executor.shutdown(wait=True)
+
+
+_engine = None
+
+
+def get_translation_engine():
+    """Return the process-wide translation engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        _engine = TranslationEngine()
+    return _engine
+
+
+def set_translation_engine(engine):
+    """Replace the process-wide translation engine (e.g. a local backend)."""
+    global _engine
+    _engine = engine
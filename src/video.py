@@ -0,0 +1,309 @@
+"""Frame-sequence mode: incremental OCR of videos and image sequences.
+
+Screen recordings and camera feeds repeat the same text for many frames.
+Each sampled frame is diffed against the previous one on a coarse grid of
+area-averaged cells; only the cells that changed are re-recognized (expanded
+to the text boxes they touch), everything else reuses the previous results, and only
+region texts not seen before are translated.  The output is a stream of
+timestamped subtitle cues (SRT, WebVTT or JSON Lines) emitted as soon as the
+on-screen text changes.
+"""
+
+import json
+from pathlib import Path
+
+from batch import IMAGE_EXTENSIONS, collect_images
+from metrics import increment, timer
+from tiling import box_bounds, offset_bbox, reading_order
+
+# Frames per second analysed from a video file
+DEFAULT_SAMPLE_FPS = 2.0
+
+# Frame rate assumed for image sequences (one image per second)
+DEFAULT_SEQUENCE_FPS = 1.0
+
+# The frame is split into GRID x GRID cells for change detection
+DEFAULT_GRID = 8
+
+# Averaged pixels per cell side in the change signature
+CELL_PIXELS = 8
+
+# Gray levels an averaged pixel must move for its cell to count as changed
+DEFAULT_DIFF_THRESHOLD = 12
+
+# Pixels added around a changed area before it is re-recognized
+CHANGE_MARGIN = 8
+
+# Share of the frame above which a change is treated as a scene cut
+FULL_FRAME_SHARE = 0.5
+
+# Subtitle output formats
+SUBTITLE_FORMATS = ("srt", "vtt", "jsonl")
+
+
+def is_frame_sequence(source):
+    """Return True if source names image files (directory, glob or image) rather than a video."""
+    path = Path(source)
+    return path.is_dir() or any(c in str(source) for c in "*?[") or \
+        path.suffix.lower() in IMAGE_EXTENSIONS
+
+
+def iter_frames(source, sample_fps=DEFAULT_SAMPLE_FPS, sequence_fps=DEFAULT_SEQUENCE_FPS):
+    """Yield (timestamp_seconds, frame) pairs from a video or an image sequence.
+
+    Video frames between samples are grabbed but not decoded.
+
+    Args:
+        source: Video file, or a directory, glob or list of images
+        sample_fps: Frames per second sampled from a video
+        sequence_fps: Frame rate of an image sequence
+
+    Raises:
+        ValueError: If the video cannot be opened
+    """
+    import cv2
+
+    if isinstance(source, (list, tuple)) or is_frame_sequence(source):
+        paths = collect_images(source if isinstance(source, (list, tuple)) else [str(source)])
+        for index, path in enumerate(paths):
+            with timer("decode"):
+                frame = cv2.imread(str(path))
+            if frame is not None:
+                yield index / sequence_fps, frame
+        return
+
+    capture = cv2.VideoCapture(str(source))
+    if not capture.isOpened():
+        raise ValueError(f"Cannot open video: {source}")
+    try:
+        fps = capture.get(cv2.CAP_PROP_FPS) or 25.0
+        step = max(1, int(round(fps / sample_fps)))
+        index = 0
+        while capture.grab():
+            if index % step == 0:
+                with timer("decode"):
+                    ok, frame = capture.retrieve()
+                if ok:
+                    yield index / fps, frame
+            index += 1
+    finally:
+        capture.release()
+
+
+def frame_signature(frame, grid=DEFAULT_GRID):
+    """Shrink a frame to CELL_PIXELS x CELL_PIXELS averaged pixels per grid cell.
+
+    Area averaging suppresses sensor noise and compression artifacts, so two
+    signatures differ only where the picture really changed.
+    """
+    import cv2
+    import numpy as np
+
+    grey = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    side = grid * CELL_PIXELS
+    return cv2.resize(grey, (side, side), interpolation=cv2.INTER_AREA).astype(np.int16)
+
+
+def changed_rects(previous, current, shape, threshold=DEFAULT_DIFF_THRESHOLD):
+    """Return pixel rectangles (x0, y0, x1, y1) covering the changed grid cells.
+
+    A cell changed when any of its averaged pixels moved by more than
+    ``threshold`` gray levels; neighbouring changed cells are merged into one
+    rectangle.
+    """
+    import cv2
+    import numpy as np
+
+    grid = current.shape[0] // CELL_PIXELS
+    diff = np.abs(current - previous).reshape(grid, CELL_PIXELS, grid, CELL_PIXELS)
+    mask = (diff.max(axis=(1, 3)) > threshold).astype(np.uint8)
+    if not mask.any():
+        return []
+    height, width = shape[:2]
+    count, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    rects = []
+    for col, row, cols, rows, _ in stats[1:count]:
+        rects.append((width * col // grid, height * row // grid,
+                      width * (col + cols) // grid, height * (row + rows) // grid))
+    return rects
+
+
+def _intersects(bounds, rect):
+    x_min, y_min, x_max, y_max = bounds
+    x0, y0, x1, y1 = rect
+    return x_min < x1 and x0 < x_max and y_min < y1 and y0 < y_max
+
+
+class IncrementalOcr:
+    """Recognize a frame stream, re-reading only the regions that changed.
+
+    Args:
+        reader: EasyOCR reader
+        confidence_threshold: Minimum confidence score to keep a region
+        grid: Cells per side of the change-detection grid
+        threshold: Gray levels an averaged pixel must move for its cell to change
+        **readtext_options: Extra keyword arguments for ``readtext``
+    """
+
+    def __init__(self, reader, confidence_threshold=0.5, grid=DEFAULT_GRID,
+                 threshold=DEFAULT_DIFF_THRESHOLD, **readtext_options):
+        self.reader = reader
+        self.confidence_threshold = confidence_threshold
+        self.grid = grid
+        self.threshold = threshold
+        self.readtext_options = readtext_options
+        self.signature = None
+        self.results = []
+
+    def _read(self, image, dx=0, dy=0, incremental=False):
+        with timer("recognition", incremental="true" if incremental else "false"):
+            results = self.reader.readtext(image, **self.readtext_options)
+        return [(offset_bbox(bbox, dx, dy), text, conf) for bbox, text, conf in results
+                if conf >= self.confidence_threshold]
+
+    def update(self, frame):
+        """Recognize one frame.
+
+        Returns:
+            Tuple of (results in reading order, True if anything was re-read)
+        """
+        import numpy as np
+
+        signature = frame_signature(frame, self.grid)
+        previous, self.signature = self.signature, signature
+        rects = None if previous is None else changed_rects(previous, signature, frame.shape,
+                                                             self.threshold)
+        if rects == []:
+            increment("video_frames_total", result="reused")
+            return self.results, False
+
+        height, width = frame.shape[:2]
+        if rects is None or sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in rects) \
+                > FULL_FRAME_SHARE * width * height:
+            # First frame or scene cut: read the whole frame
+            increment("video_frames_total", result="full")
+            self.results = self._read(frame)
+            return self.results, True
+
+        increment("video_frames_total", result="updated")
+        kept = [(result, box_bounds(result[0])) for result in self.results]
+        fresh = []
+        for rect in rects:
+            # Grow the area until it covers every old box it touches, so a text
+            # line is always re-read whole
+            x0, y0, x1, y1 = rect
+            grown = True
+            while grown:
+                grown = False
+                for _, bounds in kept:
+                    if _intersects(bounds, (x0, y0, x1, y1)):
+                        new = (min(x0, bounds[0]), min(y0, bounds[1]),
+                               max(x1, bounds[2]), max(y1, bounds[3]))
+                        grown = grown or new != (x0, y0, x1, y1)
+                        x0, y0, x1, y1 = new
+            x0, y0 = max(0, int(x0) - CHANGE_MARGIN), max(0, int(y0) - CHANGE_MARGIN)
+            x1, y1 = min(width, int(x1) + CHANGE_MARGIN), min(height, int(y1) + CHANGE_MARGIN)
+            kept = [(result, bounds) for result, bounds in kept
+                    if not _intersects(bounds, (x0, y0, x1, y1))]
+            increment("video_regions_reocr_total")
+            fresh.extend(self._read(np.ascontiguousarray(frame[y0:y1, x0:x1]), x0, y0,
+                                    incremental=True))
+
+        candidates = [{"bounds": bounds, "result": result} for result, bounds in kept]
+        candidates += [{"bounds": box_bounds(result[0]), "result": result} for result in fresh]
+        self.results = [c["result"] for c in reading_order(candidates)]
+        return self.results, True
+
+
+def subtitle_stream(frames, reader, translate_to=None, confidence_threshold=0.5,
+                    grid=DEFAULT_GRID, threshold=DEFAULT_DIFF_THRESHOLD):
+    """Turn (timestamp, frame) pairs into subtitle cues.
+
+    A cue is emitted once the on-screen text changes (or the stream ends);
+    frames without text produce no cue.  Region translations are reused while
+    their text stays on screen, so only new texts reach the translator.
+
+    Yields:
+        Dicts with "start", "end", "text", "regions" and, when translating,
+        "translation"
+    """
+    from main import translate_texts
+
+    ocr = IncrementalOcr(reader, confidence_threshold, grid, threshold)
+    translations = {}
+    cue = None
+    last_timestamp, interval = None, 0.0
+    for timestamp, frame in frames:
+        if last_timestamp is not None:
+            interval = timestamp - last_timestamp
+        last_timestamp = timestamp
+
+        results, changed = ocr.update(frame)
+        if not changed:
+            continue
+        text = " ".join(text for _, text, _ in results)
+        if cue is not None and cue["text"] == text:
+            continue
+        if cue is not None:
+            cue["end"] = timestamp
+            yield cue
+            cue = None
+        if not text:
+            continue
+
+        cue = {"start": timestamp, "end": None, "text": text,
+               "regions": [text for _, text, _ in results]}
+        if translate_to:
+            new = [t for t in dict.fromkeys(cue["regions"]) if t not in translations]
+            if new:
+                translations.update(zip(new, translate_texts(new, translate_to)))
+            # Keep only the texts still on screen so the map stays small
+            translations = {t: translations[t] for t in cue["regions"]}
+            cue["translation"] = " ".join(translations[t] for t in cue["regions"])
+    if cue is not None:
+        cue["end"] = last_timestamp + (interval or 1.0 / DEFAULT_SEQUENCE_FPS)
+        yield cue
+
+
+def format_timestamp(seconds, separator=","):
+    """Format seconds as HH:MM:SS,mmm (SRT) or HH:MM:SS.mmm (WebVTT)."""
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3600 * 1000)
+    minutes, millis = divmod(millis, 60 * 1000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def format_cue(cue, index, subtitle_format="srt"):
+    """Format one cue as an SRT block, a WebVTT block or a JSON line."""
+    if subtitle_format == "jsonl":
+        record = {"index": index, "start": round(cue["start"], 3),
+                  "end": round(cue["end"], 3), "text": cue["text"]}
+        if "translation" in cue:
+            record["translation"] = cue["translation"]
+        return json.dumps(record, ensure_ascii=False) + "\n"
+    separator = "," if subtitle_format == "srt" else "."
+    lines = [str(index)] if subtitle_format == "srt" else []
+    lines.append(f"{format_timestamp(cue['start'], separator)} --> "
+                 f"{format_timestamp(cue['end'], separator)}")
+    lines.append(cue["text"])
+    if "translation" in cue:
+        lines.append(cue["translation"])
+    return "\n".join(lines) + "\n\n"
+
+
+def write_subtitles(cues, stream, subtitle_format="srt"):
+    """Write cues to a text stream as they arrive, flushing after each one.
+
+    Returns:
+        Number of cues written
+    """
+    if subtitle_format not in SUBTITLE_FORMATS:
+        raise ValueError(f"Unknown subtitle format: {subtitle_format}")
+    if subtitle_format == "vtt":
+        stream.write("WEBVTT\n\n")
+    count = 0
+    for count, cue in enumerate(cues, 1):
+        stream.write(format_cue(cue, count, subtitle_format))
+        stream.flush()
+    return count
@@ -0,0 +1,33 @@
+"""Shared pytest fixtures."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import inference
+import metrics
+import ocr_cache
+import reader_pool
+import translation_cache
+import translation_engine
+
+
+@pytest.fixture(autouse=True)
+def reset_process_caches(monkeypatch, tmp_path):
+    """Start every test with empty process-wide caches so mocks don't leak."""
+    # Never forward to a warm-model daemon the developer may have running
+    monkeypatch.setenv("IMG2TXT_DAEMON_SOCKET", str(tmp_path / "daemon.sock"))
+    reader_pool.clear_readers()
+    translation_cache.set_translation_cache(translation_cache.TranslationCache())
+    ocr_cache.set_ocr_cache(ocr_cache.OcrCache())
+    yield
+    inference.configure_inference(None)
+    reader_pool.clear_readers()
+    translation_cache.set_translation_cache(None)
+    translation_engine.set_translation_engine(None)
+    ocr_cache.set_ocr_cache(None)
+    metrics.set_metrics(None)
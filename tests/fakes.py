@@ -0,0 +1,21 @@
+"""Fake readers shared by several test modules."""
+
+import numpy as np
+
+
+class BlobReader:
+    """Fake reader returning one region per bright blob, named by its gray level."""
+
+    def __init__(self):
+        self.shapes = []
+
+    def readtext(self, image, **kwargs):
+        self.shapes.append(image.shape[:2])
+        grey = image[:, :, 0]
+        results = []
+        for level in np.unique(grey[grey > 0]):
+            ys, xs = np.nonzero(grey == level)
+            x_min, x_max, y_min, y_max = xs.min(), xs.max() + 1, ys.min(), ys.max() + 1
+            bbox = [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
+            results.append((bbox, f"word{level}", 0.9))
+        return results
@@ -0,0 +1,80 @@
+"""Tests for the Streamlit app's per-session caches."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+
+from app_state import LruCache, extraction_key, get_session_caches, translate_languages
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test that reading an entry protects it from eviction."""
+    cache = LruCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert len(cache) == 2
+
+
+def test_extraction_key_normalizes_preprocessing():
+    """Test that equivalent specs share a key and invalid ones fail early."""
+    upload = b"image bytes"
+    assert extraction_key(upload, "denoise, threshold") == extraction_key(upload, "denoise,threshold")
+    assert extraction_key(upload, None) != extraction_key(upload, "threshold")
+    with pytest.raises(ValueError):
+        extraction_key(upload, "sharpen")
+
+
+def test_session_caches_survive_reruns():
+    """Test that the caches are created once per session state."""
+    state = {}
+    first = get_session_caches(state)
+    assert get_session_caches(state) == first
+
+
+def test_languages_fan_out_concurrently_and_are_cached():
+    """Test concurrent translation of misses and lookups on the next rerun."""
+    calls = []
+    lock = threading.Lock()
+
+    def translate(text, language):
+        with lock:
+            calls.append(language)
+        time.sleep(0.2)
+        return f"{language}:{text}"
+
+    cache = LruCache(max_entries=16)
+    start = time.perf_counter()
+    translations = translate_languages("START GAME", ["hi", "es", "fr", "es"], translate, cache)
+    elapsed = time.perf_counter() - start
+
+    assert translations == {"hi": "hi:START GAME", "es": "es:START GAME", "fr": "fr:START GAME"}
+    assert elapsed < 0.2 * 2
+
+    # Switching to a cached language costs a lookup, not a translation
+    assert translate_languages("START GAME", ["fr"], translate, cache) == {"fr": "fr:START GAME"}
+    assert sorted(calls) == ["es", "fr", "hi"]
+
+
+def test_failed_language_is_reported_and_retried():
+    """Test that one failing language neither breaks the others nor gets cached."""
+    def translate(text, language):
+        if language == "ja":
+            raise ConnectionError("provider unavailable")
+        return f"{language}:{text}"
+
+    cache = LruCache(max_entries=16)
+    translations = translate_languages("MENU", ["ja", "es"], translate, cache)
+
+    assert translations["es"] == "es:MENU"
+    assert translations["ja"] == "Translation Error: provider unavailable"
+    assert ("MENU", "ja") not in cache
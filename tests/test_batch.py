@@ -0,0 +1,69 @@
+"""Tests for batch processing over directories, globs and file lists."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from batch import collect_images, run_batch
+
+
+def test_collect_images_expands_directories_globs_and_lists(tmp_path):
+    """Test that every input form is expanded in order without duplicates."""
+    for name in ["b.jpg", "a.png", "notes.txt"]:
+        (tmp_path / name).write_bytes(b"")
+    nested = tmp_path / "nested"
+    nested.mkdir()
+    (nested / "c.jfif").write_bytes(b"")
+    file_list = tmp_path / "list.txt"
+    file_list.write_text("# extra images\nuploads/Nike.jfif\n\n", encoding="utf-8")
+
+    paths = collect_images(
+        [str(tmp_path), str(tmp_path / "*.jpg")], file_list=str(file_list)
+    )
+
+    assert paths == [
+        str(tmp_path / "a.png"),
+        str(tmp_path / "b.jpg"),
+        str(nested / "c.jfif"),
+        "uploads/Nike.jfif",
+    ]
+
+
+def test_run_batch_preserves_input_order():
+    """Test that inline batch mode loads one reader and keeps input order."""
+    with patch('main.easyocr.Reader') as mock_reader:
+        mock_reader_instance = MagicMock()
+        mock_reader.return_value = mock_reader_instance
+        mock_reader_instance.readtext.side_effect = lambda path: [
+            ([[0, 0], [100, 0], [100, 20], [0, 20]], Path(path).stem, 0.95),
+            ([[0, 20], [100, 20], [100, 40], [0, 40]], "noise", 0.10),
+        ]
+
+        images = ["uploads/Nike.jfif", "uploads/McD.jfif", "uploads/5Star.jfif"]
+        batch = list(run_batch(images, workers=1))
+
+        assert [path for path, _ in batch] == images
+        assert [results[0][1] for _, results in batch] == ["Nike", "McD", "5Star"]
+        assert all(len(results) == 1 for _, results in batch)
+        assert mock_reader.call_count == 1
+
+
+def test_run_batch_merges_worker_metrics():
+    """Test that metrics recorded in worker processes reach the parent registry."""
+    from metrics import get_metrics
+
+    with patch('main.easyocr.Reader') as mock_reader:
+        mock_reader.return_value.readtext.side_effect = lambda path: [
+            ([[0, 0], [100, 0], [100, 20], [0, 20]], Path(path).stem, 0.95),
+        ]
+        images = ["uploads/Nike.jfif", "uploads/McD.jfif", "uploads/5Star.jfif"]
+        batch = list(run_batch(images, workers=2))
+
+    metrics = get_metrics()
+    assert [results[0][1] for _, results in batch] == ["Nike", "McD", "5Star"]
+    assert metrics.counter_value("images_total") == 3
+    assert metrics.histogram("stage_seconds", stage="recognition")["count"] == 3
+    assert metrics.counter_value("cache_requests_total", cache="ocr", result="miss") == 3
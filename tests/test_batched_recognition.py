@@ -0,0 +1,145 @@
+"""Tests for batched multi-image recognition."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import cv2
+import numpy as np
+
+from batched_recognition import bucket_shape, choose_batch_size, readtext_many
+from inference import InferenceConfig, configure_inference
+from main import extract_text_from_image, extract_text_from_images
+from ocr_cache import OcrCache, get_ocr_cache, set_ocr_cache
+
+
+class FakeReader:
+    """Reader that detects each blob of non-zero pixels as a region.
+
+    Regions come back right to left, out of reading order, and each 'text'
+    is the (unpadded) image size plus the region's top-left corner.
+    """
+
+    def __init__(self):
+        self.detect_batches = []
+
+    def detect(self, images, reformat=True, **kwargs):
+        images = images if images.ndim == 4 else images[None]
+        self.detect_batches.append(len(images))
+        horizontal = []
+        for image in images:
+            count, _, stats, _ = cv2.connectedComponentsWithStats(
+                (image[:, :, 0] > 0).astype(np.uint8))
+            boxes = [[int(x), int(x + width), int(y), int(y + height)]
+                     for x, y, width, height, _ in stats[1:count]]
+            horizontal.append(sorted(boxes, reverse=True))
+        return horizontal, [[] for _ in images]
+
+    def recognize(self, grey, horizontal_list, free_list, batch_size=1, reformat=True,
+                  **kwargs):
+        results = []
+        for x_min, x_max, y_min, y_max in horizontal_list:
+            bbox = [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
+            results.append((bbox, f"{grey.shape[1]}x{grey.shape[0]} at {x_min},{y_min}", 0.9))
+        return results
+
+    def readtext(self, image, **kwargs):
+        from easyocr.utils import reformat_input
+
+        color, grey = reformat_input(image)
+        horizontal, free = self.detect(color[None], reformat=False)
+        return self.recognize(grey, horizontal[0], free[0])
+
+
+def make_image(height, width):
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    image[2:height - 2, 3:width - 3] = 200
+    return image
+
+
+def make_sign(height, width):
+    """Image with two lines of two words each."""
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    for y in (5, 40):
+        for x in (5, width // 2 + 5):
+            image[y:y + 20, x:x + width // 2 - 15] = 200
+    return image
+
+
+def test_bucket_shape_pads_to_step_but_not_past_canvas():
+    """Test that shapes round up to the bucket step except for huge images."""
+    assert bucket_shape((100, 130)) == (128, 192)
+    assert bucket_shape((3000, 4000)) == (3000, 4000)
+
+
+def test_choose_batch_size_fits_memory():
+    """Test that the batch size shrinks as images grow."""
+    assert choose_batch_size((64, 64), max_batch_size=8, available=10 ** 12) == 8
+    assert choose_batch_size((2000, 2000), max_batch_size=8, available=10 ** 9) == 1
+
+
+def test_readtext_many_matches_readtext():
+    """Test that batched results equal per-image readtext results, in order."""
+    reader = FakeReader()
+    images = [make_image(100, 130), make_image(900, 600), make_image(110, 150),
+              make_image(100, 130)]
+    expected = [FakeReader().readtext(image) for image in images]
+
+    results = readtext_many(reader, images, available=10 ** 12)
+    assert results == expected
+    # The three small images share one padded bucket and one detection call
+    assert sorted(reader.detect_batches) == [1, 3]
+
+
+def test_readtext_many_isolates_bad_images():
+    """Test that an undecodable image yields an exception only for itself."""
+    results = readtext_many(FakeReader(), [b"not an image", make_image(64, 64)])
+    assert isinstance(results[0], Exception)
+    assert results[1][0][1] == "64x64 at 3,2"
+
+
+def test_extract_text_from_images_matches_single_image_api():
+    """Test the multi-image API against extract_text_from_image."""
+    images = [make_image(80, 90), make_image(120, 70)]
+    with patch('main.easyocr.Reader', return_value=FakeReader()):
+        batched = extract_text_from_images(images, use_cache=False)
+        single = [extract_text_from_image(image, use_cache=False) for image in images]
+    assert batched == single
+    assert batched[0][0][1] == "90x80 at 3,2"
+
+
+def test_multi_region_results_match_single_image_api_in_either_cache_order():
+    """Test texts, boxes and reading order agree whichever path fills the cache."""
+    images = [make_sign(70, 120), make_sign(80, 160)]
+    expected_texts = [["120x70 at 5,5", "120x70 at 65,5", "120x70 at 5,40", "120x70 at 65,40"],
+                      ["160x80 at 5,5", "160x80 at 85,5", "160x80 at 5,40", "160x80 at 85,40"]]
+
+    with patch('main.easyocr.Reader', return_value=FakeReader()):
+        batched_cold = extract_text_from_images(images)
+        single_warm = [extract_text_from_image(image) for image in images]
+    set_ocr_cache(OcrCache())
+    with patch('main.easyocr.Reader', return_value=FakeReader()):
+        single_cold = [extract_text_from_image(image) for image in images]
+        batched_warm = extract_text_from_images(images)
+
+    assert [results.texts for results in batched_cold] == expected_texts
+    for results in (single_warm, single_cold, batched_warm):
+        assert results == batched_cold
+        assert [columns.boxes.tolist() for columns in results] == \
+            [columns.boxes.tolist() for columns in batched_cold]
+
+
+def test_batched_cache_keys_follow_quantization():
+    """Test that batched results from different quantize modes are cached apart."""
+    images = [make_image(80, 90)]
+    with patch('main.easyocr.Reader', return_value=FakeReader()):
+        configure_inference(InferenceConfig(quantize="off"))
+        extract_text_from_images(images)
+        configure_inference(InferenceConfig(quantize="recognizer"))
+        extract_text_from_images(images)
+
+    stats = get_ocr_cache().stats()
+    assert stats["misses"] == 2 and stats["hits"] == 0
@@ -0,0 +1,56 @@
+"""Smoke tests for the offline benchmark suite."""
+
+import sys
+from pathlib import Path
+
+# Add benchmarks and src directories to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+
+from reader_pool import ReaderRegistry
+from stub_reader import StubReader, stub_factory
+from suite import STAGES, compare, percentiles, run_suite
+
+
+def test_stub_reader_returns_one_region():
+    """Test that the stub reader mimics readtext output without any model."""
+    reader = StubReader(seconds_per_megapixel=0)
+    results = reader.readtext(np.zeros((100, 200), dtype=np.uint8))
+    assert results == [([[0, 0], [100, 0], [100, 10], [0, 10]], "SAMPLE TEXT", 0.9)]
+    assert reader.readtext(np.zeros((10, 10)), detail=0) == ["SAMPLE TEXT"]
+
+    registry = ReaderRegistry(factory=stub_factory)
+    assert isinstance(registry.get(["en"]), StubReader)
+
+
+def test_percentiles():
+    """Test percentile summary of latencies."""
+    summary = percentiles([float(i) for i in range(1, 101)])
+    assert summary["p50"] == 51.0
+    assert summary["p99"] == 99.0
+    assert summary["count"] == 100
+
+
+def test_run_suite_with_stub_reader(tmp_path):
+    """Test that the suite runs offline and reports every stage."""
+    results = run_suite("stub", iterations=1, image_dirs=[str(tmp_path)],
+                        translation_latency=0)
+    assert results["images"] == 4  # synthetic images only
+    assert set(results["stages"]) == set(STAGES)
+    assert results["images_per_second"] > 0
+    assert results["cold_seconds"] >= results["model_load_seconds"]
+
+
+def test_compare_flags_regressions():
+    """Test that latency and throughput regressions beyond tolerance are reported."""
+    baseline = {"stages": {"ocr": {"p50": 0.1}}, "images_per_second": 10.0}
+    current = {"stages": {stage: {"p50": 0.1} for stage in STAGES},
+               "images_per_second": 10.0, "warm_seconds": None}
+    assert compare(current, baseline, tolerance=0.25) == []
+
+    current["stages"]["ocr"]["p50"] = 0.2
+    current["images_per_second"] = 5.0
+    regressions = compare(current, baseline, tolerance=0.25)
+    assert len(regressions) == 2
@@ -0,0 +1,75 @@
+"""Tests for the single-pass OCR correction engine."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+
+from corrections import CorrectionEngine, VocabularyIndex, correct_text, load_rules
+from main import extract_text_from_image
+
+
+def test_start_game_misreadings_are_fixed():
+    """Test that the bundled English dictionary fixes every START GAME misread."""
+    for misread in ["GTARTGAMB", "STARTG AME", "startgamb", "GTART GAME", "ST  ART GAME"]:
+        assert correct_text(f"Press {misread} now") == "Press START GAME now"
+
+
+def test_longest_rule_wins_in_one_pass():
+    """Test that overlapping literal rules prefer the longest match."""
+    engine = CorrectionEngine([("rn", "m"), ("rnenu", "menu"), ("0PTIONS", "OPTIONS")])
+
+    assert engine.correct("rnain rnenu 0ptions") == "main menu OPTIONS"
+
+
+def test_regex_rules_share_the_scan():
+    """Test that 're:' rules are applied alongside literal rules."""
+    engine = CorrectionEngine([("re:(\\d)O(\\d)", "\\g<1>0\\g<2>"), ("NlKE", "NIKE")])
+
+    assert engine.correct("NlKE 1O5") == "NIKE 105"
+
+
+def test_dictionary_file_format(tmp_path):
+    """Test loading rules from a file and rejecting malformed lines."""
+    path = tmp_path / "fr.tsv"
+    path.write_text("# comment\n\nJEU DE DEPART\tJEU DE DÉPART\n", encoding="utf-8")
+    assert load_rules(path) == [("JEU DE DEPART", "JEU DE DÉPART")]
+
+    path.write_text("missing tab\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_rules(path)
+
+
+def test_scales_to_many_rules():
+    """Test that tens of thousands of rules compile into one working pattern."""
+    rules = [(f"WORD{i:05d}X", f"fixed{i}") for i in range(20000)]
+    engine = CorrectionEngine(rules)
+
+    assert len(engine) == 20000
+    assert engine.correct("a WORD12345X b word00001x") == "a fixed12345 b fixed1"
+
+
+def test_vocabulary_fixes_unseen_misreads():
+    """Test edit-distance correction against a vocabulary, preserving case."""
+    vocabulary = VocabularyIndex(["start", "game", "chart", "size"])
+    engine = CorrectionEngine(vocabulary=vocabulary)
+
+    assert engine.correct("STARI GAMF Sise Chrat xyzzy") == "START GAME Size Chart xyzzy"
+
+
+def test_extract_applies_corrections():
+    """Test that extract_text_from_image corrects region texts on request."""
+    with patch('main.easyocr.Reader') as mock_reader:
+        mock_reader_instance = MagicMock()
+        mock_reader.return_value = mock_reader_instance
+        mock_reader_instance.readtext.return_value = [
+            ([[0, 0], [100, 0], [100, 20], [0, 20]], "GTARTGAMB", 0.9),
+        ]
+
+        results = extract_text_from_image("uploads/Panda.png", correct=True)
+
+        assert results[0][1] == "START GAME"
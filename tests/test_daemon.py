@@ -0,0 +1,102 @@
+"""Tests for the warm-model daemon and its CLI client."""
+
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+
+from daemon import DaemonClient, OcrDaemon, default_socket_path
+from main import main
+
+
+@pytest.fixture
+def running_daemon():
+    """Start a daemon on the test socket in a background thread."""
+    daemons = []
+
+    def start(**options):
+        daemon = OcrDaemon(default_socket_path(), **options)
+        daemon.bind()
+        thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+        daemons.append((daemon, thread))
+        return daemon, thread
+
+    yield start
+    for daemon, thread in daemons:
+        daemon.stop()
+        thread.join(timeout=5)
+
+
+def test_client_returns_none_without_daemon(tmp_path):
+    """Test that the client reports no daemon instead of failing."""
+    client = DaemonClient(tmp_path / "missing.sock")
+    assert not client.ping()
+    assert client.extract(tmp_path / "image.png") is None
+
+
+def test_cli_forwards_to_running_daemon(running_daemon, tmp_path, capsys):
+    """Test that main forwards a single image to the daemon and prints its results."""
+    image = tmp_path / "image.png"
+    image.write_bytes(b"fake image")
+    daemon, _ = running_daemon(idle_timeout=None, memory_cap_mb=None)
+
+    with patch('main.easyocr.Reader') as mock_reader, \
+         patch('main.GoogleTranslator') as mock_translator:
+        mock_reader.return_value.readtext.return_value = [
+            ([[0, 0], [10, 0], [10, 5], [0, 5]], "START GAME", 0.95)
+        ]
+        mock_translator.return_value.translate.return_value = "INICIAR JUEGO"
+        main([str(image), "es"])
+        assert daemon.requests == 1
+
+        # A second invocation reuses the warm reader
+        main([str(image)])
+        assert mock_reader.call_count == 1
+    output = capsys.readouterr().out
+    assert "Extracted Text: START GAME" in output
+    assert "Translated (es): INICIAR JUEGO" in output
+
+
+def test_no_daemon_flag_runs_in_process(running_daemon, tmp_path):
+    """Test that --no-daemon bypasses a running daemon."""
+    image = tmp_path / "image.png"
+    image.write_bytes(b"fake image")
+    daemon, _ = running_daemon(idle_timeout=None, memory_cap_mb=None)
+    with patch('main.easyocr.Reader') as mock_reader:
+        mock_reader.return_value.readtext.return_value = []
+        main([str(image), "--no-daemon"])
+    assert daemon.requests == 0
+
+
+def test_idle_timeout_stops_daemon(running_daemon):
+    """Test that an idle daemon exits and removes its socket."""
+    daemon, thread = running_daemon(idle_timeout=0.2, memory_cap_mb=None)
+    thread.join(timeout=5)
+    assert daemon.stop_reason == "idle timeout"
+    assert not default_socket_path().exists()
+
+
+def test_memory_cap_drops_readers_then_stops(running_daemon, tmp_path):
+    """Test that exceeding the memory cap stops the daemon."""
+    image = tmp_path / "image.png"
+    image.write_bytes(b"fake image")
+    daemon, thread = running_daemon(idle_timeout=None, memory_cap_mb=1)
+    with patch('main.easyocr.Reader') as mock_reader:
+        mock_reader.return_value.readtext.return_value = []
+        assert DaemonClient().extract(image) == ([], None)
+    thread.join(timeout=5)
+    assert daemon.reader_drops == 1
+    assert daemon.stop_reason.startswith("memory cap exceeded")
+
+
+def test_refuses_to_start_twice(running_daemon):
+    """Test that a second daemon does not steal a live socket."""
+    running_daemon(idle_timeout=None, memory_cap_mb=None)
+    with pytest.raises(RuntimeError):
+        OcrDaemon(default_socket_path()).bind()
@@ -0,0 +1,110 @@
+"""Tests for CPU inference settings: quantization, threads and inference mode."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+import torch
+
+from inference import (
+    InferenceConfig, InferenceReader, apply_threads, configure_inference, quantize_module,
+)
+from reader_pool import get_reader
+
+
+class FakeNetworkReader:
+    """Reader with a small recurrent recognizer and a convolutional detector."""
+
+    def __init__(self, languages, **options):
+        self.options = options
+        self.device = "cpu"
+        self.recognizer = torch.nn.Sequential(torch.nn.Linear(8, 8), torch.nn.ReLU())
+        self.detector = torch.nn.Sequential(torch.nn.Conv2d(3, 4, 3), torch.nn.Linear(4, 2))
+
+    def readtext(self, image, **kwargs):
+        return [([[0, 0], [1, 0], [1, 1], [0, 1]], str(torch.is_inference_mode_enabled()), 0.9)]
+
+
+def test_quantize_module_converts_linear_and_lstm():
+    """Test that Linear and LSTM layers become dynamic int8 modules."""
+    network = torch.nn.Sequential(torch.nn.Linear(4, 4))
+    recurrent = torch.nn.Sequential(torch.nn.LSTM(4, 4))
+
+    assert "quantized" in type(quantize_module(network)[0]).__module__
+    assert "quantized" in type(quantize_module(recurrent)[0]).__module__
+    assert quantize_module(network)(torch.ones(1, 4)).shape == (1, 4)
+
+
+def test_invalid_quantization_mode():
+    """Test that unknown modes are rejected."""
+    with pytest.raises(ValueError):
+        InferenceConfig(quantize="int4")
+
+
+def test_inference_reader_enables_inference_mode():
+    """Test that wrapped reader calls run under torch.inference_mode."""
+    reader = InferenceReader(FakeNetworkReader(["en"]))
+
+    assert reader.readtext(None)[0][1] == "True"
+    assert reader.device == "cpu"
+    assert not torch.is_inference_mode_enabled()
+
+
+@pytest.mark.parametrize("quantize, recognizer_quantized, detector_quantized", [
+    ("off", False, False),
+    ("recognizer", True, False),
+    ("all", True, True),
+])
+def test_configure_inference_quantizes_selected_networks(quantize, recognizer_quantized,
+                                                         detector_quantized):
+    """Test that pool readers are loaded unquantized and quantized per the config."""
+    with patch('main.easyocr.Reader', side_effect=FakeNetworkReader) as reader_class:
+        configure_inference(InferenceConfig(quantize=quantize))
+        reader = get_reader(["en"])
+
+    assert reader_class.call_args.kwargs["quantize"] is False
+    assert ("quantized" in type(reader.recognizer[0]).__module__) == recognizer_quantized
+    assert ("quantized" in type(reader.detector[1]).__module__) == detector_quantized
+    assert reader.readtext(None)[0][1] == "True"
+
+
+def test_changing_config_reloads_readers():
+    """Test that readers loaded under other settings are not reused."""
+    with patch('main.easyocr.Reader', side_effect=FakeNetworkReader):
+        configure_inference(InferenceConfig(quantize="off", inference_mode=False))
+        first = get_reader(["en"])
+        configure_inference(InferenceConfig(quantize="off", inference_mode=False))
+        assert get_reader(["en"]) is first
+        configure_inference(None)
+        assert get_reader(["en"]) is not first
+
+
+def test_apply_threads_sets_intra_op_threads():
+    """Test that the intra-op thread count is applied and reported."""
+    previous = torch.get_num_threads()
+    try:
+        threads = apply_threads(InferenceConfig(intra_op_threads=1))
+        assert threads["intra_op_threads"] == torch.get_num_threads() == 1
+    finally:
+        torch.set_num_threads(previous)
+
+
+def test_cache_is_keyed_by_quantization(tmp_path):
+    """Test that results read at another precision are not served from the cache."""
+    from main import extract_text_from_image
+
+    image = tmp_path / "sign.png"
+    image.write_bytes(b"same image bytes")
+    with patch('main.easyocr.Reader', side_effect=FakeNetworkReader) as reader_class:
+        configure_inference(InferenceConfig(quantize="off"))
+        extract_text_from_image(str(image))
+        extract_text_from_image(str(image))
+        assert reader_class.call_count == 1
+
+        configure_inference(InferenceConfig(quantize="recognizer"))
+        extract_text_from_image(str(image))
+        assert reader_class.call_count == 2
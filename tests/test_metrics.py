@@ -0,0 +1,131 @@
+"""Tests for per-stage instrumentation and metrics export."""
+
+import json
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+
+from main import extract_text_from_image, main
+from metrics import MetricsRegistry, SnapshotWriter, set_metrics
+
+
+@pytest.fixture
+def registry():
+    """Install a fresh process-wide metrics registry."""
+    registry = MetricsRegistry()
+    set_metrics(registry)
+    yield registry
+    set_metrics(None)
+
+
+def test_timer_records_duration_even_on_error():
+    """Test that timers observe durations and failures are counted."""
+    metrics = MetricsRegistry()
+    with metrics.timer("decode"):
+        pass
+    with pytest.raises(ValueError):
+        with metrics.timer("decode"):
+            raise ValueError("bad image")
+    metrics.record_failure("decode", ValueError())
+
+    assert metrics.histogram("stage_seconds", stage="decode")["count"] == 2
+    assert metrics.counter_value("failures_total", stage="decode", error="ValueError") == 1
+
+
+def test_profiler_hooks_wrap_each_stage():
+    """Test that registered hooks are entered around timed stages."""
+    metrics = MetricsRegistry()
+    entered = []
+
+    @contextmanager
+    def hook(stage):
+        entered.append(stage)
+        yield
+
+    metrics.add_hook(hook)
+    with metrics.timer("recognition"):
+        pass
+    metrics.remove_hook(hook)
+    with metrics.timer("translation"):
+        pass
+    assert entered == ["recognition"]
+
+
+def test_prometheus_export():
+    """Test the Prometheus text exposition format."""
+    metrics = MetricsRegistry(buckets=(0.1, 1.0))
+    metrics.increment("cache_requests_total", cache="ocr", result="hit")
+    metrics.observe("stage_seconds", 0.5, stage="recognition")
+    text = metrics.to_prometheus()
+
+    assert "# TYPE img2txt_cache_requests_total counter" in text
+    assert 'img2txt_cache_requests_total{cache="ocr",result="hit"} 1' in text
+    assert "# TYPE img2txt_stage_seconds histogram" in text
+    assert 'img2txt_stage_seconds_bucket{stage="recognition",le="0.1"} 0' in text
+    assert 'img2txt_stage_seconds_bucket{stage="recognition",le="1.0"} 1' in text
+    assert 'img2txt_stage_seconds_bucket{stage="recognition",le="+Inf"} 1' in text
+    assert 'img2txt_stage_seconds_count{stage="recognition"} 1' in text
+
+
+def test_snapshot_writer_appends_json_lines(tmp_path):
+    """Test that snapshots are written as JSON lines."""
+    metrics = MetricsRegistry()
+    metrics.increment("images_total")
+    path = tmp_path / "metrics.jsonl"
+    writer = SnapshotWriter(path, interval=3600, registry=metrics).start()
+    writer.stop()
+
+    snapshot = json.loads(path.read_text().splitlines()[-1])
+    assert snapshot["counters"] == [{"name": "images_total", "labels": {}, "value": 1}]
+
+
+def test_extract_text_records_stages(registry):
+    """Test that OCR records model load, recognition, cache lookups and failures."""
+    with patch('main.easyocr.Reader') as mock_reader:
+        mock_reader.return_value.readtext.return_value = [([[0, 0], [10, 0], [10, 5], [0, 5]], "START", 0.9)]
+        image = b"not really an image"
+        extract_text_from_image(image)
+        extract_text_from_image(image)
+
+        mock_reader.return_value.readtext.side_effect = RuntimeError("boom")
+        assert extract_text_from_image(b"other bytes") == []
+
+    assert registry.histogram("stage_seconds", stage="model_load")["count"] == 1
+    assert registry.histogram("stage_seconds", stage="recognition")["count"] == 2
+    assert registry.counter_value("cache_requests_total", cache="ocr", result="hit") == 1
+    assert registry.counter_value("failures_total", stage="ocr", error="RuntimeError") == 1
+
+
+def test_cli_writes_metrics_on_exit(registry, tmp_path):
+    """Test that --metrics exports a JSON snapshot after the run."""
+    image = tmp_path / "image.png"
+    image.write_bytes(b"fake")
+    output = tmp_path / "metrics.json"
+    with patch('main.easyocr.Reader') as mock_reader:
+        mock_reader.return_value.readtext.return_value = []
+        main([str(image), "--metrics", str(output)])
+
+    snapshot = json.loads(output.read_text())
+    stages = {h["labels"].get("stage") for h in snapshot["histograms"]}
+    assert {"model_load", "recognition"} <= stages
+
+
+def test_drain_and_merge_move_metrics_between_registries():
+    """Test that drained counters and histograms add up in another registry."""
+    worker, parent = MetricsRegistry(buckets=(0.1, 1.0)), MetricsRegistry(buckets=(0.1, 1.0))
+    parent.observe("stage_seconds", 0.05, stage="decode")
+    worker.observe("stage_seconds", 0.5, stage="decode")
+    worker.increment("images_total", 2)
+
+    parent.merge(worker.drain())
+
+    assert parent.histogram("stage_seconds", stage="decode")["count"] == 2
+    assert parent.counter_value("images_total") == 2
+    assert worker.counter_value("images_total") == 0
+    assert "le=\"1.0\"} 2" in parent.to_prometheus()
@@ -0,0 +1,69 @@
+"""Tests for the content-addressed OCR result cache."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+
+from main import extract_text_from_image
+from ocr_cache import OcrCache, hash_image, image_cache_key
+
+RESULTS = [
+    ([[0, 0], [150, 0], [150, 30], [0, 30]], "McDonald's", 0.96),
+    ([[150, 0], [250, 0], [250, 30], [150, 30]], "I'm", 0.92),
+]
+
+
+def test_hash_is_content_based(tmp_path):
+    """Test that equal bytes hash equally whether given as a path or bytes."""
+    data = Path("uploads/McD.jfif").read_bytes()
+    copy = tmp_path / "copy.jfif"
+    copy.write_bytes(data)
+
+    assert hash_image("uploads/McD.jfif") == hash_image(str(copy)) == hash_image(data)
+    assert hash_image(np.zeros((4, 4), dtype=np.uint8)) != hash_image(np.zeros((4, 4, 1), dtype=np.uint8))
+
+
+def test_settings_are_part_of_the_key():
+    """Test that languages, threshold and preprocessing change the key."""
+    base = image_cache_key(b"image", ['en'], 0.5)
+
+    assert base == image_cache_key(b"image", ['en', 'en'], 0.5)
+    assert base != image_cache_key(b"image", ['en', 'hi'], 0.5)
+    assert base != image_cache_key(b"image", ['en'], 0.7)
+    assert base != image_cache_key(b"image", ['en'], 0.5, {"preprocessing": True})
+    assert image_cache_key("uploads/missing.png", ['en'], 0.5) is None
+
+
+def test_round_trip_and_size_eviction(tmp_path):
+    """Test that results survive a reopen and old entries are evicted by size."""
+    cache = OcrCache(tmp_path / "ocr.sqlite3", max_bytes=400)
+    cache.set("first", RESULTS)
+    cache.close()
+
+    cache = OcrCache(tmp_path / "ocr.sqlite3", max_bytes=400)
+    assert cache.get("first") == RESULTS
+    for index in range(10):
+        cache.set(f"other{index}", RESULTS)
+
+    assert cache.stats()["bytes"] <= 400
+    assert cache.get("first") is None
+    assert cache.get("other9") == RESULTS
+
+
+def test_repeated_image_skips_recognition():
+    """Test that extracting the same image twice runs readtext once."""
+    with patch('main.easyocr.Reader') as mock_reader:
+        mock_reader_instance = MagicMock()
+        mock_reader.return_value = mock_reader_instance
+        mock_reader_instance.readtext.return_value = RESULTS
+
+        first = extract_text_from_image("uploads/McD.jfif")
+        second = extract_text_from_image("uploads/McD.jfif")
+
+        assert first == second == RESULTS
+        assert mock_reader_instance.readtext.call_count == 1
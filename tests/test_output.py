@@ -0,0 +1,104 @@
+"""Tests for streaming JSONL output."""
+
+import io
+import json
+import time
+import sys
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+
+from main import main
+from output import JsonlWriter
+
+RESULTS = [
+    ([[0, 0], [100, 0], [100, 20], [0, 20]], "NIKE", 0.98),
+    ([np.array([100, 0]), np.array([200, 0]), np.array([200, 20]), np.array([100, 20])],
+     "Just", np.float64(0.95)),
+]
+
+
+def test_one_line_per_image_with_bboxes_and_timings():
+    """Test that an image record keeps bboxes, confidences and timings."""
+    stream = io.StringIO()
+    writer = JsonlWriter(stream)
+    writer.write("uploads/Nike.jfif", RESULTS, "es", "NIKE Solo", {"ocr": 0.25})
+    writer.write("uploads/Panda.png", [])
+    writer.close()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert len(lines) == 2
+    assert lines[0]["image"] == "uploads/Nike.jfif"
+    assert lines[0]["regions"][1]["bbox"] == [[100.0, 0.0], [200.0, 0.0], [200.0, 20.0], [100.0, 20.0]]
+    assert lines[0]["regions"][1]["confidence"] == 0.95
+    assert lines[0]["text"] == "NIKE Just"
+    assert lines[0]["translation"] == "NIKE Solo"
+    assert lines[0]["timings"] == {"ocr": 0.25}
+    assert lines[1]["regions"] == []
+
+
+def test_one_line_per_region():
+    """Test that per-region mode emits a line for every text region."""
+    stream = io.StringIO()
+    writer = JsonlWriter(stream, per_region=True)
+    writer.write("uploads/Nike.jfif", RESULTS)
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(line["region"], line["text"]) for line in lines] == [(0, "NIKE"), (1, "Just")]
+
+
+def test_cli_streams_jsonl_to_file(tmp_path):
+    """Test that batch mode writes one JSON line per image to the output file."""
+    with patch('main.easyocr.Reader') as mock_reader:
+        mock_reader_instance = MagicMock()
+        mock_reader.return_value = mock_reader_instance
+        mock_reader_instance.readtext.return_value = RESULTS[:1]
+
+        output_path = tmp_path / "results.jsonl"
+        main(["--batch", "uploads/Nike.jfif", "uploads/McD.jfif", "--workers", "1",
+              "--format", "jsonl", "-o", str(output_path)])
+
+        lines = [json.loads(line) for line in output_path.read_text(encoding="utf-8").splitlines()]
+        assert [line["image"] for line in lines] == ["uploads/Nike.jfif", "uploads/McD.jfif"]
+        assert all("ocr" in line["timings"] for line in lines)
+
+
+def test_batch_emits_each_image_as_it_finishes_without_translation(tmp_path):
+    """Test that untranslated batch results are not held back for a window."""
+    written = []
+
+    def batch(image_paths, **kwargs):
+        for image_path in image_paths:
+            # Every earlier image must already be written when the next one finishes
+            assert len(written) == image_paths.index(image_path)
+            yield image_path, RESULTS[:1], {"ocr": 0.1}
+
+    with patch('main.run_batch', side_effect=batch), \
+            patch('main.JsonlWriter.write', side_effect=lambda path, *args: written.append(path)):
+        main(["--batch", "uploads/Nike.jfif", "uploads/McD.jfif", "--format", "jsonl",
+              "-o", str(tmp_path / "results.jsonl")])
+
+    assert written == ["uploads/Nike.jfif", "uploads/McD.jfif"]
+
+
+def test_batch_translation_time_is_shared_per_image(tmp_path):
+    """Test that each image in a translated window gets its share of the time."""
+    batch = [(path, RESULTS[:1], {"ocr": 0.1}) for path in ["a.png", "b.png"]]
+    output_path = tmp_path / "results.jsonl"
+
+    def translate(texts, language):
+        time.sleep(0.2)
+        return [f"{language}:{text}" for text in texts]
+
+    with patch('main.run_batch', return_value=iter(batch)), \
+            patch('main.collect_images', return_value=["a.png", "b.png"]), \
+            patch('main.translate_texts', side_effect=translate):
+        main(["--batch", "a.png", "b.png", "-t", "es", "--format", "jsonl",
+              "-o", str(output_path)])
+
+    lines = [json.loads(line) for line in output_path.read_text(encoding="utf-8").splitlines()]
+    assert all(0.1 <= line["timings"]["translate"] < 0.2 for line in lines)
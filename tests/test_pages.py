@@ -0,0 +1,111 @@
+"""Tests for lazy multi-page input."""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import pages
+from main import main
+from pages import count_pages, is_multipage, iter_pages, load_page, read_pages
+
+
+class LevelReader:
+    """Fake reader naming each page by its gray level."""
+
+    def readtext(self, image, **kwargs):
+        level = int(image[0, 0, 0])
+        # Later pages finish first, so order must come from read_pages
+        time.sleep(0.05 * (5 - level // 40))
+        return [([[0, 0], [10, 0], [10, 10], [0, 10]], f"page{level // 40}", 0.9)]
+
+
+def make_document(path, count=4):
+    frames = [Image.new("RGB", (60, 40), (40 * number,) * 3) for number in range(1, count + 1)]
+    frames[0].save(path, save_all=True, append_images=frames[1:])
+    return path
+
+
+def test_pages_are_counted_and_decoded_lazily(tmp_path):
+    """Test page counting, single-page loads and BGR output."""
+    document = make_document(tmp_path / "scan.tif")
+
+    assert count_pages(document) == 4
+    assert is_multipage(document)
+    assert is_multipage(document.read_bytes())
+    assert load_page(document, 3)[0, 0].tolist() == [120, 120, 120]
+    assert [number for number, _ in iter_pages(document, pages=[2, 4])] == [2, 4]
+
+
+def test_single_images_are_not_multipage(tmp_path):
+    """Test that still images keep the regular single-image path."""
+    single = make_document(tmp_path / "single.tif", count=1)
+    assert not is_multipage(single)
+    assert not is_multipage(tmp_path / "photo.jpg")
+
+
+def test_large_files_are_memory_mapped(tmp_path, monkeypatch):
+    """Test that sources over the size limit are read through mmap."""
+    document = make_document(tmp_path / "scan.tif")
+    monkeypatch.setattr(pages, "MMAP_MIN_BYTES", 1)
+    with pages.open_source(document) as stream:
+        assert type(stream).__name__ == "mmap"
+    assert len(list(iter_pages(document))) == 4
+
+
+def test_parallel_pages_stream_in_order_with_bounded_memory(tmp_path):
+    """Test that parallel pages keep page order and few pages in flight."""
+    document = make_document(tmp_path / "scan.tif")
+    decoded = []
+    live = []
+    lock = threading.Lock()
+    original = pages._frame_to_array
+
+    def tracked(image):
+        with lock:
+            decoded.append(1)
+            live.append(len(decoded) - len(done))
+        return original(image)
+
+    done = []
+    reader = LevelReader()
+    with patch("pages._frame_to_array", side_effect=tracked), \
+            patch("main.get_reader", return_value=reader):
+        results = []
+        for number, page_results in read_pages(document, workers=2, use_cache=False):
+            done.append(number)
+            results.append((number, page_results[0][1]))
+
+    assert results == [(1, "page1"), (2, "page2"), (3, "page3"), (4, "page4")]
+    assert max(live) <= 3
+
+
+def test_cli_emits_one_record_per_page(tmp_path):
+    """Test that the CLI reads a multi-page file page by page."""
+    document = make_document(tmp_path / "scan.tif")
+    output = tmp_path / "pages.jsonl"
+    with patch("main.get_reader", return_value=LevelReader()):
+        main([str(document), "--format", "jsonl", "-o", str(output), "--page-workers", "2"])
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [record["image"] for record in records] == [f"{document}#page={n}" for n in range(1, 5)]
+    assert records[2]["regions"][0]["text"] == "page3"
+
+
+def test_pdf_without_renderer_reports_missing_dependency(tmp_path):
+    """Test that PDFs are paged input and need pypdfium2 to render."""
+    document = tmp_path / "scan.pdf"
+    document.write_bytes(b"%PDF-1.4\n%%EOF\n")
+    assert is_multipage(document)
+    with patch.dict(sys.modules, {"pypdfium2": None}):
+        with pytest.raises(ImportError, match="pypdfium2"):
+            count_pages(document)
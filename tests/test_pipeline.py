@@ -0,0 +1,107 @@
+"""Tests for the pipelined OCR -> translation runner."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from pipeline import Pipeline, run_pipeline
+from translation_cache import TranslationCache
+from translation_engine import LocalBackend, TranslationEngine, set_translation_engine
+
+
+def _slow_readtext(image, **kwargs):
+    time.sleep(0.05)
+    return [([[0, 0], [100, 0], [100, 20], [0, 20]], Path(image).stem, 0.95)]
+
+
+def test_pipeline_translates_in_input_order():
+    """Test that every image is recognized, translated and yielded in order."""
+    set_translation_engine(TranslationEngine(LocalBackend(), cache=TranslationCache()))
+    with patch('main.easyocr.Reader') as mock_reader:
+        mock_reader_instance = MagicMock()
+        mock_reader.return_value = mock_reader_instance
+        mock_reader_instance.readtext.side_effect = _slow_readtext
+
+        images = ["uploads/Nike.jfif", "uploads/McD.jfif", "uploads/5Star.jfif"]
+        items = list(run_pipeline(images, translate_to="es", decode=lambda path: path))
+
+        assert [item.image_path for item in items] == images
+        assert [item.translation for item in items] == ["[es] Nike", "[es] McD", "[es] 5Star"]
+        assert all({"decode", "ocr", "translate"} <= set(item.timings) for item in items)
+
+
+def test_ocr_overlaps_translation():
+    """Test that OCR of later images runs while earlier ones are translated."""
+    set_translation_engine(TranslationEngine(LocalBackend(latency=0.05),
+                                             cache=TranslationCache()))
+    with patch('main.easyocr.Reader') as mock_reader:
+        mock_reader_instance = MagicMock()
+        mock_reader.return_value = mock_reader_instance
+        mock_reader_instance.readtext.side_effect = _slow_readtext
+
+        images = [f"image{i}.png" for i in range(8)]
+        start = time.perf_counter()
+        items = list(Pipeline(translate_to="fr", ocr_workers=1,
+                              decode=lambda path: path).run(images))
+        elapsed = time.perf_counter() - start
+
+        assert len(items) == 8
+        # Sequential execution would take 8 * (0.05 + 0.05) seconds
+        assert elapsed < 8 * 0.1 * 0.8
+
+
+class GatedBackend(LocalBackend):
+    """Local backend that holds every translation until the gate opens."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+
+    def translate_batch(self, texts, target_language, source_language="auto"):
+        self.gate.wait(5)
+        return super().translate_batch(texts, target_language, source_language)
+
+
+def test_slow_translation_blocks_ocr():
+    """Test that recognized images wait in the bounded queue, not in pending tasks."""
+    backend = GatedBackend()
+    set_translation_engine(TranslationEngine(backend, cache=TranslationCache()))
+    with patch('main.easyocr.Reader') as mock_reader:
+        mock_reader_instance = MagicMock()
+        mock_reader.return_value = mock_reader_instance
+        mock_reader_instance.readtext.side_effect = _slow_readtext
+
+        pipeline = Pipeline(translate_to="fr", ocr_workers=1, max_translations=1,
+                            queue_size=1, decode=lambda path: path)
+        items = []
+        consumer = threading.Thread(
+            target=lambda: items.extend(pipeline.run([f"image{i}.png" for i in range(12)]))
+        )
+        consumer.start()
+        time.sleep(0.6)
+        # One translation in flight, one item queued and one held by the OCR worker
+        recognized_while_blocked = mock_reader_instance.readtext.call_count
+        backend.gate.set()
+        consumer.join(10)
+
+        assert recognized_while_blocked <= 3
+        assert [item.translation for item in items] == [f"[fr] image{i}" for i in range(12)]
+
+
+def test_decode_errors_are_reported_per_image():
+    """Test that an unreadable image does not stop the pipeline."""
+    with patch('main.easyocr.Reader') as mock_reader:
+        mock_reader_instance = MagicMock()
+        mock_reader.return_value = mock_reader_instance
+        mock_reader_instance.readtext.side_effect = _slow_readtext
+
+        items = list(run_pipeline(["missing.png"]))
+
+        assert items[0].results == []
+        assert items[0].error
+        mock_reader_instance.readtext.assert_not_called()
@@ -0,0 +1,101 @@
+"""Tests for the text-presence prefilter."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import cv2
+import numpy as np
+import pytest
+
+from main import extract_text_from_image
+from metrics import get_metrics
+from prefilter import TextPrefilter, count_text_candidates
+
+
+class RegionReader:
+    """Fake reader whose detection pass returns the given thumbnail boxes."""
+
+    def __init__(self, boxes):
+        self.boxes = boxes
+        self.detect_shapes = []
+        self.recognized = []
+
+    def detect(self, image, **kwargs):
+        self.detect_shapes.append(image.shape[:2])
+        return [self.boxes], [[]]
+
+    def recognize(self, grey, horizontal_list, free_list, **kwargs):
+        self.recognized.append((grey.shape, horizontal_list, free_list))
+        return [([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], "WORD", 0.9)
+                for x0, x1, y0, y1 in horizontal_list]
+
+
+def blank_image():
+    return np.full((600, 800, 3), 255, dtype=np.uint8)
+
+
+def text_image():
+    image = blank_image()
+    cv2.putText(image, "HELLO WORLD", (50, 300), cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 0), 4)
+    return image
+
+
+def test_edge_heuristic_separates_text_from_empty_images():
+    """Test that blank, noisy and smooth images have no candidates but text does."""
+    noise = (np.random.RandomState(0).rand(600, 800) * 30 + 100).astype(np.uint8)
+    gradient = np.tile(np.linspace(0, 255, 800).astype(np.uint8), (600, 1))
+    assert count_text_candidates(blank_image()) == 0
+    assert count_text_candidates(noise) == 0
+    assert count_text_candidates(gradient) == 0
+    assert count_text_candidates(text_image()) > 0
+
+
+def test_detect_mode_skips_images_without_regions():
+    """Test that an empty detection pass skips recognition and is counted."""
+    reader = RegionReader([])
+    prefilter = TextPrefilter("detect", thumbnail_side=400)
+    assert prefilter.read(reader, blank_image()) == []
+    assert reader.recognized == []
+    # Detection ran on the thumbnail, not the full image
+    assert max(reader.detect_shapes[0]) == 400
+    assert prefilter.stats()["images_skipped"] == 1
+    assert get_metrics().counter_value(
+        "prefilter_images_total", mode="detect", result="skipped") == 1
+
+
+def test_detect_mode_recognizes_only_scaled_regions():
+    """Test that thumbnail boxes are scaled back up and recognized directly."""
+    reader = RegionReader([[10, 110, 50, 70]])
+    prefilter = TextPrefilter("detect", thumbnail_side=400)
+    results = prefilter.read(reader, blank_image())
+
+    grey_shape, horizontal, free = reader.recognized[0]
+    assert grey_shape == (600, 800)
+    # Scale 0.5 plus a margin of 15% of the box height on every side
+    assert horizontal == [[14, 226, 94, 146]]
+    assert free == []
+    assert [text for _, text, _ in results] == ["WORD"]
+    assert prefilter.stats()["regions_found"] == 1
+    assert prefilter.read(reader, blank_image(), recognize_regions=False) is None
+
+
+def test_unknown_mode_is_rejected():
+    """Test that a typo in the mode fails loudly."""
+    with pytest.raises(ValueError):
+        TextPrefilter("mser")
+
+
+def test_extract_skips_recognition_for_text_free_image(tmp_path):
+    """Test that the edges prefilter short-circuits extract_text_from_image."""
+    image = tmp_path / "blank.png"
+    cv2.imwrite(str(image), blank_image())
+    with patch('main.easyocr.Reader') as mock_reader:
+        results = extract_text_from_image(str(image), prefilter="edges")
+    assert results == []
+    mock_reader.return_value.readtext.assert_not_called()
+    assert get_metrics().counter_value(
+        "prefilter_images_total", mode="edges", result="skipped") == 1
@@ -0,0 +1,124 @@
+"""Tests for the declarative grayscale preprocessing pipeline."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pytest
+
+from main import extract_text_from_image
+import cv2
+
+from preprocessing import PreprocessPipeline, deskew_matrix, parse_spec
+
+
+def test_parse_spec():
+    """Test that specs parse into ordered steps with parameters."""
+    assert parse_spec("resize:max_side=800, denoise,threshold:block_size=15:c=3") == [
+        ("resize", {"max_side": "800"}),
+        ("denoise", {}),
+        ("threshold", {"block_size": "15", "c": "3"}),
+    ]
+    with pytest.raises(ValueError):
+        parse_spec("sharpen")
+
+
+def test_decode_straight_to_grayscale_with_in_place_steps():
+    """Test that in-place steps add no allocations beyond the decode."""
+    pipeline = PreprocessPipeline("denoise,threshold")
+    data = Path("uploads/Nike.jfif").read_bytes()
+
+    image, to_source = pipeline.process(data)
+
+    assert image.ndim == 2 and image.dtype == np.uint8
+    assert set(np.unique(image)) <= {0, 255}
+    assert np.allclose(to_source, [[1, 0, 0], [0, 1, 0]])
+    assert pipeline.stats()["allocations_per_image"] == 1
+
+
+def test_decoded_array_is_copied_unless_in_place():
+    """Test that run leaves the caller's grayscale array alone by default."""
+    pipeline = PreprocessPipeline("denoise,threshold")
+    image = cv2.imread("uploads/Nike.jfif", cv2.IMREAD_GRAYSCALE)
+    original = image.copy()
+
+    result = pipeline.run(image)
+    assert np.array_equal(image, original)
+    assert result is not image
+
+    assert pipeline.run(image, inplace=True) is image
+    assert not np.array_equal(image, original)
+
+
+def test_resize_reports_scale():
+    """Test that a resize step allocates one buffer and reports the scale."""
+    pipeline = PreprocessPipeline("resize:max_side=100")
+
+    image, to_source = pipeline.process("uploads/IndiaSizes.jfif")
+
+    assert max(image.shape) == 100
+    assert to_source[0][0] > 1.0 and to_source[1][1] > 1.0
+    assert pipeline.stats()["allocations_per_image"] == 2
+
+
+def test_extract_maps_bboxes_back_after_resize():
+    """Test that bboxes are returned in original coordinates after a resize."""
+    with patch('main.easyocr.Reader') as mock_reader:
+        mock_reader_instance = MagicMock()
+        mock_reader.return_value = mock_reader_instance
+        mock_reader_instance.readtext.return_value = [
+            ([[0, 0], [50, 0], [50, 10], [0, 10]], "India", 0.95),
+        ]
+
+        results = extract_text_from_image("uploads/IndiaSizes.jfif",
+                                          preprocess="resize:scale=0.5,threshold")
+
+        ocr_input = mock_reader_instance.readtext.call_args[0][0]
+        assert ocr_input.ndim == 2
+        assert results[0][0][2] == [100, 20]
+
+
+def skewed_page(angle=6.0):
+    """Grey (not binarized) page with dark text lines, rotated by ``angle`` degrees."""
+    page = np.full((300, 400), 200, dtype=np.uint8)
+    for y in (80, 140, 200):
+        cv2.putText(page, "SKEWED TEXT LINE", (30, y), cv2.FONT_HERSHEY_SIMPLEX, 1.0, 40, 2)
+    matrix = cv2.getRotationMatrix2D((200, 150), angle, 1.0)
+    return cv2.warpAffine(page, matrix, (400, 300), borderValue=200)
+
+
+def test_deskew_straightens_unthresholded_image():
+    """Test that deskew binarizes itself and levels a grey, skewed page."""
+    page = skewed_page()
+    matrix = deskew_matrix(page)
+    assert matrix is not None
+
+    image, _ = PreprocessPipeline("deskew").process(page.copy())
+    assert deskew_matrix(image) is None
+
+
+def test_extract_maps_bboxes_back_after_deskew():
+    """Test that a bar found on the deskewed image is reported where it is in the source."""
+    page = np.full((300, 400), 200, dtype=np.uint8)
+    cv2.rectangle(page, (60, 130), (340, 160), 40, -1)
+    rotation = cv2.getRotationMatrix2D((200, 150), 6.0, 1.0)
+    page = cv2.warpAffine(page, rotation, (400, 300), borderValue=200)
+    center = rotation @ [200, 145, 1]
+
+    def find_bar(image, **kwargs):
+        ys, xs = np.nonzero(image < 128)
+        x0, x1, y0, y1 = xs.min(), xs.max(), ys.min(), ys.max()
+        return [([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], "BAR", 0.9)]
+
+    with patch('main.easyocr.Reader') as mock_reader:
+        mock_reader.return_value.readtext.side_effect = find_bar
+        results = extract_text_from_image(page, preprocess="deskew", use_cache=False)
+
+    bbox = np.array(results[0][0], dtype=float)
+    # The level box maps back to a rotated quadrilateral around the source bar
+    assert np.allclose(bbox.mean(axis=0), center, atol=3)
+    assert abs(bbox[0][1] - bbox[1][1]) > 10
@@ -0,0 +1,131 @@
+"""Tests for the process-wide EasyOCR reader registry."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from reader_pool import ReaderRegistry, normalize_languages
+
+
+def _registry(**kwargs):
+    factory = MagicMock(side_effect=lambda languages, **options: MagicMock(name=str(languages)))
+    return ReaderRegistry(factory=factory, size_estimator=lambda reader: 100 * 1024 * 1024,
+                          **kwargs), factory
+
+
+def test_normalize_languages_is_order_independent():
+    """Test that equivalent language lists map to the same key."""
+    assert normalize_languages(['hi', 'en']) == normalize_languages(['EN', 'hi', 'en'])
+    assert normalize_languages('en') == ('en',)
+
+
+def test_reader_loaded_once_per_language_set():
+    """Test that repeated requests reuse the same reader."""
+    registry, factory = _registry()
+
+    first = registry.get(['en'])
+    second = registry.get(['en'])
+
+    assert first is second
+    assert factory.call_count == 1
+    assert registry.hits == 1 and registry.misses == 1
+
+
+def test_device_options_are_part_of_the_key():
+    """Test that a GPU and a CPU reader for the same languages are kept apart."""
+    registry, factory = _registry()
+
+    cpu = registry.get(['en'], gpu=False)
+    gpu = registry.get(['en'], gpu=True)
+
+    assert cpu is not gpu
+    assert factory.call_count == 2
+
+
+def test_lru_eviction_by_count():
+    """Test that the least recently used reader is evicted first."""
+    registry, factory = _registry(max_readers=2)
+
+    registry.get(['en'])
+    registry.get(['hi'])
+    registry.get(['en'])
+    registry.get(['ja'])
+
+    resident = [key[0] for key in registry.keys()]
+    assert resident == [('en',), ('ja',)]
+    assert registry.evictions == 1
+
+
+def test_eviction_by_memory_budget():
+    """Test that readers are evicted once the memory budget is exceeded."""
+    registry, factory = _registry(max_readers=10, memory_budget_mb=250)
+
+    registry.get(['en'])
+    registry.get(['hi'])
+    registry.get(['ja'])
+
+    assert len(registry) == 2
+    assert registry.memory_usage() <= 250 * 1024 * 1024
+
+
+def test_newest_reader_kept_even_if_over_budget():
+    """Test that a single reader larger than the budget is still returned and kept."""
+    registry, factory = _registry(memory_budget_mb=10)
+
+    reader = registry.get(['en'])
+
+    assert registry.get(['en']) is reader
+    assert len(registry) == 1
+
+
+def test_cached_lookups_do_not_wait_for_other_loads():
+    """Test that a hit for one language set is served while another set loads."""
+    loading, release = threading.Event(), threading.Event()
+
+    def factory(languages, **options):
+        if languages == ("hi",):
+            loading.set()
+            release.wait(5)
+        return MagicMock(name=str(languages))
+
+    registry = ReaderRegistry(factory=factory, size_estimator=lambda reader: 1)
+    english = registry.get(['en'])
+    loader = threading.Thread(target=registry.get, args=(['hi'],))
+    loader.start()
+    assert loading.wait(5)
+
+    start = time.perf_counter()
+    assert registry.get(['en']) is english
+    elapsed = time.perf_counter() - start
+    release.set()
+    loader.join(5)
+
+    assert elapsed < 1
+    assert ['hi'] in registry
+
+
+def test_concurrent_misses_load_a_reader_once():
+    """Test that callers racing for the same language set share one load."""
+    calls = []
+
+    def factory(languages, **options):
+        calls.append(languages)
+        time.sleep(0.1)
+        return MagicMock(name=str(languages))
+
+    registry = ReaderRegistry(factory=factory, size_estimator=lambda reader: 1)
+    readers = []
+    threads = [threading.Thread(target=lambda: readers.append(registry.get(['hi'])))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert len({id(reader) for reader in readers}) == 1
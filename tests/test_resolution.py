@@ -0,0 +1,56 @@
+"""Tests for adaptive downscaling before recognition."""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+
+from resolution import choose_scale, read_downscaled, scale_bbox
+
+
+def test_choose_scale_keeps_text_legible():
+    """Test that large text allows a downscale and small text does not."""
+    assert choose_scale((3000, 4000), text_height=120) == 0.2
+    assert choose_scale((3000, 4000), text_height=25) == 1.0
+    assert choose_scale((3000, 4000), text_height=None) == 1.0
+    # Never below the minimum longest side
+    assert choose_scale((3000, 4000), text_height=2000) == 480 / 4000
+
+
+def test_scale_bbox_maps_back_to_original():
+    """Test that bbox points are rescaled and rounded."""
+    assert scale_bbox([[10, 5], [20, 5], [20, 15], [10, 15]], 4.0) == \
+        [[40, 20], [80, 20], [80, 60], [40, 60]]
+
+
+def test_read_downscaled_returns_original_coordinates():
+    """Test that recognition runs on a smaller image and bboxes are mapped back."""
+    image = np.zeros((2000, 3000, 3), dtype=np.uint8)
+    reader = MagicMock()
+    # Thumbnail is 640 px wide (scale 640/3000); 40 px tall text in the thumbnail
+    reader.detect.return_value = ([[[10, 200, 10, 50]]], [[]])
+    reader.readtext.return_value = [([[10, 10], [100, 10], [100, 40], [10, 40]], "SALE", 0.9)]
+
+    results = read_downscaled(reader, image)
+
+    resized = reader.readtext.call_args[0][0]
+    assert resized.shape[1] < image.shape[1]
+    scale = resized.shape[1] / image.shape[1]
+    assert results[0][0][2] == [round(100 / scale), round(40 / scale)]
+    assert results[0][1:] == ("SALE", 0.9)
+
+
+def test_read_downscaled_keeps_small_text_at_full_size():
+    """Test that images with small text are passed through unchanged."""
+    image = np.zeros((600, 800, 3), dtype=np.uint8)
+    reader = MagicMock()
+    reader.detect.return_value = ([[[0, 50, 0, 12]]], [[]])
+    reader.readtext.return_value = []
+
+    read_downscaled(reader, image)
+
+    assert reader.readtext.call_args[0][0] is image
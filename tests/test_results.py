@@ -0,0 +1,141 @@
+"""Tests for the columnar OCR results container."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pytest
+
+from main import extract_text_from_image, format_results, join_text
+from results import OcrResults
+from tiling import box_bounds, reading_order
+
+
+def box(x, y, width=40, height=20):
+    return [[x, y], [x + width, y], [x + width, y + height], [x, y + height]]
+
+
+RESULTS = [
+    (box(200, 10), "WORLD", 0.9),
+    (box(10, 12), "HELLO", 0.95),
+    (box(10, 60), "नमस्ते", 0.4),
+    (box(120, 58), "", 0.7),
+    (box(300, 61), "café", 0.85),
+]
+
+
+def test_round_trip_keeps_tuples():
+    """Test that the container iterates as the original (bbox, text, confidence) tuples."""
+    columns = OcrResults.from_results(RESULTS)
+
+    assert list(columns) == RESULTS
+    assert len(columns) == 5
+    assert columns[2] == RESULTS[2]
+    assert columns[-1][1] == "café"
+    assert columns.boxes.dtype == np.float32 and columns.boxes.shape == (5, 4, 2)
+
+
+def test_filter_and_take_keep_texts_aligned():
+    """Test that vectorized selection moves boxes, texts and confidences together."""
+    columns = OcrResults.from_results(RESULTS)
+
+    assert list(columns.filter(0.8)) == [RESULTS[0], RESULTS[1], RESULTS[4]]
+    assert list(columns.take([4, 2, 3])) == [RESULTS[4], RESULTS[2], RESULTS[3]]
+    assert list(columns[columns.confidences < 0.8]) == [RESULTS[2], RESULTS[3]]
+    assert list(columns[1:3]) == RESULTS[1:3]
+
+
+def test_reading_order_matches_tiling():
+    """Test that the vectorized reading order agrees with the list implementation."""
+    columns = OcrResults.from_results(RESULTS).reading_order()
+    candidates = [{"bounds": box_bounds(bbox), "result": (bbox, text, conf)}
+                  for bbox, text, conf in RESULTS]
+
+    assert list(columns) == [candidate["result"] for candidate in reading_order(candidates)]
+
+
+@pytest.mark.parametrize("separator", [" ", "", " | "])
+def test_join_matches_str_join(separator):
+    """Test the vectorized join, including empty and multi-byte texts."""
+    columns = OcrResults.from_results(RESULTS)
+    assert columns.join(separator) == separator.join(text for _, text, _ in RESULTS)
+    assert OcrResults.from_results([]).join() == ""
+
+
+def test_concatenate_and_formatting():
+    """Test concatenation and that existing formatting accepts the container."""
+    columns = OcrResults.concatenate([RESULTS[:2], RESULTS[2:], []])
+
+    assert list(columns) == RESULTS
+    assert join_text(columns) == join_text(RESULTS)
+    assert format_results(columns) == format_results(RESULTS)
+
+
+def test_replacing_texts_and_mapping_boxes():
+    """Test text replacement and affine bbox mapping keep the other columns."""
+    columns = OcrResults.from_results(RESULTS)
+
+    upper = columns.with_texts([text.upper() for text in columns.texts])
+    assert upper.texts == [text.upper() for _, text, _ in RESULTS]
+    assert upper.confidences.tolist() == columns.confidences.tolist()
+
+    shifted = columns.map_boxes([[2, 0, 5], [0, 2, -1]])
+    assert shifted[1][0] == [[25, 23], [105, 23], [105, 63], [25, 63]]
+    assert shifted.texts == columns.texts
+
+
+def test_extract_returns_filtered_columns_in_reading_order():
+    """Test that extraction builds the container once and filters and orders it."""
+    with patch('main.easyocr.Reader') as mock_reader:
+        mock_reader.return_value.readtext.return_value = RESULTS
+        results = extract_text_from_image(b"fake image", confidence_threshold=0.5)
+        cached = extract_text_from_image(b"fake image", confidence_threshold=0.5)
+
+    assert isinstance(results, OcrResults) and isinstance(cached, OcrResults)
+    assert results.texts == ["HELLO", "WORLD", "", "café"]
+    assert results == cached
+
+
+def test_arrow_export_shares_buffers(tmp_path):
+    """Test zero-copy Arrow export and a Parquet round trip."""
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    columns = OcrResults.from_results(RESULTS)
+    table = columns.to_arrow()
+
+    assert table.column("text").to_pylist() == [text for _, text, _ in RESULTS]
+    assert table.column("confidence").chunk(0).buffers()[1].address == \
+        columns.confidences.ctypes.data
+
+    columns.write_parquet(tmp_path / "results.parquet")
+    assert pq.read_table(tmp_path / "results.parquet").column("bbox")[1].as_py() == \
+        [10, 12, 50, 12, 50, 32, 10, 32]
+
+
+def test_cli_writes_parquet(tmp_path):
+    """Test that --format parquet writes one row per region."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    from main import main
+
+    image = tmp_path / "sign.png"
+    image.write_bytes(b"not decoded by the mocked reader")
+    output = tmp_path / "results.parquet"
+    with patch("main.extract_text_from_image", return_value=RESULTS[:2]):
+        main([str(image), "--format", "parquet", "-o", str(output), "--no-daemon"])
+
+    table = pq.read_table(output)
+    assert table.column("text").to_pylist() == ["WORLD", "HELLO"]
+    assert table.column("image").to_pylist() == [str(image)] * 2
+
+
+def test_parquet_without_pyarrow_reports_missing_dependency(tmp_path):
+    """Test that Parquet output explains the optional dependency."""
+    from output import ParquetWriter
+
+    with patch.dict(sys.modules, {"pyarrow": None, "pyarrow.parquet": None}):
+        with pytest.raises(ImportError, match="pyarrow"):
+            ParquetWriter(tmp_path / "results.parquet")
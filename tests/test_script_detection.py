@@ -0,0 +1,180 @@
+"""Tests for script identification and per-script reader routing."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import cv2
+import numpy as np
+import pytest
+
+from main import extract_text_from_image, main as main_cli
+from script_detection import classify_script, parse_scripts, read_by_script
+
+
+def latin_word():
+    image = np.full((60, 320, 3), 255, dtype=np.uint8)
+    cv2.putText(image, "START GAME", (5, 45), cv2.FONT_HERSHEY_SIMPLEX, 1.4, (0, 0, 0), 3)
+    return image
+
+
+def devanagari_word():
+    """Letters hanging from one headline, as in Devanagari."""
+    image = np.full((60, 240, 3), 255, dtype=np.uint8)
+    cv2.line(image, (10, 12), (230, 12), (0, 0, 0), 4)
+    for x in range(20, 230, 40):
+        cv2.line(image, (x, 12), (x, 50), (0, 0, 0), 4)
+        cv2.ellipse(image, (x - 10, 35), (9, 10), 0, 90, 270, (0, 0, 0), 3)
+    return image
+
+
+def cjk_word():
+    """Square glyphs built from many stacked horizontal strokes."""
+    image = np.full((60, 200, 3), 255, dtype=np.uint8)
+    for x in range(10, 190, 60):
+        for y in range(8, 56, 9):
+            cv2.line(image, (x, y), (x + 44, y), (0, 0, 0), 3)
+        cv2.line(image, (x + 22, 8), (x + 22, 53), (0, 0, 0), 3)
+    return image
+
+
+def arabic_word():
+    """Letters joined along a baseline in the lower half, with dots above."""
+    image = np.full((60, 240, 3), 255, dtype=np.uint8)
+    cv2.line(image, (10, 44), (230, 44), (0, 0, 0), 4)
+    for x in range(20, 230, 30):
+        cv2.line(image, (x, 20), (x, 44), (0, 0, 0), 3)
+        cv2.circle(image, (x + 12, 30), 3, (0, 0, 0), -1)
+    return image
+
+
+def grey(image):
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+@pytest.mark.parametrize("make_word, script", [
+    (latin_word, "latin"),
+    (devanagari_word, "devanagari"),
+    (cjk_word, "cjk"),
+    (arabic_word, "arabic"),
+])
+def test_classify_script(make_word, script):
+    """Test that each synthetic script is recognized from its shape."""
+    assert classify_script(grey(make_word())) == script
+
+
+def detected_caps(text, font, thickness):
+    """Dark all-caps word cropped with a small margin, like a detected region."""
+    (width, height), baseline = cv2.getTextSize(text, font, 1.0, thickness)
+    image = np.full((height + baseline + 40, width + 40), 255, dtype=np.uint8)
+    cv2.putText(image, text, (20, height + 20), font, 1.0, 0, thickness)
+    ys, xs = np.nonzero(image < 128)
+    margin = max(1, (ys.max() - ys.min()) // 10)
+    return image[ys.min() - margin:ys.max() + 1 + margin, xs.min() - margin:xs.max() + 1 + margin]
+
+
+@pytest.mark.parametrize("font", [
+    cv2.FONT_HERSHEY_DUPLEX, cv2.FONT_HERSHEY_COMPLEX, cv2.FONT_HERSHEY_TRIPLEX,
+])
+@pytest.mark.parametrize("text", ["SEE BEER", "BEE", "ESSENSE", "START GAME", "EFFECT"])
+@pytest.mark.parametrize("thickness", [1, 2, 3])
+def test_serif_capitals_are_latin(font, text, thickness):
+    """Test that bold serif capitals are not mistaken for a headline or baseline."""
+    assert classify_script(detected_caps(text, font, thickness)) == "latin"
+
+
+def test_classify_script_respects_allowed_scripts():
+    """Test that disallowed scripts fall back to Latin."""
+    assert classify_script(grey(devanagari_word()), ("latin", "arabic")) == "latin"
+    assert classify_script(grey(devanagari_word()), ("devanagari",)) == "devanagari"
+
+
+def test_parse_scripts():
+    """Test auto expansion and rejection of unknown scripts."""
+    assert parse_scripts("auto") == ("latin", "devanagari", "arabic", "cjk")
+    assert parse_scripts("latin, arabic") == ("latin", "arabic")
+    with pytest.raises(ValueError):
+        parse_scripts("klingon")
+
+
+def fake_reader_factory(created):
+    """Build fake readers that detect two words and name their language set."""
+
+    class FakeReader:
+        def __init__(self, languages, **options):
+            self.languages = tuple(languages)
+            created.append(self.languages)
+
+        def detect(self, image, **kwargs):
+            return [[[0, 320, 0, 60], [0, 240, 80, 140]]], [[]]
+
+        def recognize(self, grey, horizontal_list, free_list, **kwargs):
+            return [([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], "+".join(self.languages), 0.9)
+                    for x0, x1, y0, y1 in horizontal_list]
+
+    return FakeReader
+
+
+def poster():
+    image = np.full((140, 320, 3), 255, dtype=np.uint8)
+    image[0:60, 0:320] = latin_word()
+    image[80:140, 0:240] = devanagari_word()
+    return image
+
+
+def test_regions_are_routed_to_script_readers():
+    """Test that only the readers for scripts present in the image are loaded."""
+    created = []
+    with patch('main.easyocr.Reader', side_effect=fake_reader_factory(created)):
+        results = read_by_script(poster())
+
+    assert [text for _, text, _ in results] == ["en", "en+hi"]
+    assert sorted(created) == [("en",), ("en", "hi")]
+
+
+def test_extract_text_with_scripts_option(tmp_path):
+    """Test the scripts option of extract_text_from_image."""
+    image = tmp_path / "poster.png"
+    cv2.imwrite(str(image), poster())
+    created = []
+    with patch('main.easyocr.Reader', side_effect=fake_reader_factory(created)):
+        results = extract_text_from_image(str(image), scripts="latin,arabic")
+
+    assert [text for _, text, _ in results] == ["en", "en"]
+    assert created == [("en",)]
+
+
+def test_prefilter_regions_are_routed_to_script_readers(tmp_path):
+    """Test that the detect prefilter leaves recognition to the script readers."""
+    image = tmp_path / "poster.png"
+    cv2.imwrite(str(image), poster())
+    created = []
+    with patch('main.easyocr.Reader', side_effect=fake_reader_factory(created)):
+        results = extract_text_from_image(str(image), scripts="auto", prefilter="detect")
+
+    assert [text for _, text, _ in results] == ["en", "en+hi"]
+    assert sorted(created) == [("en",), ("en", "hi")]
+
+
+def test_languages_select_the_detector_reader(tmp_path):
+    """Test that languages load only the detector and scripts pick the recognizers."""
+    image = tmp_path / "poster.png"
+    cv2.imwrite(str(image), poster())
+    created = []
+    with patch('main.easyocr.Reader', side_effect=fake_reader_factory(created)):
+        results = extract_text_from_image(str(image), languages=["ar", "en"],
+                                          scripts="latin")
+
+    assert [text for _, text, _ in results] == ["en", "en"]
+    assert created == [("ar", "en"), ("en",)]
+
+
+def test_scripts_reject_tile_and_downscale(tmp_path):
+    """Test that script routing is not silently combined with tiling or downscaling."""
+    with pytest.raises(ValueError):
+        extract_text_from_image(str(tmp_path / "poster.png"), scripts="auto", tile=1024)
+    with pytest.raises(SystemExit):
+        main_cli([str(tmp_path / "poster.png"), "--scripts", "--downscale"])
@@ -0,0 +1,137 @@
+"""Tests for the micro-batching OCR service."""
+
+import json
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+# Add benchmarks and src directories to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import cv2
+import numpy as np
+import pytest
+
+from metrics import MetricsRegistry, set_metrics
+from reader_pool import ReaderRegistry
+from service import MicroBatcher, OcrService, create_server
+from stub_reader import StubReader
+from translation_cache import TranslationCache
+from translation_engine import LocalBackend, TranslationEngine
+
+
+def png_bytes(width=64, height=32):
+    """Encode a blank test image."""
+    ok, encoded = cv2.imencode(".png", np.full((height, width), 255, dtype=np.uint8))
+    return encoded.tobytes()
+
+
+@pytest.fixture
+def service():
+    """Service backed by a stub reader and the local translator."""
+    set_metrics(MetricsRegistry())
+    registry = ReaderRegistry(
+        factory=lambda languages, **options: StubReader(languages, seconds_per_megapixel=0)
+    )
+    engine = TranslationEngine(LocalBackend(), cache=TranslationCache())
+    service = OcrService(registry=registry, translation_engine=engine,
+                         max_batch_size=4, max_wait=0.05)
+    yield service
+    service.close()
+    engine.close()
+
+
+def test_micro_batcher_groups_concurrent_submissions():
+    """Test that concurrent items are processed together up to the batch size."""
+    batches = []
+
+    def process(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(process, max_batch_size=3, max_wait=0.1)
+    futures = [batcher.submit(i) for i in range(5)]
+    assert [future.result(timeout=5) for future in futures] == [0, 2, 4, 6, 8]
+    batcher.close()
+    assert [len(batch) for batch in batches] == [3, 2]
+
+
+def test_micro_batcher_propagates_errors():
+    """Test that a failing batch fails every future in it."""
+    def process(items):
+        raise RuntimeError("model crashed")
+
+    batcher = MicroBatcher(process, max_batch_size=2, max_wait=0)
+    future = batcher.submit("x")
+    with pytest.raises(RuntimeError):
+        future.result(timeout=5)
+    batcher.close()
+
+
+def test_readers_are_loaded_at_startup(service):
+    """Test that the default reader is resident before the first request."""
+    assert ["en"] in service.registry
+
+
+def test_process_translates_with_stand_in(service):
+    """Test a synchronous request through the batcher."""
+    record = service.process(png_bytes(), translate="es", name="sign.png")
+    assert record["image"] == "sign.png"
+    assert record["text"] == "SAMPLE TEXT"
+    assert record["translation"] == "[es] SAMPLE TEXT"
+    assert set(record["timings"]) == {"decode", "ocr", "translate"}
+
+
+def test_async_job_lifecycle(service):
+    """Test that jobs are queued and then report their result."""
+    job_id = service.create_job(png_bytes())
+    for _ in range(100):
+        status = service.job_status(job_id)
+        if status["status"] == "done":
+            break
+        time.sleep(0.01)
+    assert status["result"]["text"] == "SAMPLE TEXT"
+    assert service.job_status("missing") is None
+
+
+def test_invalid_image_fails_only_its_request(service):
+    """Test that a bad image in a batch does not fail its neighbours."""
+    good = service.submit(png_bytes())
+    bad = service.submit(b"not an image")
+    assert good.result(timeout=5)["text"] == "SAMPLE TEXT"
+    with pytest.raises(ValueError):
+        bad.result(timeout=5)
+
+
+def test_http_endpoints(service):
+    """Test the HTTP API end to end on a free local port."""
+    server = create_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        request = urllib.request.Request(f"{base}/ocr?translate=fr", data=png_bytes(),
+                                         method="POST")
+        with urllib.request.urlopen(request) as response:
+            assert json.load(response)["translation"] == "[fr] SAMPLE TEXT"
+
+        request = urllib.request.Request(f"{base}/jobs", data=png_bytes(), method="POST")
+        with urllib.request.urlopen(request) as response:
+            assert response.status == 202
+            job_id = json.load(response)["job_id"]
+        service.batcher.close()
+        with urllib.request.urlopen(f"{base}/jobs/{job_id}") as response:
+            assert json.load(response)["status"] == "done"
+
+        with urllib.request.urlopen(f"{base}/stats") as response:
+            stats = json.load(response)
+        assert stats["requests"] == 2
+        assert stats["queue_depth"] == 0
+        with urllib.request.urlopen(f"{base}/metrics") as response:
+            assert b"img2txt_queue_wait_seconds" in response.read()
+    finally:
+        server.shutdown()
+        server.server_close()
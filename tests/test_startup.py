@@ -0,0 +1,38 @@
+"""Tests that the fast CLI paths never import heavy dependencies."""
+
+import sys
+from pathlib import Path
+
+# Add benchmarks and src directories to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bench_startup import DEFAULT_LIMIT, run_benchmark
+from lazy_imports import LazyAttribute, LazyModule
+
+
+def test_fast_paths_skip_heavy_imports():
+    """Test --help, --version, usage, missing path and dry run startup."""
+    # Best of three cold starts against the benchmark's own limit; importing
+    # a heavy dependency costs more than the whole budget
+    results, failures = run_benchmark(limit=DEFAULT_LIMIT, repeat=3)
+    assert failures == []
+    assert set(results) == {"usage", "help", "version", "missing_path", "dry_run"}
+
+
+def test_lazy_module_forwards_attribute_access():
+    """Test that the proxy imports on first access and forwards writes."""
+    module = LazyModule("colorsys")
+    assert "not loaded" in repr(module)
+    assert module.rgb_to_hsv(1, 0, 0) == (0.0, 1.0, 1)
+    module.custom_value = 42
+    import colorsys
+    assert colorsys.custom_value == 42
+    del module.custom_value
+    assert not hasattr(colorsys, "custom_value")
+
+
+def test_lazy_attribute_calls_real_object():
+    """Test that the attribute proxy resolves and calls the real object."""
+    dumps = LazyAttribute("json", "dumps")
+    assert dumps({"a": 1}) == '{"a": 1}'
@@ -0,0 +1,68 @@
+"""Tests for tiled OCR of large images."""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import cv2
+import numpy as np
+
+from tiling import deduplicate, plan_tiles, read_tiled, reading_order
+
+from tests.fakes import BlobReader
+
+
+def make_poster():
+    """Large image with words in two lines, some straddling tile boundaries."""
+    image = np.zeros((1500, 2000, 3), dtype=np.uint8)
+    words = {10: (100, 100), 20: (950, 110), 30: (1700, 95), 40: (500, 1000), 50: (1200, 1010)}
+    for level, (x, y) in words.items():
+        cv2.rectangle(image, (x, y), (x + 150, y + 40), (level, level, level), -1)
+    return image
+
+
+def test_plan_tiles_cover_image_with_overlap():
+    """Test that tiles cover every pixel and stay within the image."""
+    tiles = plan_tiles(1500, 2000, tile_size=1024, overlap=128)
+    assert (0, 0, 1024, 1024) in tiles
+    assert max(x1 for _, _, x1, _ in tiles) == 2000
+    assert max(y1 for _, _, _, y1 in tiles) == 1500
+    assert plan_tiles(500, 600, tile_size=1024) == [(0, 0, 600, 500)]
+
+
+def test_deduplicate_prefers_complete_boxes():
+    """Test that a box cut by a tile edge loses to the complete copy."""
+    complete = {"bounds": (90, 0, 140, 20), "result": ("a", "HELLO", 0.8), "cut_off": False}
+    partial = {"bounds": (90, 0, 100, 20), "result": ("b", "HE", 0.99), "cut_off": True}
+    other = {"bounds": (300, 0, 340, 20), "result": ("c", "WORLD", 0.9), "cut_off": False}
+    kept = deduplicate([partial, complete, other])
+    assert [c["result"][1] for c in kept] == ["HELLO", "WORLD"]
+
+
+def test_reading_order_groups_lines():
+    """Test top-to-bottom, left-to-right ordering with slightly uneven lines."""
+    boxes = [
+        {"bounds": (200, 102, 260, 122)},
+        {"bounds": (10, 200, 60, 220)},
+        {"bounds": (10, 100, 60, 120)},
+    ]
+    ordered = reading_order(boxes)
+    assert [c["bounds"][0] for c in ordered] == [10, 200, 10]
+
+
+def test_read_tiled_matches_whole_image():
+    """Test that tiled results equal whole-image results in reading order."""
+    image = make_poster()
+    whole = BlobReader().readtext(image)
+    reader = BlobReader()
+    tiled = read_tiled(reader, image, tile_size=1024, overlap=256, workers=4)
+
+    assert [text for _, text, _ in tiled] == ["word10", "word20", "word30", "word40", "word50"]
+    assert sorted(tiled, key=lambda r: r[1]) == sorted(
+        [([[int(x), int(y)] for x, y in bbox], text, conf) for bbox, text, conf in whole],
+        key=lambda r: r[1],
+    )
+    # No tile was larger than the tile size
+    assert max(max(shape) for shape in reader.shapes) <= 1024
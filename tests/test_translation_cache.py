@@ -0,0 +1,95 @@
+"""Tests for the two-tier translation cache."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import translation_cache
+from translation_cache import TranslationCache
+from main import translate_text
+
+
+def test_memory_tier_hit_after_set():
+    """Test that a stored translation is served from memory."""
+    cache = TranslationCache()
+    cache.set("START GAME", "es", "COMENZAR JUEGO")
+
+    assert cache.get("START  GAME ", "es") == "COMENZAR JUEGO"
+    assert cache.get("START GAME", "fr") is None
+    assert cache.stats()["memory_hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    """Test that translations persist in SQLite between cache instances."""
+    db_path = tmp_path / "translations.sqlite3"
+    first = TranslationCache(db_path)
+    first.set("Size Chart", "hi", "आकार चार्ट")
+    first.close()
+
+    second = TranslationCache(db_path)
+    assert second.get("Size Chart", "hi") == "आकार चार्ट"
+    assert second.get("Size Chart", "hi") == "आकार चार्ट"
+    assert second.stats()["disk_hits"] == 1
+    assert second.stats()["memory_hits"] == 1
+
+
+def test_expired_entries_are_misses(tmp_path):
+    """Test that entries older than the TTL are ignored and swept."""
+    cache = TranslationCache(tmp_path / "translations.sqlite3", ttl=60)
+    with patch("translation_cache.time.time", return_value=1000.0):
+        cache.set("NIKE", "fr", "NIKE")
+    with patch("translation_cache.time.time", return_value=2000.0):
+        assert cache.get("NIKE", "fr") is None
+        cache.sweep()
+    assert cache.stats()["disk_entries"] == 0
+
+
+def test_size_eviction(tmp_path):
+    """Test that both tiers are trimmed to their size limits."""
+    cache = TranslationCache(tmp_path / "translations.sqlite3",
+                             max_memory_entries=2, max_disk_entries=2)
+    for word in ["S", "M", "L"]:
+        cache.set(word, "es", word.lower())
+    cache.sweep()
+
+    assert cache.stats()["memory_entries"] == 2
+    assert cache.stats()["disk_entries"] == 2
+    assert cache.get("L", "es") == "l"
+
+
+def test_translate_text_uses_cache():
+    """Test that repeated translations only hit the network once."""
+    translation_cache.set_translation_cache(TranslationCache())
+    with patch('main.GoogleTranslator') as mock_translator_class:
+        mock_translator_instance = MagicMock()
+        mock_translator_class.return_value = mock_translator_instance
+        mock_translator_instance.translate.return_value = "COMENZAR JUEGO"
+
+        assert translate_text("START GAME", "es") == "COMENZAR JUEGO"
+        assert translate_text("START GAME", "es") == "COMENZAR JUEGO"
+
+        assert mock_translator_instance.translate.call_count == 1
+
+
+def test_translate_text_keeps_translation_when_cache_write_fails():
+    """Test that a locked cache database does not discard a good translation."""
+    import sqlite3
+
+    from metrics import get_metrics
+
+    cache = TranslationCache()
+    translation_cache.set_translation_cache(cache)
+    with patch('main.GoogleTranslator') as mock_translator_class, \
+            patch.object(cache, 'set', side_effect=sqlite3.OperationalError("database is locked")):
+        mock_translator_class.return_value.translate.return_value = "COMENZAR JUEGO"
+
+        assert translate_text("START GAME", "es") == "COMENZAR JUEGO"
+
+    assert get_metrics().counter_value("failures_total", stage="translation_cache",
+                                       error="OperationalError") == 1
+    assert get_metrics().counter_value("failures_total", stage="translation",
+                                       error="OperationalError") == 0
@@ -0,0 +1,184 @@
+"""Tests for the batched, deduplicated translation engine."""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from translation_cache import TranslationCache
+from translation_engine import (
+    LocalBackend, TranslationBackend, TranslationEngine, pack_batches, split_chunks, split_text,
+)
+
+
+class FlakyBackend(TranslationBackend):
+    """Backend that fails a fixed number of times before succeeding."""
+
+    name = "flaky"
+
+    def __init__(self, failures):
+        self.failures = failures
+
+    def translate_batch(self, texts, target_language, source_language="auto"):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("provider unavailable")
+        return [text.lower() for text in texts]
+
+
+class SelectiveBackend(LocalBackend):
+    """Local backend that always fails batches containing "BAD"."""
+
+    def translate_batch(self, texts, target_language, source_language="auto"):
+        if any("BAD" in text for text in texts):
+            raise ConnectionError("request too large")
+        return super().translate_batch(texts, target_language, source_language)
+
+
+def test_pack_batches_respects_limits():
+    """Test that batches stay within character and item limits."""
+    batches = pack_batches(["aaaa", "bbbb", "cc", "d" * 20, "e"], max_chars=10, max_items=2)
+
+    assert batches == [["aaaa", "bbbb"], ["d" * 20], ["cc", "e"]]
+
+
+def test_segments_are_deduplicated_and_grouped():
+    """Test that duplicates are translated once and order is preserved."""
+    backend = LocalBackend()
+    engine = TranslationEngine(backend, cache=TranslationCache())
+
+    translations = engine.translate_segments([
+        ("START GAME", "es"),
+        ("NIKE", "fr"),
+        ("START  GAME", "es"),
+        ("", "es"),
+        ("NIKE", "es"),
+    ])
+
+    assert translations == [
+        "[es] START GAME", "[fr] NIKE", "[es] START GAME", "", "[es] NIKE",
+    ]
+    assert engine.stats["unique"] == 3
+    assert backend.calls == 2
+
+
+def test_cached_segments_skip_the_backend():
+    """Test that a second request for the same texts never reaches the backend."""
+    backend = LocalBackend()
+    engine = TranslationEngine(backend, cache=TranslationCache())
+
+    engine.translate_many(["S", "M", "L"], "hi")
+    engine.translate_many(["S", "M", "L"], "hi")
+
+    assert backend.calls == 1
+    assert engine.stats["cache_hits"] == 3
+
+
+def test_stats_are_exact_under_concurrent_callers():
+    """Test that callers sharing one engine from many threads lose no counts."""
+    engine = TranslationEngine(LocalBackend(), cache=TranslationCache())
+    calls = [[(f"TEXT {thread} {i}", "es")] for thread in range(8) for i in range(50)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(engine.translate_segments, calls))
+
+    assert engine.stats["segments"] == len(calls)
+    assert engine.stats["unique"] == len(calls)
+    assert engine.stats["batches"] == len(calls)
+
+
+def test_batches_are_sent_concurrently():
+    """Test that independent batches overlap instead of running serially."""
+    backend = LocalBackend(latency=0.2, max_batch_size=1)
+    engine = TranslationEngine(backend, max_concurrency=8, cache=TranslationCache())
+
+    start = time.perf_counter()
+    engine.translate_many([f"text {i}" for i in range(8)], "de")
+    elapsed = time.perf_counter() - start
+
+    assert backend.calls == 8
+    assert elapsed < 0.2 * 4
+
+
+def test_retry_with_backoff_then_success():
+    """Test that transient failures are retried."""
+    engine = TranslationEngine(FlakyBackend(failures=2), backoff=0.01,
+                               cache=TranslationCache())
+
+    assert engine.translate_many(["HELLO"], "es") == ["hello"]
+    assert engine.stats["retries"] == 2
+
+
+def test_persistent_failure_returns_original_text():
+    """Test that a batch failing every retry falls back to the source text."""
+    engine = TranslationEngine(FlakyBackend(failures=10), max_retries=1, backoff=0.01,
+                               cache=TranslationCache())
+
+    assert engine.translate_many(["HELLO"], "es") == ["HELLO"]
+    assert engine.stats["failures"] == 1
+
+
+def test_split_text_keeps_sentences_within_limit():
+    """Test sentence packing, word splitting of long sentences and CJK stops."""
+    text = "Start game. Load game? " + "word " * 8 + "end."
+    chunks = split_text(text, max_chars=24)
+
+    assert chunks[:2] == ["Start game. Load game?", "word word word word word"]
+    assert all(len(chunk) <= 24 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+    assert split_text("開始。設定！", max_chars=4) == ["開始。", "設定！"]
+
+
+def test_long_text_chunks_translate_concurrently_in_order():
+    """Test that latency follows the slowest chunk, not the document length."""
+    backend = LocalBackend(latency=0.2)
+    engine = TranslationEngine(backend, max_concurrency=8, cache=TranslationCache())
+    sentences = [f"Sentence number {i} of the menu." for i in range(6)]
+
+    start = time.perf_counter()
+    translated = engine.translate_long(" ".join(sentences), "fr", max_chars=40)
+    elapsed = time.perf_counter() - start
+
+    assert translated == " ".join(f"[fr] {sentence}" for sentence in sentences)
+    assert backend.calls == 6
+    assert engine.stats["chunks"] == 6
+    assert elapsed < 0.2 * 3
+
+
+def test_failed_chunk_does_not_discard_the_others():
+    """Test per-chunk failure isolation."""
+    engine = TranslationEngine(SelectiveBackend(), max_retries=1, backoff=0.01,
+                               cache=TranslationCache())
+
+    translated = engine.translate_long("Good start. BAD middle. Good end.", "es", max_chars=12)
+
+    assert translated == "[es] Good start. BAD middle. [es] Good end."
+    assert engine.stats["failures"] == 1
+
+
+def test_translate_text_routes_long_documents_to_chunks():
+    """Test that translate_text splits texts longer than one chunk."""
+    from main import translate_text
+    from translation_engine import DEFAULT_CHUNK_CHARS, set_translation_engine
+
+    backend = LocalBackend()
+    set_translation_engine(TranslationEngine(backend, cache=TranslationCache()))
+    text = " ".join(f"Menu line {i}." for i in range(DEFAULT_CHUNK_CHARS // 5))
+
+    translated = translate_text(text, "de")
+
+    assert backend.calls > 1
+    assert translated.count("[de]") == backend.calls
+
+
+def test_long_japanese_text_keeps_original_separators():
+    """Test that CJK chunks are rejoined without spaces and paragraphs survive."""
+    engine = TranslationEngine(FlakyBackend(failures=0), cache=TranslationCache())
+    text = "ゲームを開始。設定を開く！\n\n終了しますか？はい。"
+
+    chunks = split_chunks(text, max_chars=8)
+    assert "".join(chunk + separator for chunk, separator in chunks) == text
+    assert engine.translate_long(text, "ja", max_chars=8) == text
@@ -0,0 +1,170 @@
+"""Tests for the change-aware video and frame-sequence mode."""
+
+import io
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import cv2
+import numpy as np
+import pytest
+
+from main import main
+from video import (
+    IncrementalOcr, format_cue, iter_frames, subtitle_stream, write_subtitles,
+)
+
+from tests.fakes import BlobReader
+
+
+def make_frame(words):
+    """Menu screen with one textured blob per (level, x, y) word."""
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    for level, x, y in words:
+        cv2.rectangle(frame, (x, y), (x + 120, y + 30), (level, level, level), -1)
+        # Stripes give the blob texture, like the strokes of real text
+        frame[y:y + 30:4, x:x + 120] = 0
+    return frame
+
+
+def test_unchanged_frames_reuse_results_and_changes_reread_a_crop():
+    """Test that only the changed area is re-recognized."""
+    reader = BlobReader()
+    ocr = IncrementalOcr(reader)
+    title, start = (100, 60, 40), (200, 400, 380)
+
+    results, changed = ocr.update(make_frame([title, start]))
+    assert changed and [text for _, text, _ in results] == ["word100", "word200"]
+
+    results, changed = ocr.update(make_frame([title, start]))
+    assert not changed and len(reader.shapes) == 1
+
+    results, changed = ocr.update(make_frame([title, (150, 400, 380)]))
+    assert changed
+    assert [text for _, text, _ in results] == ["word100", "word150"]
+    # The re-read covered the changed menu entry, not the whole frame
+    height, width = reader.shapes[-1]
+    assert height * width < 640 * 480 / 4
+    # The bbox was shifted back into frame coordinates
+    assert results[1][0][0] == [400, 380]
+
+
+def test_subtitle_stream_emits_cues_and_translates_new_texts_once():
+    """Test cue timing and that unchanged region texts are not re-translated."""
+    frames = [
+        (0.0, make_frame([(200, 60, 40)])),
+        (0.5, make_frame([(200, 60, 40)])),
+        (1.0, make_frame([(200, 60, 40), (100, 400, 380)])),
+        (1.5, make_frame([])),
+        (2.0, make_frame([(120, 60, 40)])),
+    ]
+    with patch('main.translate_texts',
+               side_effect=lambda texts, lang: [t.upper() for t in texts]) as translate:
+        cues = list(subtitle_stream(frames, BlobReader(), translate_to="es"))
+
+    assert [(c["start"], c["end"], c["text"]) for c in cues] == [
+        (0.0, 1.0, "word200"),
+        (1.0, 1.5, "word200 word100"),
+        (2.0, 2.5, "word120"),
+    ]
+    assert cues[1]["translation"] == "WORD200 WORD100"
+    assert [call.args[0] for call in translate.call_args_list] == [
+        ["word200"], ["word100"], ["word120"],
+    ]
+
+
+def test_subtitle_formats():
+    """Test SRT and WebVTT timestamps and the jsonl record."""
+    cue = {"start": 3661.5, "end": 3662.25, "text": "START GAME", "translation": "INICIAR"}
+    assert format_cue(cue, 1) == "1\n01:01:01,500 --> 01:01:02,250\nSTART GAME\nINICIAR\n\n"
+    stream = io.StringIO()
+    assert write_subtitles([cue], stream, "vtt") == 1
+    assert stream.getvalue().startswith("WEBVTT\n\n01:01:01.500 --> 01:01:02.250\n")
+    assert '"translation": "INICIAR"' in format_cue(cue, 1, "jsonl")
+
+
+def test_iter_frames_samples_video(tmp_path):
+    """Test that a 10 fps video sampled at 2 fps yields every fifth frame."""
+    path = tmp_path / "clip.avi"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10, (160, 120))
+    for _ in range(20):
+        writer.write(np.zeros((120, 160, 3), dtype=np.uint8))
+    writer.release()
+
+    timestamps = [timestamp for timestamp, _ in iter_frames(path, sample_fps=2)]
+    assert timestamps == [0.0, 0.5, 1.0, 1.5]
+
+
+def test_cli_writes_subtitles_for_image_sequence(tmp_path):
+    """Test --video over a directory of frames."""
+    frames = tmp_path / "frames"
+    frames.mkdir()
+    for index in range(3):
+        cv2.imwrite(str(frames / f"frame{index:03d}.png"), make_frame([(200, 60, 40)]))
+    output = tmp_path / "out.srt"
+
+    with patch('main.easyocr.Reader') as mock_reader:
+        mock_reader.return_value.readtext.return_value = [
+            ([[60, 40], [180, 40], [180, 70], [60, 70]], "START GAME", 0.95)
+        ]
+        main(["--video", str(frames), "-o", str(output)])
+        assert mock_reader.return_value.readtext.call_count == 1
+    assert output.read_text() == "1\n00:00:00,000 --> 00:00:03,000\nSTART GAME\n\n"
+
+
+def test_cli_honours_min_confidence_and_rejects_image_options(tmp_path):
+    """Test that --video applies its own options and refuses per-image ones."""
+    frames = tmp_path / "frames"
+    frames.mkdir()
+    cv2.imwrite(str(frames / "frame000.png"), make_frame([(200, 60, 40)]))
+    output = tmp_path / "out.srt"
+
+    with patch('main.easyocr.Reader') as mock_reader:
+        mock_reader.return_value.readtext.return_value = [
+            ([[60, 40], [180, 40], [180, 70], [60, 70]], "START GAME", 0.7)
+        ]
+        main(["--video", str(frames), "-o", str(output), "--min-confidence", "0.8"])
+    assert output.read_text() == ""
+
+    with pytest.raises(SystemExit):
+        main(["--video", str(frames), "--preprocess", "threshold"])
+
+
+def test_cli_reports_missing_and_undecodable_videos(tmp_path, capsys):
+    """Test that bad --video inputs exit with an error message, not a traceback."""
+    broken = tmp_path / "broken.mp4"
+    broken.write_bytes(b"not a video")
+
+    for source in (tmp_path / "missing.mp4", broken):
+        with patch('main.easyocr.Reader'):
+            with pytest.raises(SystemExit) as excinfo:
+                main(["--video", str(source), "-o", str(tmp_path / "out.srt")])
+        assert excinfo.value.code == 1
+        assert "Error:" in capsys.readouterr().out
+
+
+def test_cli_video_honours_scripts_and_quantize(tmp_path):
+    """Test that --video uses the script router and the selected inference config."""
+    frames = tmp_path / "frames"
+    frames.mkdir()
+    cv2.imwrite(str(frames / "frame000.png"), make_frame([(200, 60, 40)]))
+    region = ([[60, 40], [180, 40], [180, 70], [60, 70]], "START GAME", 0.95)
+    seen = {}
+
+    def read_by_script(image, scripts, detector_languages, **options):
+        from inference import get_inference_config
+
+        seen["scripts"] = scripts
+        seen["quantize"] = get_inference_config().quantize
+        return [region]
+
+    output = tmp_path / "out.srt"
+    with patch('script_detection.read_by_script', side_effect=read_by_script):
+        main(["--video", str(frames), "-o", str(output), "--scripts", "latin,devanagari",
+              "--quantize", "off"])
+
+    assert seen == {"scripts": ("latin", "devanagari"), "quantize": "off"}
+    assert "START GAME" in output.read_text()